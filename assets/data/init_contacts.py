@@ -12,3 +12,17 @@ country_emergency_numbers = {
 }
 
 global_emergency_number = "112"
+
+
+if __name__ == "__main__":
+    # Seeds contacts.db from the table above; run from the project root:
+    #     python -m assets.data.init_contacts [extra.csv|extra.json ...]
+    import sys
+    from core.contacts_import import import_contacts, rows_from_number_map
+    from core.database import DatabaseManager
+
+    db = DatabaseManager()
+    count = db.add_contacts_bulk(rows_from_number_map(country_emergency_numbers))
+    for path in sys.argv[1:]:
+        count += import_contacts(db, path)
+    print(f"Loaded {count} contact rows into {db.db_path}")
@@ -0,0 +1,66 @@
+"""
+Compares the grid-hash alert index with a linear scan for "alerts affecting this coordinate".
+
+Run from the project root:
+    python -m benchmarks.bench_alert_index --alerts 100000 --queries 2000
+"""
+import argparse
+import random
+import time
+
+from core.alert_index import AlertIndex, area_contains
+from core.content import normalize_alert
+
+
+def make_alerts(count, rng):
+    """
+    Generates alerts with a mix of circular and rectangular areas of regional size.
+    """
+    alerts = []
+    for i in range(count):
+        lat, lon = rng.uniform(-60, 70), rng.uniform(-180, 180)
+        if i % 2:
+            area = {"lat": lat, "lon": lon, "radius_km": rng.uniform(5, 300)}
+        else:
+            area = {"bbox": [lat, lon, min(90, lat + rng.uniform(0.1, 3)), min(180, lon + rng.uniform(0.1, 3))]}
+        alerts.append(normalize_alert({"id": i, "text": f"Alert {i}", "area": area}, i))
+    return alerts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    alerts = make_alerts(args.alerts, rng)
+    points = [(rng.uniform(-60, 70), rng.uniform(-180, 180)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = AlertIndex()
+    for alert in alerts:
+        index.add(alert)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [len(index.query(lat, lon)) for lat, lon in points]
+    indexed_time = time.perf_counter() - start
+
+    scan_points = points[: max(1, args.queries // 20)]  # the scan is slow; sample fewer points
+    start = time.perf_counter()
+    scanned = [sum(area_contains(alert["area"], lat, lon) for alert in alerts) for lat, lon in scan_points]
+    scan_time = time.perf_counter() - start
+
+    assert indexed[: len(scanned)] == scanned, "index and linear scan disagree"
+    per_indexed = indexed_time / len(points)
+    per_scan = scan_time / len(scan_points)
+    print(f"{'index build':>12}: {build * 1000:9.1f} ms for {args.alerts} alerts")
+    print(f"{'indexed':>12}: {per_indexed * 1e6:9.1f} us/query")
+    print(f"{'linear scan':>12}: {per_scan * 1e6:9.1f} us/query")
+    print(f"{'speedup':>12}: {per_scan / per_indexed:9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compares rendering a large alert feed as one label per alert with the virtualized list.
+
+Needs a display (use xvfb-run on headless machines). Run from the project root:
+    python -m benchmarks.bench_alert_list --alerts 10000
+"""
+import argparse
+import time
+import tracemalloc
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+from gui.virtual_list import VirtualList
+
+
+def make_alerts(count):
+    severities = ["extreme", "severe", "moderate", "minor"]
+    return [
+        {"id": str(i), "text": f"Alert {i}: flooding expected, move to higher ground.",
+         "severity": severities[i % 4], "region": f"Region {i % 50}"}
+        for i in range(count)
+    ]
+
+
+def render_all(root, alerts):
+    """
+    The old approach: one packed label per alert.
+    """
+    frame = ttk.Frame(root)
+    frame.pack(fill=BOTH, expand=True)
+    for alert in alerts:
+        ttk.Label(frame, text=alert["text"], wraplength=350, bootstyle="danger").pack(fill=X, pady=5)
+    return frame
+
+
+def render_virtual(root, alerts):
+    """
+    The virtualized list: a fixed pool of recycled labels.
+    """
+    alert_list = VirtualList(root, lambda label, alert: label.config(text=alert["text"], bootstyle="danger"))
+    alert_list.pack(fill=BOTH, expand=True)
+    alert_list.set_items(alerts)
+    return alert_list
+
+
+def measure(render, alerts):
+    """
+    Returns (render seconds, peak traced MB, widget count, seconds per scroll step).
+    """
+    root = ttk.Window(themename="cosmo")
+    root.geometry("375x667")
+    root.update()
+    tracemalloc.start()
+    start = time.perf_counter()
+    view = render(root, alerts)
+    root.update()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    widgets = 0
+    pending = [root]
+    while pending:
+        children = pending.pop().winfo_children()
+        widgets += len(children)
+        pending.extend(children)
+
+    scroll = None
+    if isinstance(view, VirtualList):
+        steps = 200
+        start = time.perf_counter()
+        for _ in range(steps):
+            view.scroll(1)
+            root.update_idletasks()
+        scroll = (time.perf_counter() - start) / steps
+    root.destroy()
+    return elapsed, peak / 1e6, widgets, scroll
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=10000)
+    args = parser.parse_args()
+
+    alerts = make_alerts(args.alerts)
+    for name, render in (("label per alert", render_all), ("virtual list", render_virtual)):
+        elapsed, peak_mb, widgets, scroll = measure(render, alerts)
+        scroll_text = f", {scroll * 1000:.2f} ms/scroll step" if scroll is not None else ""
+        print(f"{name:>16}: {elapsed * 1000:9.1f} ms render, {peak_mb:7.2f} MB peak, {widgets} widgets{scroll_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Measures cold and warm emergency-number lookups through ContactResolver.
+
+Run from the project root:
+    python -m benchmarks.bench_contacts --lookups 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from core.contacts import ContactResolver
+from core.database import DatabaseManager
+
+COUNTRIES = ["India", "United States", "United Kingdom", "Australia", "Canada"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with DatabaseManager(os.path.join(tmp, "contacts.db"), pooled=True) as db:
+            db.add_contacts_bulk((country, "100", "101", "102") for country in COUNTRIES)
+            resolver = ContactResolver(db)
+
+            start = time.perf_counter()
+            for country in COUNTRIES:
+                resolver.emergency_number(country)
+            cold = (time.perf_counter() - start) / len(COUNTRIES)
+
+            start = time.perf_counter()
+            for i in range(args.lookups):
+                resolver.emergency_number(COUNTRIES[i % len(COUNTRIES)])
+            warm = (time.perf_counter() - start) / args.lookups
+
+            start = time.perf_counter()
+            for i in range(args.lookups):
+                db.fetch_contacts(COUNTRIES[i % len(COUNTRIES)])
+            uncached = (time.perf_counter() - start) / args.lookups
+
+    print(f"{'cold lookup':>16}: {cold * 1e6:8.2f} us")
+    print(f"{'warm lookup':>16}: {warm * 1e6:8.2f} us")
+    print(f"{'database only':>16}: {uncached * 1e6:8.2f} us")
+    print(f"{'cache stats':>16}: {resolver.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares loading page content from JSON files with reading it from the compiled bundle.
+
+Run from the project root:
+    python -m benchmarks.bench_content --sizes 1000 10000 50000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from core.content import ContentStore
+from core.content_bundle import ContentBundle, build_bundle
+
+
+def write_assets(asset_dir, size):
+    """
+    Writes synthetic content assets with ``size`` entries each.
+    """
+    assets = {
+        "disaster_info.json": {"instructions": [f"Instruction {i}: " + "stay safe " * 10 for i in range(size)]},
+        "quiz_questions.json": {"questions": [
+            {"question": f"Question {i}?", "options": ["A", "B", "C", "D"], "answer": i % 4} for i in range(size)
+        ]},
+        "resource_links.json": {"resources": {f"Category {i}": [f"https://example.org/{i}"] for i in range(size)}},
+        "disaster_alerts.json": {"alerts": [f"Alert {i}: " + "take shelter " * 5 for i in range(size)]},
+    }
+    for file_name, data in assets.items():
+        with open(os.path.join(asset_dir, file_name), "w", encoding="utf-8") as file:
+            json.dump(data, file)
+
+
+def best_of(repeat, func):
+    """
+    Returns the fastest of ``repeat`` timed calls, in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'json visit ms':>14} {'bundle open ms':>15} {'bundle record us':>17} {'bundle MB':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as asset_dir:
+            write_assets(asset_dir, size)
+            bundle_path = os.path.join(asset_dir, "content.bundle")
+            build_bundle(bundle_path, ContentStore(asset_dir))
+
+            def json_visit():
+                # What a page visit cost before the bundle: parse the whole file for one record
+                store = ContentStore(asset_dir)
+                store.get("questions")[size // 2]
+
+            def bundle_open():
+                ContentBundle(bundle_path).close()
+
+            bundle = ContentBundle(bundle_path)
+            reads = 1000
+            record_time = best_of(args.repeat, lambda: [bundle.record("questions", i * 7 % size) for i in range(reads)])
+            bundle.close()
+
+            print(f"{size:>8} {best_of(args.repeat, json_visit) * 1000:14.2f} "
+                  f"{best_of(args.repeat, bundle_open) * 1000:15.3f} "
+                  f"{record_time / reads * 1e6:17.2f} "
+                  f"{os.path.getsize(bundle_path) / 1e6:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
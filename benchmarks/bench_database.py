@@ -0,0 +1,81 @@
+"""
+Compares connect-per-call contact lookups with the pooled connection mode,
+and row-at-a-time inserts with the batched bulk import.
+
+Run from the project root:
+    python -m benchmarks.bench_database --lookups 5000 --rows 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from core.database import DatabaseManager
+
+COUNTRIES = ["India", "United States", "United Kingdom", "Australia", "Canada"]
+
+
+def seed(db_path):
+    """
+    Fills a fresh database with one row per sample country.
+    """
+    db = DatabaseManager(db_path)
+    for country in COUNTRIES:
+        db.add_contact(country, "100", "101", "102")
+
+
+def time_lookups(db, lookups):
+    """
+    Runs the given number of country lookups and returns the elapsed seconds.
+    """
+    start = time.perf_counter()
+    for i in range(lookups):
+        db.fetch_contacts(COUNTRIES[i % len(COUNTRIES)])
+    return time.perf_counter() - start
+
+
+def time_writes(db_path, rows, bulk):
+    """
+    Writes synthetic contacts either one add_contact call at a time or in one bulk call.
+    :return: Elapsed seconds.
+    """
+    db = DatabaseManager(db_path)
+    contacts = [(f"Country {i}", "100", "101", "102") for i in range(rows)]
+    start = time.perf_counter()
+    if bulk:
+        db.add_contacts_bulk(contacts)
+    else:
+        for contact in contacts:
+            db.add_contact(*contact)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "contacts.db")
+        seed(db_path)
+
+        per_call = time_lookups(DatabaseManager(db_path), args.lookups)
+        with DatabaseManager(db_path, pooled=True) as pooled_db:
+            pooled = time_lookups(pooled_db, args.lookups)
+
+        per_row = time_writes(os.path.join(tmp, "per_row.db"), args.rows, bulk=False)
+        bulk = time_writes(os.path.join(tmp, "bulk.db"), args.rows, bulk=True)
+
+    for name, elapsed in (("connect-per-call", per_call), ("pooled", pooled)):
+        print(f"{name:>16}: {elapsed * 1000:8.1f} ms total, "
+              f"{args.lookups / elapsed:10.0f} lookups/s")
+    print(f"{'speedup':>16}: {per_call / pooled:8.1f}x")
+    for name, elapsed in (("per-row insert", per_row), ("bulk import", bulk)):
+        print(f"{name:>16}: {elapsed * 1000:8.1f} ms total, "
+              f"{args.rows / elapsed:10.0f} rows/s")
+    print(f"{'speedup':>16}: {per_row / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
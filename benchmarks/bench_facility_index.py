@@ -0,0 +1,73 @@
+"""
+Compares the facility KD-tree with a linear haversine scan for k-nearest-facility queries.
+
+Run from the project root:
+    python -m benchmarks.bench_facility_index --facilities 100000 --queries 1000 --k 10
+"""
+import argparse
+import heapq
+import random
+import time
+
+from core.alert_index import haversine_km
+from core.content import FACILITY_KINDS
+from core.facility_index import FacilityIndex
+
+
+def make_facilities(count, rng):
+    """
+    Generates facilities clustered around a few hundred towns, as real datasets are.
+    """
+    towns = [(rng.uniform(-50, 65), rng.uniform(-180, 180)) for _ in range(max(1, count // 300))]
+    facilities = []
+    for i in range(count):
+        lat, lon = rng.choice(towns)
+        facilities.append({
+            "name": f"Facility {i}",
+            "kind": rng.choice(FACILITY_KINDS),
+            "lat": max(-90.0, min(90.0, lat + rng.gauss(0, 0.2))),
+            "lon": (lon + rng.gauss(0, 0.2) + 180) % 360 - 180,
+        })
+    return facilities
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--facilities", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    facilities = make_facilities(args.facilities, rng)
+    points = [(rng.uniform(-50, 65), rng.uniform(-180, 180)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = FacilityIndex(facilities)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [index.nearest(lat, lon, k=args.k) for lat, lon in points]
+    indexed_time = time.perf_counter() - start
+
+    scan_points = points[: max(1, args.queries // 50)]  # the scan is slow; sample fewer points
+    start = time.perf_counter()
+    scanned = [
+        heapq.nsmallest(args.k, facilities, key=lambda f: haversine_km(lat, lon, f["lat"], f["lon"]))
+        for lat, lon in scan_points
+    ]
+    scan_time = time.perf_counter() - start
+
+    for found, expected in zip(indexed, scanned):
+        assert [f["name"] for _, f in found] == [f["name"] for f in expected], "index and linear scan disagree"
+    per_indexed = indexed_time / len(points)
+    per_scan = scan_time / len(scan_points)
+    print(f"{'index build':>12}: {build * 1000:9.1f} ms for {args.facilities} facilities")
+    print(f"{'kd-tree':>12}: {per_indexed * 1e6:9.1f} us/query")
+    print(f"{'linear scan':>12}: {per_scan * 1e6:9.1f} us/query")
+    print(f"{'speedup':>12}: {per_scan / per_indexed:9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Measures LinkChecker throughput against local link servers, compared with checking links one by one.
+
+Each server answers /ok/*, /dead/* (404), /moved/* (redirect to /ok/*) and
+/nohead/* (405 to HEAD, 200 to GET), sending an ETag and honouring If-None-Match.
+Run from the project root:
+    python -m benchmarks.bench_link_checker --links 2000 --hosts 4 --latency-ms 20
+"""
+import argparse
+import http.server
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from core.link_checker import LinkCache, LinkChecker, link_state
+
+
+def serve_links(latency):
+    """
+    Starts a keep-alive HTTP server that answers after ``latency`` seconds.
+    :return: The running server; its port is server.server_address[1].
+    """
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def respond(self, body):
+            time.sleep(latency)
+            kind = self.path.split("/")[1]
+            etag = f'"{self.path}"'
+            if kind == "dead":
+                self.send_response(404)
+            elif kind == "moved":
+                self.send_response(301)
+                self.send_header("Location", self.path.replace("/moved/", "/ok/", 1))
+            elif kind == "nohead" and not body:
+                self.send_response(405)
+            elif self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            else:
+                self.send_response(200)
+                self.send_header("ETag", etag)
+            payload = b"x" * 2048
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            if body:
+                self.wfile.write(payload)
+
+        def do_HEAD(self):
+            self.respond(body=False)
+
+        def do_GET(self):
+            self.respond(body=True)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def expected_state(url):
+    return "broken" if "/dead/" in url else "ok"
+
+
+def check_sequentially(urls):
+    """
+    Checks links one at a time with urllib HEAD requests, as a naive checker would.
+    """
+    for url in urls:
+        try:
+            urllib.request.urlopen(urllib.request.Request(url, method="HEAD"), timeout=10).close()
+        except urllib.error.HTTPError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--links", type=int, default=2000)
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated server response time")
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--per-host", type=int, default=8)
+    parser.add_argument("--sequential-sample", type=int, default=100, help="links checked one by one for the baseline")
+    args = parser.parse_args()
+
+    servers = [serve_links(args.latency_ms / 1000) for _ in range(args.hosts)]
+    kinds = ["ok", "ok", "ok", "dead", "moved", "nohead"]
+    urls = [
+        f"http://127.0.0.1:{servers[i % len(servers)].server_address[1]}/{kinds[i % len(kinds)]}/{i}"
+        for i in range(args.links)
+    ]
+
+    sample = urls[:args.sequential_sample]
+    start = time.perf_counter()
+    check_sequentially(sample)
+    sequential = len(sample) / (time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LinkCache(os.path.join(tmp, "links.json"))
+        checker = LinkChecker(cache, max_connections=args.connections, per_host=args.per_host)
+
+        start = time.perf_counter()
+        results = checker.check_in_background(urls).result()
+        cold = time.perf_counter() - start
+        wrong = [url for url in urls if link_state(results[url]) != expected_state(url)]
+        assert not wrong, f"{len(wrong)} links misclassified, e.g. {wrong[0]}: {results[wrong[0]]}"
+
+        start = time.perf_counter()
+        checker.check_in_background(urls).result()
+        fresh = time.perf_counter() - start
+
+        # An expired cache revalidates with If-None-Match instead of starting over
+        cache.ttl = 0
+        start = time.perf_counter()
+        results = checker.check_in_background(urls).result()
+        revalidated = time.perf_counter() - start
+        assert all(link_state(results[url]) == expected_state(url) for url in urls)
+
+    for server in servers:
+        server.shutdown()
+    print(f"{'sequential':>12}: {sequential:9.0f} links/s ({len(sample)} links)")
+    print(f"{'concurrent':>12}: {len(urls) / cold:9.0f} links/s ({len(urls)} links on {args.hosts} hosts)")
+    print(f"{'speedup':>12}: {len(urls) / cold / sequential:9.1f}x")
+    print(f"{'cached':>12}: {fresh * 1000:9.1f} ms for all links")
+    print(f"{'revalidate':>12}: {len(urls) / revalidated:9.0f} links/s")
+
+
+if __name__ == "__main__":
+    main()
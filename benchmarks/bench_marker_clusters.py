@@ -0,0 +1,83 @@
+"""
+Reports marker clustering frame time against point count for a simulated pan-and-zoom session.
+
+A frame is what the map page does on every pan or zoom: query the clusters in
+view and diff their keys with the previous frame. Drawing is left out since
+its cost depends only on how many markers changed, which is also reported.
+
+Run from the project root:
+    python -m benchmarks.bench_marker_clusters --counts 1000,10000,100000 --frames 500
+"""
+import argparse
+import random
+import statistics
+import time
+
+from core.marker_clusters import TILE_SIZE, MarkerClusterer, project
+
+VIEW_WIDTH, VIEW_HEIGHT = 375, 440  # map widget size in pixels
+
+
+def make_points(count, rng):
+    """
+    Generates points clustered around towns, denser near the viewport's starting area.
+    """
+    towns = [(rng.gauss(13.0, 4.0), rng.gauss(80.0, 4.0)) for _ in range(max(1, count // 200))]
+    return [(lat + rng.gauss(0, 0.05), lon + rng.gauss(0, 0.05)) for lat, lon in (rng.choice(towns) for _ in range(count))]
+
+
+def session(frames, rng):
+    """
+    Yields (zoom, viewport) pairs for a user panning around and zooming between levels 4 and 17.
+    """
+    x, y = project(13.0827, 80.2707)
+    zoom = 10
+    for _ in range(frames):
+        if rng.random() < 0.15:
+            zoom = max(4, min(17, zoom + rng.choice((-1, 1))))
+        world_px = TILE_SIZE * 2 ** zoom
+        x = (x + rng.gauss(0, 60) / world_px) % 1.0
+        y = min(0.99, max(0.01, y + rng.gauss(0, 60) / world_px))
+        half_w, half_h = VIEW_WIDTH / 2 / world_px, VIEW_HEIGHT / 2 / world_px
+        yield zoom, ((x - half_w) % 1.0, y - half_h, (x + half_w) % 1.0, y + half_h)
+
+
+def run(count, frames, seed):
+    rng = random.Random(seed)
+    points = make_points(count, rng)
+    start = time.perf_counter()
+    clusterer = MarkerClusterer(points)
+    build = time.perf_counter() - start
+
+    times, visible, changed = [], [], []
+    shown = set()
+    for zoom, viewport in session(frames, random.Random(seed + 1)):
+        start = time.perf_counter()
+        keys = {key for key, *_ in clusterer.clusters(zoom, viewport)}
+        added, removed = keys - shown, shown - keys
+        times.append(time.perf_counter() - start)
+        visible.append(len(keys))
+        changed.append(len(added) + len(removed))
+        shown = keys
+
+    times.sort()
+    print(
+        f"{count:>9} {build * 1000:10.1f} {statistics.mean(times) * 1000:9.3f} "
+        f"{times[int(len(times) * 0.95)] * 1000:9.3f} {statistics.mean(visible):8.1f} {statistics.mean(changed):8.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", default="1000,10000,100000", help="comma-separated point counts")
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'points':>9} {'build ms':>10} {'frame ms':>9} {'p95 ms':>9} {'visible':>8} {'changed':>8}")
+    for count in (int(value) for value in args.counts.split(",")):
+        run(count, args.frames, args.seed)
+
+
+if __name__ == "__main__":
+    main()
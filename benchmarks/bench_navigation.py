@@ -0,0 +1,50 @@
+"""
+Measures per-navigation latency in AppWindow with page caching on and off.
+
+Needs a display (use xvfb-run on headless machines). Run from the project root:
+    python -m benchmarks.bench_navigation --rounds 5
+"""
+import argparse
+from types import SimpleNamespace
+
+import geocoder
+import ttkbootstrap as ttk
+
+from gui.app_window import AppWindow
+
+ROUTE = ["slideshow", "main", "alerts", "main", "more", "resources", "main", "more", "quiz", "main"]
+
+
+def run(cache_pages, rounds):
+    """
+    Walks the navigation route repeatedly and returns the page manager's latency report.
+    """
+    root = ttk.Window(themename="cosmo")
+    app = AppWindow(root)
+    app.pages.cache_pages = cache_pages
+    for _ in range(rounds):
+        for name in ROUTE:
+            app.pages.show(name)
+            root.update()
+    report = app.pages.report()
+    root.destroy()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    geocoder.ip = lambda _location: SimpleNamespace(latlng=None, country=None)
+    for label, cache_pages in (("rebuild every visit", False), ("cached pages", True)):
+        print(label)
+        for name, entry in sorted(run(cache_pages, args.rounds).items()):
+            cached = entry["mean_cached_ms"]
+            cached_text = f"{cached:7.2f} ms" if cached is not None else "      -"
+            print(f"  {name:>10}: first {entry['first_ms']:7.2f} ms, revisit {cached_text}, "
+                  f"{entry['builds']} builds / {entry['visits']} visits")
+
+
+if __name__ == "__main__":
+    main()
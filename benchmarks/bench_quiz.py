@@ -0,0 +1,73 @@
+"""
+Measures how long starting a quiz takes as the question bank grows, with and without the compiled bundle.
+
+"Start" is what opening the quiz page does: index the bank and draw the first
+question of an adaptive round.
+
+Run from the project root:
+    python -m benchmarks.bench_quiz --sizes 1000 10000 100000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+from core.content import DIFFICULTIES, ContentStore
+from core.content_bundle import build_bundle
+from core.quiz import QuestionBank, QuizSession
+
+TOPICS = ["earthquakes", "floods", "storms", "fires", "supplies", "first_aid", "communication", "hazards"]
+
+
+def write_questions(asset_dir, size, rng):
+    """
+    Writes a question bank of ``size`` questions with two to six options each.
+    """
+    questions = []
+    for i in range(size):
+        options = [f"Option {j}" for j in range(rng.randint(2, 6))]
+        questions.append({
+            "question": f"Question {i}: " + "what should you do " * 4 + "?",
+            "options": options,
+            "answer": rng.randrange(len(options)),
+            "topic": rng.choice(TOPICS),
+            "difficulty": rng.choice(DIFFICULTIES),
+        })
+    with open(os.path.join(asset_dir, "quiz_questions.json"), "w", encoding="utf-8") as file:
+        json.dump({"questions": questions}, file)
+
+
+def start_quiz(asset_dir):
+    """
+    Opens a fresh store and draws the first question of a round.
+    :return: Seconds until the question was available.
+    """
+    start = time.perf_counter()
+    session = QuizSession(QuestionBank(ContentStore(asset_dir)), rng=random.Random(1))
+    assert session.next_question() is not None
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'questions':>10} {'json start ms':>14} {'bundle start ms':>16}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as asset_dir:
+            write_questions(asset_dir, size, random.Random(size))
+            json_time = min(start_quiz(asset_dir) for _ in range(args.repeat))
+            with contextlib.redirect_stdout(io.StringIO()):  # silence "Skipping <asset>" for absent assets
+                build_bundle(os.path.join(asset_dir, "content.bundle"), ContentStore(asset_dir))
+            bundle_time = min(start_quiz(asset_dir) for _ in range(args.repeat))
+            print(f"{size:>10} {json_time * 1000:14.2f} {bundle_time * 1000:16.2f}")
+
+
+if __name__ == "__main__":
+    main()
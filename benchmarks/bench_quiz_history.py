@@ -0,0 +1,90 @@
+"""
+Times picking due review questions, and saving a round, as the quiz answer history grows.
+
+Run from the project root:
+    python -m benchmarks.bench_quiz_history --answers 10000 100000 1000000 --questions 100000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from core.quiz_history import DAY, QuizHistory, sm2
+
+DUE_SQL = "SELECT question FROM review_state {hint} WHERE due_at <= ? ORDER BY due_at LIMIT ?"
+
+
+def populate(history, answers, questions, now, rng):
+    """
+    Fills a history with ``answers`` logged answers over at most ``questions`` questions.
+    """
+    log = [(f"q{rng.randrange(questions)}", rng.random() < 0.7, now - rng.uniform(0, 365 * DAY)) for _ in range(answers)]
+    states, last_answered = {}, {}
+    for question, correct, answered_at in sorted(log, key=lambda answer: answer[2]):
+        states[question] = sm2(states.get(question), 4 if correct else 1)
+        last_answered[question] = answered_at
+    with history.session() as connection:
+        connection.executemany(
+            "INSERT INTO answers (question, correct, quality, answered_at) VALUES (?, ?, ?, ?)",
+            [(question, int(correct), 4 if correct else 1, answered_at) for question, correct, answered_at in log],
+        )
+        connection.executemany(
+            "INSERT INTO review_state VALUES (?, ?, ?, ?, ?)",
+            [(question, *state, last_answered[question] + state[1] * DAY) for question, state in states.items()],
+        )
+        connection.execute("ANALYZE")
+    return len(states)
+
+
+def best_of(repeat, func):
+    """
+    Returns the fastest of ``repeat`` timed calls, in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--answers", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--questions", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    now = time.time()
+    print(f"{'answers':>9} {'reviewed':>9} {'due (index) ms':>15} {'due (scan) ms':>14} {'save round ms':>14} {'per-answer ms':>14}")
+    for answers in args.answers:
+        with tempfile.TemporaryDirectory() as tmp:
+            history = QuizHistory(os.path.join(tmp, "history.db"), pooled=True)
+            reviewed = populate(history, answers, args.questions, now, random.Random(answers))
+
+            def due(hint):
+                with history.session() as connection:
+                    return connection.execute(DUE_SQL.format(hint=hint), (now, args.limit)).fetchall()
+
+            assert due("") == due("NOT INDEXED")
+            rng = random.Random(1)
+            round_results = lambda: [(f"q{rng.randrange(args.questions)}", rng.random() < 0.7) for _ in range(10)]
+
+            def per_answer():
+                for result in round_results():
+                    history.record_round([result], answered_at=now)
+
+            print(
+                f"{answers:>9} {reviewed:>9} "
+                f"{best_of(args.repeat, lambda: due('')) * 1000:15.3f} "
+                f"{best_of(args.repeat, lambda: due('NOT INDEXED')) * 1000:14.3f} "
+                f"{best_of(args.repeat, lambda: history.record_round(round_results(), answered_at=now)) * 1000:14.3f} "
+                f"{best_of(args.repeat, per_answer) * 1000:14.3f}"
+            )
+            history.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Measures offline coordinate-to-country lookups over random points.
+
+Run from the project root:
+    python -m benchmarks.bench_reverse_geocoder --points 200000
+"""
+import argparse
+import random
+import time
+
+from core.reverse_geocoder import ReverseGeocoder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    geocoder = ReverseGeocoder()
+    load = time.perf_counter() - start
+
+    rng = random.Random(args.seed)
+    points = [(rng.uniform(-60, 75), rng.uniform(-180, 180)) for _ in range(args.points)]
+
+    start = time.perf_counter()
+    results = geocoder.lookup_many(points)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    geocoder.lookup_many(points)
+    warm = time.perf_counter() - start
+
+    matched = sum(result is not None for result in results)
+    print(f"{'index load':>12}: {load * 1000:8.1f} ms ({len(geocoder.countries)} countries)")
+    print(f"{'first pass':>12}: {cold / args.points * 1e6:8.2f} us/point")
+    print(f"{'second pass':>12}: {warm / args.points * 1e6:8.2f} us/point")
+    print(f"{'on land':>12}: {matched}/{args.points}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measures search-as-you-type latency and incremental re-indexing on a large synthetic corpus.
+
+Each query is typed one character at a time and every prefix is searched with
+quick_search, as the search page does; exact, prefix and misspelt words are
+all exercised. Full ranking (search) is timed for the complete queries.
+
+Run from the project root:
+    python -m benchmarks.bench_search --documents 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from core.search import SearchIndex
+
+WORDS = (
+    "earthquake flood cyclone hurricane tsunami wildfire landslide drought storm surge evacuation shelter "
+    "water purify supplies battery radio whistle first aid bandage hospital ambulance police fire rescue "
+    "route higher ground sandbag generator blanket medicine map signal family plan meeting point warning "
+    "siren alert volunteer relief camp boil filter tablets chemical spill smoke mask helmet stairs elevator"
+).split()
+QUERIES = ["evacuation route", "purify water", "first aid kit", "cyclone shelter", "huricane", "earthquak safety", "st"]
+
+
+def make_documents(count, rng):
+    """
+    Generates alert-like documents from a small preparedness vocabulary plus rarer filler words.
+    """
+    return [
+        {
+            "id": str(i),
+            "text": " ".join(rng.choice(WORDS) if rng.random() < 0.7 else f"term{rng.randrange(50000)}" for _ in range(rng.randint(8, 30))),
+            "severity": rng.choice(["minor", "moderate", "severe"]),
+            "region": f"Region {rng.randrange(500)}",
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=100, help="documents edited for the incremental update")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    alerts = make_documents(args.documents, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SearchIndex(os.path.join(tmp, "search.db"))
+
+        start = time.perf_counter()
+        index.index_asset("alerts", alerts)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.vocabulary()
+        vocabulary = time.perf_counter() - start
+
+        for alert in rng.sample(alerts, args.changes):
+            alert["text"] += " updated"
+        start = time.perf_counter()
+        changed = index.index_asset("alerts", alerts)
+        incremental = time.perf_counter() - start
+
+        latencies, incomplete = [], 0
+        for query in QUERIES:
+            for length in range(1, len(query) + 1):
+                start = time.perf_counter()
+                incomplete += not index.quick_search(query[:length])[1]
+                latencies.append(time.perf_counter() - start)
+        latencies.sort()
+
+        full = []
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.search(query)
+            full.append(time.perf_counter() - start)
+
+        print(f"{'full build':>18}: {build:9.2f} s for {args.documents} documents")
+        print(f"{'vocabulary load':>18}: {vocabulary * 1000:9.1f} ms")
+        print(f"{'incremental':>18}: {incremental * 1000:9.1f} ms ({changed} of {args.documents} documents rewritten)")
+        print(f"{'keystroke p50':>18}: {statistics.median(latencies) * 1000:9.2f} ms")
+        print(f"{'keystroke p95':>18}: {latencies[int(len(latencies) * 0.95)] * 1000:9.2f} ms")
+        print(f"{'keystroke max':>18}: {latencies[-1] * 1000:9.2f} ms ({incomplete} of {len(latencies)} need full ranking)")
+        print(f"{'full ranking p50':>18}: {statistics.median(full) * 1000:9.2f} ms")
+        print(f"{'full ranking max':>18}: {max(full) * 1000:9.2f} ms")
+        index.close_all()
+
+
+if __name__ == "__main__":
+    main()
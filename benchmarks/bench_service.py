@@ -0,0 +1,109 @@
+"""
+Load-tests the contact service: many keep-alive clients sending lookups, reporting latency percentiles and throughput.
+
+The service runs in its own process, as it would in production. Each client
+sends its requests one after another; half of them are country lookups and
+half coordinates.
+Run from the project root:
+    python -m benchmarks.bench_service --clients 50 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from core.database import DatabaseManager
+
+COUNTRIES = ["India", "United States", "United Kingdom", "Australia", "Canada", "DE", "fr", "Japan"]
+POINTS = [(13.08, 80.27), (40.71, -74.0), (51.5, -0.12), (-33.86, 151.2), (48.85, 2.35), (35.68, 139.69)]
+
+
+def start_service(db_path, workers, batch_window_ms, max_batch):
+    """
+    Launches the service on a free port.
+    :return: (process, port).
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-m", "core.service", "--port", "0", "--db", db_path,
+         "--workers", str(workers), "--batch-window-ms", str(batch_window_ms), "--max-batch", str(max_batch)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline()
+    match = re.search(r":(\d+)$", line.strip())
+    if not match:
+        process.kill()
+        raise RuntimeError(f"service did not start: {line!r}")
+    return process, int(match.group(1))
+
+
+async def client(port, requests, latencies, rng):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for _ in range(requests):
+            if rng.random() < 0.5:
+                query = f"country={rng.choice(COUNTRIES).replace(' ', '+')}"
+            else:
+                lat, lon = rng.choice(POINTS)
+                query = f"lat={lat + rng.uniform(-0.1, 0.1):.4f}&lon={lon + rng.uniform(-0.1, 0.1):.4f}"
+            start = time.perf_counter()
+            writer.write(f"GET /contacts?{query} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            body = json.loads(await reader.readexactly(length))
+            latencies.append(time.perf_counter() - start)
+            assert b" 200 " in status and body["emergency"], (status, body)
+    finally:
+        writer.close()
+
+
+async def load(port, clients, requests):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, requests, latencies, random.Random(i)) for i in range(clients)))
+    return latencies, time.perf_counter() - start
+
+
+def report(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{label:>12}: {len(latencies) / elapsed:8.0f} req/s   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "contacts.db")
+        with DatabaseManager(db_path) as db:
+            db.add_contacts_bulk([("India", "100", "101", "102"), ("United States", "911", "911", "911")])
+
+        modes = (("unbatched", 0.0, 1), ("batched", 0.0, 256), ("batched 2ms", 2.0, 256))
+        for label, window_ms, max_batch in modes:
+            process, port = start_service(db_path, args.workers, window_ms, max_batch)
+            try:
+                asyncio.run(load(port, 5, 20))  # warm up connections and caches
+                report(label, *asyncio.run(load(port, args.clients, args.requests)))
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
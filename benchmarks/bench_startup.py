@@ -0,0 +1,57 @@
+"""
+Measures time to first frame of AppWindow with a simulated slow geolocation provider.
+
+Needs a display (use xvfb-run on headless machines). Run from the project root:
+    python -m benchmarks.bench_startup --latency 1.5
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import geocoder
+import ttkbootstrap as ttk
+
+from gui.app_window import AppWindow
+
+
+def slow_provider(latency):
+    """
+    Builds a stand-in for geocoder.ip that sleeps like a network round trip.
+    """
+    def ip(_location):
+        time.sleep(latency)
+        return SimpleNamespace(latlng=[13.0827, 80.2707], country="India")
+    return ip
+
+
+def time_first_frame(blocking):
+    """
+    Builds the main window and returns seconds until its first frame is drawn.
+    :param blocking: Also resolve the emergency number synchronously, as startup used to.
+    """
+    start = time.perf_counter()
+    root = ttk.Window(themename="cosmo")
+    app = AppWindow(root)
+    if blocking:
+        app.get_emergency_number()
+    root.update()
+    elapsed = time.perf_counter() - start
+    root.destroy()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=1.5, help="simulated lookup latency in seconds")
+    args = parser.parse_args()
+
+    geocoder.ip = slow_provider(args.latency)
+    blocking = time_first_frame(blocking=True)
+    background = time_first_frame(blocking=False)
+
+    print(f"{'blocking lookup':>18}: {blocking * 1000:8.1f} ms to first frame")
+    print(f"{'background lookup':>18}: {background * 1000:8.1f} ms to first frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compares loading map tiles from a local tile server against reading them back from the TileCache.
+
+Run from the project root:
+    python -m benchmarks.bench_tile_cache --tiles 200 --latency-ms 20
+"""
+import argparse
+import http.server
+import os
+import tempfile
+import threading
+import time
+
+from core.tile_cache import TileCache, TilePrefetcher, fetch_tile, tile_url
+
+TILE_BYTES = os.urandom(15 * 1024)  # about the size of an OSM PNG tile
+
+
+def serve_tiles(latency):
+    """
+    Starts a local HTTP server that answers every path with TILE_BYTES after ``latency`` seconds.
+    :return: The running server; its port is server.server_address[1].
+    """
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(TILE_BYTES)))
+            self.end_headers()
+            self.wfile.write(TILE_BYTES)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tiles", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated network round trip per tile")
+    args = parser.parse_args()
+
+    server = serve_tiles(args.latency_ms / 1000)
+    tile_server = f"http://127.0.0.1:{server.server_address[1]}/{{z}}/{{x}}/{{y}}.png"
+    tiles = [(14, x, 0) for x in range(args.tiles)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TileCache(os.path.join(tmp, "tiles.db"))
+
+        start = time.perf_counter()
+        for zoom, x, y in tiles:
+            fetch_tile(tile_url(tile_server, zoom, x, y))
+        network = time.perf_counter() - start
+
+        prefetcher = TilePrefetcher(cache, tile_server=tile_server)
+        start = time.perf_counter()
+        stored = sum(future.result() for future in prefetcher.prefetch_around(0.0, 0.0, zooms=[14], radius=6))
+        prefetch = time.perf_counter() - start
+        prefetcher.shutdown()
+
+        for zoom, x, y in tiles:
+            cache.put(zoom, x, y, tile_server, TILE_BYTES)
+        start = time.perf_counter()
+        for zoom, x, y in tiles:
+            assert cache.get(zoom, x, y, tile_server) is not None
+        cached = time.perf_counter() - start
+
+    server.shutdown()
+    print(f"{'network':>12}: {network / len(tiles) * 1000:9.3f} ms/tile")
+    print(f"{'cache':>12}: {cached / len(tiles) * 1000:9.3f} ms/tile")
+    print(f"{'speedup':>12}: {network / cached:9.0f}x")
+    print(f"{'prefetch':>12}: {stored} tiles in {prefetch * 1000:.0f} ms on 4 workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,526 @@
+"""
+Runs the benchmark suite and writes machine-readable results, optionally compared against a baseline.
+
+Every case is timed ``--repeat`` times after one warm-up run, with garbage
+collection paused as timeit does, and reported per operation. Data sizes
+scale with ``--scale`` and all synthetic data is seeded, so two runs at the
+same scale do the same work. With ``--baseline`` each case's median is
+compared to the baseline's. The run exits with status 1 if any case errors,
+is slower by more than ``--threshold``, or was ok in the baseline but did not
+produce a timing this time (it errored, was skipped or no longer exists).
+
+GUI cases need Tk and a display; on headless machines pass --xvfb (or run
+under xvfb-run), otherwise they are reported as skipped. They keep every
+cache and database the app writes in the case's scratch directory and never
+touch the network: geolocation, link checks and map tiles are stubbed.
+Run from the project root:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.10
+"""
+import argparse
+import fnmatch
+import gc
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from unittest import mock
+
+RESULTS_FORMAT_VERSION = 1
+CASES = []  # (name, setup function)
+_case_patches = []  # patches started by a case's setup; measure() stops them when the case ends
+
+
+class SkipCase(Exception):
+    """
+    Raised by a case's setup when it cannot run here; the reason is recorded in the results.
+    """
+
+
+def case(name):
+    """
+    Registers a benchmark case.
+
+    The decorated setup function takes the scale and a scratch directory and
+    returns (operation, ops): a zero-argument callable to time and how many
+    operations one call performs. An operation that needs per-run setup of its
+    own may time itself and return the elapsed seconds instead.
+    """
+    def register(setup):
+        CASES.append((name, setup))
+        return setup
+    return register
+
+
+def countries(count):
+    return [(f"Country {i}", str(100 + i % 900), "101", "102") for i in range(count)]
+
+
+@case("database.fetch_contacts.per_call")
+def bench_fetch_per_call(scale, tmp):
+    from core.database import DatabaseManager
+
+    rows = 1000 * scale
+    db = DatabaseManager(os.path.join(tmp, "contacts.db"))
+    db.add_contacts_bulk(countries(rows))
+    names = [f"Country {i}" for i in random.Random(1).sample(range(rows), 200)]
+    return lambda: [db.fetch_contacts(name) for name in names], len(names)
+
+
+@case("database.fetch_contacts.pooled")
+def bench_fetch_pooled(scale, tmp):
+    from core.database import DatabaseManager
+
+    rows = 1000 * scale
+    db = DatabaseManager(os.path.join(tmp, "contacts.db"), pooled=True)
+    db.add_contacts_bulk(countries(rows))
+    names = [f"Country {i}" for i in random.Random(1).sample(range(rows), 1000)]
+    return lambda: [db.fetch_contacts(name) for name in names], len(names)
+
+
+@case("database.fetch_contacts.all")
+def bench_fetch_all(scale, tmp):
+    from core.database import DatabaseManager
+
+    rows = 1000 * scale
+    db = DatabaseManager(os.path.join(tmp, "contacts.db"), pooled=True)
+    db.add_contacts_bulk(countries(rows))
+    return db.fetch_contacts, 1
+
+
+@case("database.add_contact")
+def bench_add_contact(scale, tmp):
+    from core.database import DatabaseManager
+
+    db = DatabaseManager(os.path.join(tmp, "contacts.db"))
+    db.add_contacts_bulk(countries(1000 * scale))
+    rows = [(f"New {i}", "100", "101", "102") for i in range(100)]
+    return lambda: [db.add_contact(*row) for row in rows], len(rows)
+
+
+@case("database.add_contacts_bulk")
+def bench_add_contacts_bulk(scale, tmp):
+    from core.database import DatabaseManager
+
+    rows = countries(1000 * scale)
+    runs = iter(range(sys.maxsize))
+
+    def write():
+        # A fresh file per run, so every run inserts rather than updates
+        DatabaseManager(os.path.join(tmp, f"bulk-{next(runs)}.db")).add_contacts_bulk(rows)
+
+    return write, len(rows)
+
+
+def synthetic_alerts(path, scale):
+    """
+    Writes a seeded alerts asset of 1000 * scale alerts, a third of them with a circular area.
+    """
+    rng = random.Random(3)
+    alerts = []
+    for i in range(1000 * scale):
+        alert = {"id": f"a{i}", "text": f"Alert {i}: " + "move to higher ground " * 3,
+                 "severity": rng.choice(["extreme", "severe", "moderate", "minor"]), "region": f"Region {i % 40}"}
+        if i % 3 == 0:
+            alert["area"] = {"lat": rng.uniform(-60, 70), "lon": rng.uniform(-180, 180), "radius_km": rng.uniform(5, 200)}
+        alerts.append(alert)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"alerts": alerts}, file)
+
+
+# Assets the repository does not ship, generated into the case's scratch directory instead.
+SYNTHETIC_ASSETS = {"alerts": synthetic_alerts}
+
+
+def content_loader(name):
+    """
+    Registers a case parsing and validating one content asset, as a page's first visit does.
+    """
+    def setup(scale, tmp):
+        from core.content import ASSETS, ContentStore
+        from core.paths import DATA_DIR
+
+        asset_dir = DATA_DIR
+        if name in SYNTHETIC_ASSETS:
+            asset_dir = tmp
+            SYNTHETIC_ASSETS[name](os.path.join(tmp, ASSETS[name][0]), scale)
+        store = ContentStore(asset_dir)
+        if not os.path.exists(store.path_for(name)):
+            raise SkipCase(f"{store.path_for(name)} is missing")
+        return lambda: ContentStore(asset_dir).get(name), 1
+
+    case(f"content.load.{name}")(setup)
+
+
+def register_content_loaders():
+    from core.content import ASSETS
+
+    for name in ASSETS:
+        content_loader(name)
+
+
+def stub_geocoder(latlng=(13.0827, 80.2707), country="India"):
+    """
+    Stands in for the geocoder package so GPSTracker never touches the network.
+    """
+    module = types.ModuleType("geocoder")
+    module.ip = lambda location: types.SimpleNamespace(latlng=list(latlng), country=country)
+    return mock.patch.dict(sys.modules, {"geocoder": module})
+
+
+@case("gps.locate.stubbed")
+def bench_gps_locate(scale, tmp):
+    from core.gps import GPSTracker
+    from core.location_cache import LocationCache
+
+    cache = LocationCache(os.path.join(tmp, "location.json"))
+
+    def locate():
+        with stub_geocoder():
+            for _ in range(50):
+                GPSTracker(cache=cache, max_age=0).get_coordinates()
+
+    return locate, 50
+
+
+@case("gps.cached_fix")
+def bench_gps_cached(scale, tmp):
+    from core.gps import GPSTracker
+    from core.location_cache import LocationCache
+
+    cache = LocationCache(os.path.join(tmp, "location.json"))
+    cache.store((13.0827, 80.2707), "India", source="ip")
+    return lambda: [GPSTracker(cache=cache).get_coordinates() for _ in range(200)], 200
+
+
+@case("gps.country.offline")
+def bench_gps_country(scale, tmp):
+    from core.gps import GPSTracker
+    from core.location_cache import LocationCache
+    from core.reverse_geocoder import default_geocoder
+
+    default_geocoder()  # load the shapes outside the timing
+    rng = random.Random(2)
+    trackers = []
+    for _ in range(200):
+        tracker = GPSTracker(cache=LocationCache(os.path.join(tmp, "unused.json")))
+        tracker.last_coordinates = (rng.uniform(-60, 70), rng.uniform(-180, 180))
+        trackers.append(tracker)
+    return lambda: [tracker.country for tracker in trackers], len(trackers)
+
+
+_gui_geocoder = None
+
+
+def patch_for_case(patcher):
+    """
+    Starts a mock patcher that stays active until the current case ends.
+    """
+    _case_patches.append(patcher)
+    return patcher.start()
+
+
+def patch_default(function, parameter, value):
+    """
+    Replaces the default value of one of a function's parameters for the current case.
+    """
+    code = function.__code__
+    names = code.co_varnames[:code.co_argcount]
+    defaults = list(function.__defaults__)
+    defaults[names.index(parameter) - (len(names) - len(defaults))] = value
+    patch_for_case(mock.patch.object(function, "__defaults__", tuple(defaults)))
+
+
+def blank_tile():
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (256, 256), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def isolate_gui(tmp):
+    """
+    Points every cache and database the app writes at ``tmp`` and stubs the link checks and tile downloads.
+
+    The page modules are imported here rather than on first navigation; the
+    warm-up run of each case pays for those imports anyway.
+    """
+    import core.contacts
+    import core.link_checker
+    import core.search
+    import gui.interactive_map
+    from core.database import DatabaseManager
+    from core.link_checker import LinkCache
+    from core.location_cache import LocationCache
+    from core.quiz_history import QuizHistory
+    from core.search import SearchIndex
+    from core.tile_cache import TileCache
+    from core.track import TrackRecorder
+
+    for function, parameter, name in (
+        (DatabaseManager.__init__, "db_path", "contacts.db"),
+        (SearchIndex.__init__, "db_path", "search_index.db"),
+        (QuizHistory.__init__, "db_path", "quiz_history.db"),
+        (TileCache.__init__, "db_path", "tile_cache.db"),
+        (LinkCache.__init__, "path", "link_cache.json"),
+        (LocationCache.__init__, "path", "location_cache.json"),
+        (TrackRecorder.__init__, "log_path", "track.bin"),
+    ):
+        patch_default(function, parameter, os.path.join(tmp, name))
+    # Fresh shared instances, created under the paths above
+    patch_for_case(mock.patch.object(core.search, "_default_index", None))
+    patch_for_case(mock.patch.object(core.contacts, "_default_resolver", None))
+
+    async def check_link(pool, url, cached=None, timeout=10.0):
+        return {"url": url, "status": 200, "final_url": url, "etag": None, "last_modified": None,
+                "error": None, "checked_at": time.time()}
+
+    tile = blank_tile()
+    patch_for_case(mock.patch.object(core.link_checker, "check_link", check_link))
+    patch_for_case(mock.patch.object(gui.interactive_map, "fetch_tile", lambda url, timeout=10: tile))
+
+
+def open_app(tmp):
+    """
+    Builds the main window headlessly, isolated from the real caches and the network (see isolate_gui).
+    :return: (root, app).
+    """
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        raise SkipCase("no display; run with --xvfb or under xvfb-run")
+    try:
+        import ttkbootstrap as ttk
+        from gui.app_window import AppWindow
+    except ImportError as e:
+        raise SkipCase(f"GUI dependencies unavailable: {e}")
+    global _gui_geocoder
+    if _gui_geocoder is None:
+        # Left in place for the rest of the run: the window locates itself on a background thread
+        _gui_geocoder = stub_geocoder()
+        _gui_geocoder.start()
+    if not _case_patches:
+        isolate_gui(tmp)
+    root = ttk.Window(themename="cosmo")
+    app = AppWindow(root)
+    root.update()
+    return root, app
+
+
+@case("gui.app_window.startup")
+def bench_app_startup(scale, tmp):
+    root, _ = open_app(tmp)  # fail fast before timing if the GUI cannot run
+    root.destroy()
+
+    def start():
+        root, _ = open_app(tmp)
+        root.destroy()
+
+    return start, 1
+
+
+def navigation_case(page):
+    """
+    Registers cases timing the first (building) and later (cached) visits to one page.
+    """
+    def first_visit(scale, tmp):
+        def visit():
+            # Each run needs a window where the page has not been built yet
+            root, app = open_app(tmp)
+            start = time.perf_counter()
+            app.pages.show(page)
+            root.update()
+            elapsed = time.perf_counter() - start
+            root.destroy()
+            return elapsed
+
+        open_app(tmp)[0].destroy()
+        return visit, 1
+
+    def revisit(scale, tmp):
+        root, app = open_app(tmp)
+        app.pages.show(page)
+        root.update()
+
+        def visit():
+            app.pages.show("main")
+            app.pages.show(page)
+            root.update()
+
+        return visit, 1
+
+    case(f"gui.navigate.{page}.first")(first_visit)
+    case(f"gui.navigate.{page}.revisit")(revisit)
+
+
+for _page in ("slideshow", "alerts", "resources", "quiz", "map", "search"):
+    navigation_case(_page)
+register_content_loaders()
+
+
+def measure(setup, scale, repeat):
+    """
+    Runs one case.
+    :return: Result dict; "status" is "ok", "skipped" or "error".
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            operation, ops = setup(scale, tmp)
+            operation()  # warm up caches, imports and lazily built indexes
+            timings = []
+            for _ in range(repeat):
+                gc.collect()
+                gc.disable()
+                try:
+                    start = time.perf_counter()
+                    elapsed = operation()
+                    if not isinstance(elapsed, float):
+                        elapsed = time.perf_counter() - start
+                    timings.append(elapsed / ops)
+                finally:
+                    gc.enable()
+        except SkipCase as e:
+            return {"status": "skipped", "reason": str(e)}
+        except Exception as e:
+            return {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+        finally:
+            while _case_patches:
+                _case_patches.pop().stop()
+    return {
+        "status": "ok",
+        "ops": ops,
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "samples": timings,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold, selected=lambda name: True):
+    """
+    Compares medians with a baseline run.
+    :param selected: Tells whether a case name was selected for this run; baseline cases outside it are ignored.
+    :return: Dict with "changes" (case name -> relative change, 0.1 meaning 10% slower, for cases ok in
+        both runs), "regressions" (names slower by more than ``threshold``) and "failures" (case name ->
+        reason, for cases ok in the baseline that have no timing now).
+    """
+    changes, failures = {}, {}
+    for name, before in baseline.get("results", {}).items():
+        if before.get("status") != "ok" or not selected(name):
+            continue
+        result = results.get(name)
+        if result is None:
+            failures[name] = "missing from this run"
+        elif result["status"] != "ok":
+            failures[name] = f"{result['status']}: {result['reason']}"
+        else:
+            changes[name] = result["median_s"] / before["median_s"] - 1
+    regressions = sorted(name for name, change in changes.items() if change > threshold)
+    return {"changes": changes, "regressions": regressions, "failures": failures}
+
+
+def format_time(seconds):
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:8.2f} {unit}"
+    return f"{seconds * 1e9:8.0f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="multiplies data sizes such as database rows")
+    parser.add_argument("--repeat", type=int, default=7, help="timed runs per case")
+    parser.add_argument("--filter", nargs="+", default=["*"], help="glob patterns selecting case names")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown counted as a regression")
+    parser.add_argument("--xvfb", action="store_true", help="re-run under xvfb-run when there is no display")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(name for name, _ in CASES))
+        return 0
+    if args.xvfb and not os.environ.get("DISPLAY"):
+        if shutil.which("xvfb-run") is None:
+            print("Error starting Xvfb: xvfb-run is not installed")
+            return 2
+        argv = [arg for arg in sys.argv[1:] if arg != "--xvfb"]
+        return subprocess.call(["xvfb-run", "-a", sys.executable, "-m", "benchmarks.suite", *argv])
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, "r", encoding="utf-8") as file:
+                baseline = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Error reading baseline: {e}")
+            return 2
+        if baseline.get("meta", {}).get("scale") != args.scale:
+            print(f"Warning: baseline was run at scale {baseline.get('meta', {}).get('scale')}, this run at {args.scale}")
+
+    random.seed(0)
+    results = {}
+    for name, setup in CASES:
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in args.filter):
+            continue
+        results[name] = result = measure(setup, args.scale, args.repeat)
+        if result["status"] == "ok":
+            print(f"{name:<40} {format_time(result['median_s'])}/op  ±{result['stdev_s'] / result['median_s'] * 100:5.1f}%")
+        else:
+            print(f"{name:<40} {result['status']}: {result['reason']}")
+
+    report = {
+        "version": RESULTS_FORMAT_VERSION,
+        "meta": {
+            "timestamp": time.time(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    errors = sorted(name for name, result in results.items() if result["status"] == "error")
+    status = 1 if errors else 0
+    if baseline is not None:
+        selected = lambda name: any(fnmatch.fnmatch(name, pattern) for pattern in args.filter)
+        comparison = compare(results, baseline, args.threshold, selected)
+        changes, regressions, failures = comparison["changes"], comparison["regressions"], comparison["failures"]
+        report["comparison"] = {"baseline": args.baseline, "threshold": args.threshold, **comparison}
+        print(f"\nAgainst {args.baseline} (regression above +{args.threshold:.0%}):")
+        for name, change in sorted(changes.items(), key=lambda item: item[1], reverse=True):
+            marker = "REGRESSION" if name in regressions else ("faster" if change < -args.threshold else "")
+            print(f"  {name:<40} {change:+8.1%}  {marker}")
+        for name, reason in sorted(failures.items()):
+            print(f"  {name:<40}   FAILED  {reason}")
+        if regressions or failures:
+            status = 1
+    if errors:
+        print(f"\n{len(errors)} case(s) failed: {', '.join(errors)}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
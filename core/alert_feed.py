@@ -0,0 +1,182 @@
+import hashlib
+import heapq
+import json
+import os
+import queue
+import threading
+import time
+
+from core.content import ContentError, normalize_alert
+
+
+class NDJSONFileSource:
+    """
+    Tails a newline-delimited JSON file, returning only the records appended since the last read.
+
+    A trailing line without a newline is treated as still being written and is
+    picked up on a later read. If the file shrinks it is assumed to have been
+    rotated and is read again from the start.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+
+    def read_new(self):
+        """
+        Reads records appended since the previous call.
+        :return: List of decoded JSON values; malformed lines are skipped.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return []
+        if size < self.offset:
+            self.offset = 0
+        if size == self.offset:
+            return []
+
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            chunk = file.read(size - self.offset)
+        complete = chunk.rfind(b"\n") + 1
+        self.offset += complete
+
+        records = []
+        for line in chunk[:complete].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                print(f"Skipping malformed alert line: {e}")
+        return records
+
+
+def content_id(record):
+    """
+    Derives a stable id for a feed record that has none, from a digest of its content.
+
+    The same alert re-sent, or read again after a restart, gets the same id.
+    """
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return "feed-" + hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class AlertFeed:
+    """
+    Keeps the live set of alerts from a source and reports what changed on each poll.
+
+    Alerts are keyed by id (see content_id for records without one), so
+    re-sent alerts only count as updates when their content changed. An alert
+    expires at its own "expires" time or, failing that, ``ttl`` seconds after
+    it was last received; expiry uses a heap so a poll only looks at alerts
+    that are actually due.
+    """
+
+    def __init__(self, source, ttl=24 * 60 * 60):
+        self.source = source
+        self.ttl = ttl
+        self.alerts = {}
+        self._expiry = {}
+        self._heap = []
+
+    def poll(self, now=None):
+        """
+        Ingests new records and drops expired alerts.
+        :param now: Epoch seconds; defaults to the current time.
+        :return: Dict with "added" and "updated" alert lists and "removed" ids.
+        """
+        now = time.time() if now is None else now
+        added, updated = [], []
+        for record in self.source.read_new():
+            try:
+                alert = normalize_alert(record, content_id(record))
+            except ContentError as e:
+                print(f"Skipping invalid alert: {e}")
+                continue
+            expires = alert["expires"] or now + self.ttl
+            if expires <= now:
+                continue
+
+            previous = self.alerts.get(alert["id"])
+            self.alerts[alert["id"]] = alert
+            self._expiry[alert["id"]] = expires
+            heapq.heappush(self._heap, (expires, alert["id"]))
+            if previous is None:
+                added.append(alert)
+            elif previous != alert:
+                updated.append(alert)
+
+        removed = []
+        while self._heap and self._heap[0][0] <= now:
+            expires, alert_id = heapq.heappop(self._heap)
+            if self._expiry.get(alert_id) == expires:  # skip entries superseded by a later re-send
+                del self._expiry[alert_id]
+                del self.alerts[alert_id]
+                removed.append(alert_id)
+        return {"added": added, "updated": updated, "removed": removed}
+
+
+class AlertFeedWorker:
+    """
+    Polls an AlertFeed on a daemon thread and queues each non-empty diff for the UI thread.
+
+    Listeners added with add_listener() also receive each diff, on the polling
+    thread. The worker can be stopped and started again; the feed keeps its
+    state in between.
+    """
+
+    def __init__(self, feed, interval=2.0):
+        self.feed = feed
+        self.interval = interval
+        self.diffs = queue.Queue()
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_listener(self, callback):
+        """
+        Registers a callable run on the polling thread with every non-empty diff.
+        """
+        self._listeners.append(callback)
+
+    def start(self):
+        """
+        Starts polling in the background, unless already polling.
+        :return: self, for chaining.
+        """
+        if self._thread is not None:
+            if not self._stop.is_set():
+                return self
+            self._thread.join()  # let a stopping thread finish its poll before the feed is shared
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="alert-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Asks the polling thread to finish after its current poll.
+        """
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def _run(self, stop):
+        while not stop.is_set():
+            try:
+                diff = self.feed.poll()
+            except Exception as e:
+                print(f"Error polling alert feed: {e}")
+            else:
+                if diff["added"] or diff["updated"] or diff["removed"]:
+                    for callback in self._listeners:
+                        try:
+                            callback(diff)
+                        except Exception as e:
+                            print(f"Error in alert feed listener: {e}")
+                    self.diffs.put(diff)
+            stop.wait(self.interval)
@@ -0,0 +1,155 @@
+import math
+from collections import Counter
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance between two coordinates in kilometres.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def area_contains(area, lat, lon):
+    """
+    Exact test of whether a normalized alert area covers a coordinate.
+    """
+    if "bbox" in area:
+        south, west, north, east = area["bbox"]
+        if not south <= lat <= north:
+            return False
+        return west <= lon <= east if west <= east else lon >= west or lon <= east
+    return haversine_km(area["lat"], area["lon"], lat, lon) <= area["radius_km"]
+
+
+def area_bounds(area):
+    """
+    Bounding box (south, west, north, east) of an area; west > east when it wraps the antimeridian.
+    """
+    if "bbox" in area:
+        return tuple(area["bbox"])
+    lat, lon, radius = area["lat"], area["lon"], area["radius_km"]
+    d_lat = radius / KM_PER_DEGREE
+    south, north = max(-90.0, lat - d_lat), min(90.0, lat + d_lat)
+    if south == -90.0 or north == 90.0:
+        return south, -180.0, north, 180.0  # reaches a pole: every longitude
+    cos_lat = min(math.cos(math.radians(south)), math.cos(math.radians(north)))
+    d_lon = radius / (KM_PER_DEGREE * max(cos_lat, 1e-9))
+    if d_lon >= 180:
+        return south, -180.0, north, 180.0
+    west, east = lon - d_lon, lon + d_lon
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return south, west, north, east
+
+
+class AlertIndex:
+    """
+    Grid hash answering "which alerts cover this coordinate" without scanning every alert.
+
+    Each alert is registered in every ``cell_size`` degree cell its bounding box
+    touches; a query looks up the single cell holding the point and runs the
+    exact area test only on that cell's alerts. Alerts without an area apply
+    everywhere and are always returned. The distinct values of the fields in
+    ``CHOICE_FIELDS`` are counted as alerts come and go, for filter menus.
+    """
+    CHOICE_FIELDS = ("severity", "region")
+
+    def __init__(self, cell_size=1.0):
+        self.cell_size = cell_size
+        self._columns = int(math.ceil(360 / cell_size))
+        self._cells = {}
+        self._alert_cells = {}
+        self._global = {}
+        self._choices = {field: Counter() for field in self.CHOICE_FIELDS}
+        self.alerts = {}
+
+    def __len__(self):
+        return len(self.alerts)
+
+    def _cell(self, lat, lon):
+        column = int((lon + 180) // self.cell_size) % self._columns
+        row = int((min(lat, 89.999999) + 90) // self.cell_size)
+        return row, column
+
+    def _cells_for(self, area):
+        south, west, north, east = area_bounds(area)
+        first_row, first_column = self._cell(south, west)
+        last_row, last_column = self._cell(north, east)
+        if west <= east and east - west >= 360 - self.cell_size:
+            columns = range(self._columns)
+        else:
+            # The modulo also covers boxes that wrap the antimeridian (west > east).
+            span = (last_column - first_column) % self._columns
+            columns = [(first_column + step) % self._columns for step in range(span + 1)]
+        for row in range(first_row, last_row + 1):
+            for column in columns:
+                yield row, column
+
+    def add(self, alert):
+        """
+        Indexes an alert, replacing any previous alert with the same id.
+        """
+        self.remove(alert["id"])
+        self.alerts[alert["id"]] = alert
+        for field, counts in self._choices.items():
+            if alert.get(field):
+                counts[alert[field]] += 1
+        area = alert.get("area")
+        if area is None:
+            self._global[alert["id"]] = alert
+            return
+        cells = list(self._cells_for(area))
+        self._alert_cells[alert["id"]] = cells
+        for cell in cells:
+            self._cells.setdefault(cell, {})[alert["id"]] = alert
+
+    def remove(self, alert_id):
+        """
+        Removes an alert from the index if present.
+        """
+        alert = self.alerts.pop(alert_id, None)
+        if alert is None:
+            return
+        for field, counts in self._choices.items():
+            value = alert.get(field)
+            if value:
+                counts[value] -= 1
+                if not counts[value]:
+                    del counts[value]
+        self._global.pop(alert_id, None)
+        for cell in self._alert_cells.pop(alert_id, ()):
+            bucket = self._cells[cell]
+            del bucket[alert_id]
+            if not bucket:
+                del self._cells[cell]
+
+    def choices(self, field):
+        """
+        Returns the distinct non-empty values of a field among the indexed alerts.
+        :param field: One of CHOICE_FIELDS.
+        :return: Sorted list of values.
+        """
+        return sorted(self._choices[field])
+
+    def query(self, lat, lon, include_global=True):
+        """
+        Returns the alerts whose area covers a coordinate.
+        :param lat: Latitude in degrees.
+        :param lon: Longitude in degrees.
+        :param include_global: Also return alerts that have no area.
+        :return: List of matching alerts, in no particular order.
+        """
+        bucket = self._cells.get(self._cell(lat, lon), {})
+        matches = [alert for alert in bucket.values() if area_contains(alert["area"], lat, lon)]
+        if include_global:
+            matches.extend(self._global.values())
+        return matches
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+
+from assets.data.init_contacts import country_emergency_numbers, global_emergency_number
+from core.countries import country_name_for, iso_code_for, looks_like_iso_code, normalize_country_name
+from core.database import DatabaseManager
+
+_MISSING = object()
+
+
+class ContactResolver:
+    """
+    Resolves countries to emergency numbers through a bounded, time-limited LRU cache.
+
+    Lookups go to the contacts database on a miss and are then served from memory
+    until they expire or the database reports a change to that country.
+    """
+
+    def __init__(self, db=None, maxsize=256, ttl=300.0):
+        self.db = db if db is not None else DatabaseManager(pooled=True)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.db.add_change_listener(self.invalidate)
+
+    def lookup(self, country):
+        """
+        Returns the contact row for a country, using the cache when possible.
+        :param country: Country name in any case or accenting, or an ISO 3166-1 alpha-2 code.
+        :return: (id, country, police, fire, ambulance, region) tuple, preferring the country-wide row, or None if unknown.
+        """
+        key = normalize_country_name(country)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > now:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        if looks_like_iso_code(country):
+            rows = self.db.fetch_contacts_by_code(country)
+        else:
+            rows = self.db.fetch_contacts(country)
+        contact = rows[0] if rows else None
+        with self._lock:
+            self._cache[key] = (now + self.ttl, contact)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return contact
+
+    def emergency_number(self, country):
+        """
+        Picks the general emergency number for a country.
+
+        Uses the first stored police/ambulance/fire number, then the bundled
+        country table, then the global default.
+        :param country: Country name or ISO code, or None when the location is unknown.
+        :return: Emergency number as a string.
+        """
+        if not country:
+            return global_emergency_number
+        contact = self.lookup(country)
+        if contact:
+            for number in (contact[2], contact[4], contact[3]):
+                if number:
+                    return number
+        if looks_like_iso_code(country):
+            country = country_name_for(country) or country
+        return country_emergency_numbers.get(country, global_emergency_number)
+
+    def invalidate(self, countries=None):
+        """
+        Drops cached entries for the given countries, or the whole cache when None.
+
+        Lookups by ISO code are cached under the code, so a country's code entry is dropped along with its name.
+        :param countries: Iterable of country names, or None.
+        """
+        with self._lock:
+            if countries is None:
+                self._cache.clear()
+                return
+            for country in countries:
+                self._cache.pop(normalize_country_name(country), None)
+                code = iso_code_for(country)
+                if code:
+                    self._cache.pop(normalize_country_name(code), None)
+
+    def stats(self):
+        """
+        Reports cache counters.
+        :return: Dict with hits, misses, size and hit_rate.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+_default_resolver = None
+_default_resolver_lock = threading.Lock()
+
+
+def default_resolver():
+    """
+    Returns the process-wide resolver shared by the GUI pages, creating it on first use.
+    """
+    global _default_resolver
+    with _default_resolver_lock:
+        if _default_resolver is None:
+            _default_resolver = ContactResolver()
+        return _default_resolver
@@ -0,0 +1,68 @@
+import csv
+import json
+import os
+
+CONTACT_FIELDS = ("country", "police", "fire", "ambulance", "iso_code", "region")
+
+
+def _row_from_record(record):
+    """
+    Converts a mapping with contact fields into a (country, police, fire, ambulance, iso_code, region) tuple.
+    :param record: Mapping keyed by the contact field names.
+    :return: Tuple ready for DatabaseManager.add_contacts_bulk; a missing iso_code is derived from the name
+        and a missing region means the numbers apply to the whole country.
+    """
+    country = (record.get("country") or "").strip()
+    if not country:
+        raise ValueError(f"Contact record is missing a country: {record!r}")
+    return (country,) + tuple((record.get(field) or None) for field in CONTACT_FIELDS[1:])
+
+
+def read_contacts_csv(path):
+    """
+    Streams contact rows from a CSV file with a country,police,fire,ambulance[,iso_code][,region] header.
+    :param path: Path to the CSV file.
+    :return: Generator of contact tuples.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        for record in csv.DictReader(file):
+            yield _row_from_record(record)
+
+
+def read_contacts_json(path):
+    """
+    Reads contact rows from a JSON file of the form {"contacts": [{...}, ...]}.
+    :param path: Path to the JSON file.
+    :return: List of contact tuples.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    records = data["contacts"] if isinstance(data, dict) else data
+    return [_row_from_record(record) for record in records]
+
+
+def rows_from_number_map(numbers):
+    """
+    Expands a country -> single emergency number mapping into contact tuples.
+    :param numbers: Dict such as init_contacts.country_emergency_numbers.
+    :return: List of contact tuples using the same number for every service.
+    """
+    return [(country, number, number, number) for country, number in numbers.items()]
+
+
+def import_contacts(db, path, batch_size=500):
+    """
+    Loads a CSV or JSON contacts file into the database in one transaction.
+    :param db: DatabaseManager to write into.
+    :param path: Path to a .csv or .json file.
+    :param batch_size: Rows per executemany batch.
+    :return: Number of rows written.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        rows = read_contacts_csv(path)
+    elif extension == ".json":
+        rows = read_contacts_json(path)
+    else:
+        raise ValueError(f"Unsupported contacts file type: {extension or path}")
+    return db.add_contacts_bulk(rows, batch_size=batch_size)
@@ -0,0 +1,439 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+
+from core.paths import DATA_DIR
+
+
+DEFAULT_TOPIC = "general"
+DIFFICULTIES = (1, 2, 3)  # easy, medium, hard
+DEFAULT_DIFFICULTY = 2
+
+
+class ContentError(ValueError):
+    """
+    Raised when a content asset is missing or does not match its expected shape.
+    """
+
+
+def _validate_instructions(data):
+    instructions = data.get("instructions")
+    if not isinstance(instructions, list) or not all(isinstance(item, str) for item in instructions):
+        raise ContentError("'instructions' must be a list of strings")
+    return instructions
+
+
+def _validate_questions(data):
+    questions = data.get("questions")
+    if not isinstance(questions, list):
+        raise ContentError("'questions' must be a list")
+    for number, question in enumerate(questions, start=1):
+        if not isinstance(question, dict) or not isinstance(question.get("question"), str):
+            raise ContentError(f"question {number} needs a 'question' string")
+        options = question.get("options")
+        if not isinstance(options, list) or len(options) < 2 or not all(isinstance(option, str) for option in options):
+            raise ContentError(f"question {number} needs at least two string options")
+        answer = question.get("answer")
+        if not isinstance(answer, int) or not 0 <= answer < len(options):
+            raise ContentError(f"question {number} has an answer index outside its options")
+        if not isinstance(question.get("topic", DEFAULT_TOPIC), str):
+            raise ContentError(f"question {number} has a non-string topic")
+        if question.get("difficulty", DEFAULT_DIFFICULTY) not in DIFFICULTIES:
+            raise ContentError(f"question {number} has a difficulty outside {DIFFICULTIES}")
+        if not isinstance(question.get("id", ""), str):
+            raise ContentError(f"question {number} has a non-string id")
+    ids = [question_id(question) for question in questions]
+    if len(set(ids)) != len(ids):
+        raise ContentError("question ids must be unique; give repeated questions an explicit 'id'")
+    return questions
+
+
+def question_id(question):
+    """
+    Returns the stable id of a question: its "id" field, or else a digest of its text.
+
+    Unlike a position it survives questions being added, removed or reordered,
+    so answer histories stay attached to the right question.
+    """
+    explicit = question.get("id")
+    if explicit:
+        return explicit
+    return "text:" + hashlib.sha1(question["question"].encode("utf-8")).hexdigest()[:16]
+
+
+def question_index_records(questions):
+    """
+    Groups question positions, and the matching question ids, by topic and difficulty.
+
+    Questions without a topic or difficulty fall under DEFAULT_TOPIC and DEFAULT_DIFFICULTY.
+    :return: List of {"topic", "difficulty", "positions", "ids"} records, one per non-empty group.
+    """
+    groups = {}
+    for position, question in enumerate(questions):
+        key = (question.get("topic", DEFAULT_TOPIC), question.get("difficulty", DEFAULT_DIFFICULTY))
+        positions, ids = groups.setdefault(key, ([], []))
+        positions.append(position)
+        ids.append(question_id(question))
+    return [
+        {"topic": topic, "difficulty": difficulty, "positions": positions, "ids": ids}
+        for (topic, difficulty), (positions, ids) in sorted(groups.items())
+    ]
+
+
+def _validate_resources(data):
+    resources = data.get("resources")
+    if not isinstance(resources, dict):
+        raise ContentError("'resources' must map categories to lists of links")
+    for category, links in resources.items():
+        if not isinstance(links, list) or not all(isinstance(link, str) for link in links):
+            raise ContentError(f"resource category {category!r} must be a list of links")
+    return resources
+
+
+def normalize_alert(alert, number):
+    """
+    Brings one alert, given as a string or an object, into the shape the alert pages expect.
+    :param alert: Raw alert from a content file or feed.
+    :param number: Fallback id, also used in error messages.
+    :return: Dict with "id", "text", "severity", "region", "expires" (epoch seconds or None)
+        and "area" (see _normalize_area).
+    :raises ContentError: If the alert has no text.
+    """
+    if isinstance(alert, str):
+        alert = {"text": alert}
+    if not isinstance(alert, dict) or not isinstance(alert.get("text"), str):
+        raise ContentError(f"alert {number} must be a string or an object with a 'text' string")
+    expires = alert.get("expires")
+    return {
+        "id": str(alert.get("id", number)),
+        "text": alert["text"],
+        "severity": alert.get("severity"),
+        "region": alert.get("region"),
+        "expires": float(expires) if isinstance(expires, (int, float)) else None,
+        "area": _normalize_area(alert.get("area"), number),
+    }
+
+
+def _normalize_area(area, number):
+    """
+    Validates an alert's affected area.
+
+    Accepts {"lat", "lon", "radius_km"} for a circle or {"bbox": [south, west, north, east]};
+    a bbox whose west edge is greater than its east edge crosses the antimeridian.
+    :return: The area dict, or None for alerts that apply everywhere.
+    """
+    if area is None:
+        return None
+    try:
+        if "bbox" in area:
+            south, west, north, east = (float(value) for value in area["bbox"])
+            if south > north:
+                raise ValueError("south edge is above north edge")
+            return {"bbox": [south, west, north, east]}
+        lat, lon, radius = float(area["lat"]), float(area["lon"]), float(area["radius_km"])
+        if radius < 0:
+            raise ValueError("negative radius")
+        return {"lat": lat, "lon": lon, "radius_km": radius}
+    except (TypeError, KeyError, ValueError) as e:
+        raise ContentError(f"alert {number} has an invalid area: {e}") from e
+
+
+def _validate_alerts(data):
+    alerts = data.get("alerts")
+    if not isinstance(alerts, list):
+        raise ContentError("'alerts' must be a list")
+    return [normalize_alert(alert, number) for number, alert in enumerate(alerts, start=1)]
+
+
+FACILITY_KINDS = ("hospital", "shelter", "fire_station", "police")
+
+
+def _validate_facilities(data):
+    facilities = data.get("facilities")
+    if not isinstance(facilities, list):
+        raise ContentError("'facilities' must be a list")
+    for number, facility in enumerate(facilities, start=1):
+        if not isinstance(facility, dict) or not isinstance(facility.get("name"), str):
+            raise ContentError(f"facility {number} needs a 'name' string")
+        if facility.get("kind") not in FACILITY_KINDS:
+            raise ContentError(f"facility {number} has a kind outside {', '.join(FACILITY_KINDS)}")
+        lat, lon = facility.get("lat"), facility.get("lon")
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)) or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ContentError(f"facility {number} needs a numeric 'lat' and 'lon' in range")
+        if not isinstance(facility.get("sample", False), bool):
+            raise ContentError(f"facility {number} has a non-boolean 'sample' flag")
+    return facilities
+
+
+# Asset name -> (file name under assets/data, validator returning the parsed payload)
+ASSETS = {
+    "instructions": ("disaster_info.json", _validate_instructions),
+    "questions": ("quiz_questions.json", _validate_questions),
+    "resources": ("resource_links.json", _validate_resources),
+    "alerts": ("disaster_alerts.json", _validate_alerts),
+    "facilities": ("facilities.json", _validate_facilities),
+}
+
+
+def asset_records(name, payload):
+    """
+    Flattens an asset payload into a list of individually addressable records.
+
+    Resources are a mapping, so each category becomes one {"category", "links"} record.
+    """
+    if name == "resources":
+        return [{"category": category, "links": links} for category, links in payload.items()]
+    return payload
+
+
+class RecordView:
+    """
+    Read-only sequence over one asset's records that fetches each record only when indexed.
+    """
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def __len__(self):
+        return self.store.record_count(self.name)
+
+    def __getitem__(self, index):
+        return self.store.record(self.name, index)
+
+
+class ContentStore:
+    """
+    Loads, validates and memoizes the JSON content assets shown by the GUI pages.
+
+    Each asset is parsed once and served from memory afterwards. The file's
+    modification time is re-checked at most every ``check_interval`` seconds,
+    and a changed file is re-parsed (hot reload) and reported to listeners.
+
+    record_count() and record() serve single records. When a compiled bundle
+    (see core.content_bundle) exists and is at least as new as the JSON files,
+    they read from it without parsing whole assets.
+    """
+
+    def __init__(self, asset_dir=DATA_DIR, check_interval=2.0, bundle_name="content.bundle"):
+        self.asset_dir = asset_dir
+        self.check_interval = check_interval
+        self.bundle_path = os.path.join(asset_dir, bundle_name)
+        self._entries = {}  # name -> (mtime, payload, last checked)
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._bundle = None
+        self._bundle_mtime = None
+        self._bundle_checked = -math.inf
+        self._rejected_bundle_mtime = None  # a damaged bundle is not reopened until it is rebuilt
+
+    def path_for(self, name):
+        """
+        Returns the absolute path of a named asset.
+        """
+        return os.path.join(self.asset_dir, ASSETS[name][0])
+
+    def add_listener(self, callback):
+        """
+        Registers a callable notified with the asset name whenever an asset is (re)loaded.
+        """
+        self._listeners.append(callback)
+
+    def get(self, name):
+        """
+        Returns the validated payload of an asset, reloading it if its file changed.
+        :param name: One of the keys of ASSETS.
+        :return: Parsed and validated payload.
+        :raises ContentError: If the file is missing, unreadable or invalid.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and now - entry[2] < self.check_interval:
+                return entry[1]
+
+            path = self.path_for(name)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError as e:
+                raise ContentError(f"{ASSETS[name][0]} is not available: {e}") from e
+            if entry is not None and entry[0] == mtime:
+                self._entries[name] = (mtime, entry[1], now)
+                return entry[1]
+
+            payload = self._parse(name, path)
+            self._entries[name] = (mtime, payload, now)
+
+        for callback in self._listeners:
+            callback(name)
+        return payload
+
+    def _parse(self, name, path):
+        """
+        Reads and validates one asset file.
+        """
+        file_name, validate = ASSETS[name]
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ContentError(f"{file_name} could not be read: {e}") from e
+        if not isinstance(data, dict):
+            raise ContentError(f"{file_name} must contain a JSON object")
+        try:
+            return validate(data)
+        except ContentError as e:
+            raise ContentError(f"{file_name}: {e}") from e
+
+    def preload(self):
+        """
+        Parses every available asset up front so page visits never touch the disk.
+        :return: Dict of asset name -> error message for assets that failed to load.
+        """
+        errors = {}
+        for name in ASSETS:
+            try:
+                self.get(name)
+            except ContentError as e:
+                errors[name] = str(e)
+        return errors
+
+    def _current_bundle(self):
+        """
+        Returns the compiled bundle if present and not older than any JSON source, else None.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._bundle_checked < self.check_interval:
+                return self._bundle
+            self._bundle_checked = now
+            try:
+                bundle_mtime = os.stat(self.bundle_path).st_mtime_ns
+                stale = any(
+                    os.stat(self.path_for(name)).st_mtime_ns > bundle_mtime
+                    for name in ASSETS
+                    if os.path.exists(self.path_for(name))
+                )
+            except OSError:
+                bundle_mtime, stale = None, True
+
+            if stale or bundle_mtime != self._bundle_mtime:
+                if self._bundle is not None:
+                    self._bundle.close()
+                self._bundle, self._bundle_mtime = None, None
+            if not stale and self._bundle is None and bundle_mtime != self._rejected_bundle_mtime:
+                from core.content_bundle import ContentBundle  # imported here to avoid a cycle
+
+                try:
+                    self._bundle, self._bundle_mtime = ContentBundle(self.bundle_path), bundle_mtime
+                except (OSError, ContentError) as e:
+                    print(f"Ignoring content bundle: {e}")
+                    self._rejected_bundle_mtime = bundle_mtime
+            return self._bundle
+
+    def _reject_bundle(self, bundle, error):
+        """
+        Stops reading a bundle that turned out to be damaged; the JSON assets are used until it is rebuilt.
+        """
+        print(f"Ignoring content bundle: {error}")
+        with self._lock:
+            if self._bundle is bundle:
+                self._bundle.close()
+                self._rejected_bundle_mtime = self._bundle_mtime
+                self._bundle, self._bundle_mtime = None, None
+
+    def record_count(self, name):
+        """
+        Returns how many records an asset has.
+        :raises ContentError: If the asset is neither bundled nor available as JSON.
+        """
+        bundle = self._current_bundle()
+        if bundle is not None and name in bundle:
+            return bundle.count(name)
+        return len(asset_records(name, self.get(name)))
+
+    def record(self, name, index):
+        """
+        Returns a single record of an asset, reading only that record from the bundle when possible.
+        :raises ContentError: If the asset is neither bundled nor available as JSON.
+        """
+        bundle = self._current_bundle()
+        if bundle is not None and name in bundle:
+            try:
+                return bundle.record(name, index)
+            except ContentError as e:
+                self._reject_bundle(bundle, e)
+        return asset_records(name, self.get(name))[index]
+
+    def records(self, name):
+        """
+        Returns a lazy sequence over an asset's records.
+        :raises ContentError: If the asset is neither bundled nor available as JSON.
+        """
+        self.record_count(name)  # fail now rather than on first use
+        return RecordView(self, name)
+
+    def instructions(self):
+        """
+        Disaster instructions for the slideshow, as a list of strings.
+        """
+        return self.get("instructions")
+
+    def questions(self):
+        """
+        Quiz questions as dicts with "question", "options" and an "answer" index.
+        """
+        return self.get("questions")
+
+    def question_index(self):
+        """
+        Question positions and ids grouped by topic and difficulty, as built by question_index_records().
+
+        Read from the bundle when it is current, so large banks are indexed without parsing every question.
+        :raises ContentError: If the questions are neither bundled nor available as JSON.
+        """
+        bundle = self._current_bundle()
+        if bundle is not None and "question_index" in bundle:
+            try:
+                return list(bundle.records("question_index"))
+            except ContentError as e:
+                self._reject_bundle(bundle, e)
+        return question_index_records(self.get("questions"))
+
+    def resources(self):
+        """
+        Resource links grouped by category, as a dict of category -> list of URLs.
+        """
+        return self.get("resources")
+
+    def alerts(self):
+        """
+        Disaster alerts as dicts shaped by normalize_alert().
+        """
+        return self.get("alerts")
+
+    def facilities(self):
+        """
+        Emergency facilities as dicts with "name", "kind" (one of FACILITY_KINDS), "lat" and "lon".
+
+        Made-up entries for demos carry ``"sample": true`` and must not be presented as real services.
+        """
+        return self.get("facilities")
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def default_store():
+    """
+    Returns the process-wide content store shared by the GUI pages.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ContentStore()
+        return _default_store
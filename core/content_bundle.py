@@ -0,0 +1,161 @@
+import json
+import mmap
+import os
+import struct
+import sys
+
+from core.content import ASSETS, ContentError, ContentStore, asset_records, question_index_records
+from core.paths import DATA_DIR
+
+BUNDLE_MAGIC = b"SGBUNDL1"
+BUNDLE_VERSION = 3  # bump whenever asset_records() changes the shape of stored records
+DEFAULT_BUNDLE_PATH = os.path.join(DATA_DIR, "content.bundle")
+
+_HEADER = struct.Struct("<8sII")  # magic, version, asset count
+_ASSET = struct.Struct("<HIQ")  # name length, record count, offset table position
+_OFFSET = struct.Struct("<Q")
+
+
+def build_bundle(out_path=DEFAULT_BUNDLE_PATH, store=None):
+    """
+    Compiles every available content asset into one binary bundle.
+
+    Alongside the questions it stores a "question_index" asset (see
+    question_index_records) so quizzes can sample by topic and difficulty
+    without decoding the whole bank.
+
+    Layout: header, then per asset its name, record count and the position of an
+    offset table; each offset table holds count + 1 positions into the data
+    region, where every record is stored as UTF-8 JSON.
+    :param out_path: Destination path.
+    :param store: ContentStore to read and validate assets with.
+    :return: Dict of asset name -> record count.
+    """
+    store = store or ContentStore()
+    assets = {}
+    for name in ASSETS:
+        try:
+            assets[name] = [json.dumps(record, separators=(",", ":")).encode("utf-8")
+                            for record in asset_records(name, store.get(name))]
+        except ContentError as e:
+            print(f"Skipping {name}: {e}")
+    if "questions" in assets:
+        assets["question_index"] = [json.dumps(record, separators=(",", ":")).encode("utf-8")
+                                    for record in question_index_records(store.get("questions"))]
+
+    encoded_names = {name: name.encode("utf-8") for name in assets}
+    table_size = sum(_ASSET.size + len(encoded_names[name]) for name in assets)
+    position = _HEADER.size + table_size
+    offset_tables = {}
+    for name, records in assets.items():
+        offset_tables[name] = position
+        position += _OFFSET.size * (len(records) + 1)
+
+    data_start = position
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(assets)))
+        for name, records in assets.items():
+            file.write(_ASSET.pack(len(encoded_names[name]), len(records), offset_tables[name]))
+            file.write(encoded_names[name])
+        cursor = data_start
+        for records in assets.values():
+            for record in records:
+                file.write(_OFFSET.pack(cursor))
+                cursor += len(record)
+            file.write(_OFFSET.pack(cursor))
+        for records in assets.values():
+            file.writelines(records)
+    os.replace(tmp_path, out_path)
+    return {name: len(records) for name, records in assets.items()}
+
+
+class ContentBundle:
+    """
+    Memory-maps a compiled content bundle and decodes individual records on demand.
+
+    Opening a bundle only reads its small asset table; a record's bytes are
+    sliced straight out of the mapping and parsed when that record is requested.
+    """
+
+    def __init__(self, path=DEFAULT_BUNDLE_PATH):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ContentError(f"{path} is empty")
+        self._assets = {}
+        self._read_table()
+
+    def _read_table(self):
+        try:
+            magic, version, count = _HEADER.unpack_from(self._map, 0)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                raise ContentError(f"{self.path} is not a version {BUNDLE_VERSION} content bundle")
+            position = _HEADER.size
+            for _ in range(count):
+                name_length, records, offsets = _ASSET.unpack_from(self._map, position)
+                position += _ASSET.size
+                name = bytes(self._map[position:position + name_length]).decode("utf-8")
+                position += name_length
+                (end,) = _OFFSET.unpack_from(self._map, offsets + records * _OFFSET.size)
+                if end > len(self._map):
+                    raise ContentError(f"{self.path} is truncated")
+                self._assets[name] = (records, offsets)
+        except (struct.error, UnicodeDecodeError) as e:
+            self.close()
+            raise ContentError(f"{self.path} is corrupt: {e}") from e
+        except ContentError:
+            self.close()
+            raise
+
+    def __contains__(self, name):
+        return name in self._assets
+
+    def count(self, name):
+        """
+        Returns the number of records stored for an asset (0 if the asset is absent).
+        """
+        return self._assets.get(name, (0, 0))[0]
+
+    def record(self, name, index):
+        """
+        Decodes one record of an asset.
+        :param name: Asset name.
+        :param index: Record position, supporting negative indexes.
+        :return: The record's JSON value.
+        :raises ContentError: If the record cannot be decoded.
+        """
+        records, offsets = self._assets[name]
+        if index < 0:
+            index += records
+        if not 0 <= index < records:
+            raise IndexError(f"{name} record {index} out of range")
+        try:
+            start, end = struct.unpack_from("<QQ", self._map, offsets + index * _OFFSET.size)
+            return json.loads(self._map[start:end])
+        except (struct.error, ValueError) as e:
+            raise ContentError(f"{self.path}: {name} record {index} is corrupt: {e}") from e
+
+    def records(self, name, start=0, stop=None):
+        """
+        Yields the records of an asset between two positions.
+        """
+        stop = self.count(name) if stop is None else min(stop, self.count(name))
+        for index in range(start, stop):
+            yield self.record(name, index)
+
+    def close(self):
+        """
+        Releases the memory map and file handle.
+        """
+        self._map.close()
+        self._file.close()
+
+
+if __name__ == "__main__":
+    # Build step, run from the project root: python -m core.content_bundle [out_path]
+    counts = build_bundle(*sys.argv[1:2])
+    print(", ".join(f"{name}: {count}" for name, count in counts.items()))
@@ -1,88 +1,206 @@
 import os
-import sqlite3
 
-class DatabaseManager:
+from core.countries import iso_code_for, normalize_country_name
+from core.paths import DATA_DIR
+from core.sqlite_store import SQLiteStore
+
+CONTACT_COLUMNS = "id, country, police, fire, ambulance, region"
+
+UPSERT_CONTACT_SQL = """
+INSERT INTO contacts (country, police, fire, ambulance, iso_code, country_key, region)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(country_key, region) DO UPDATE SET
+    country = excluded.country,
+    police = excluded.police,
+    fire = excluded.fire,
+    ambulance = excluded.ambulance,
+    iso_code = COALESCE(excluded.iso_code, contacts.iso_code)
+"""
+
+
+def _migrate_create_contacts(connection):
+    """
+    Schema version 1: the original contacts table, indexed by country name.
+
+    The index is not unique: databases created before migrations existed may
+    hold the same country more than once, and version 3 removes duplicates.
+    """
+    connection.execute("""
+    CREATE TABLE IF NOT EXISTS contacts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        country TEXT NOT NULL,
+        police TEXT,
+        fire TEXT,
+        ambulance TEXT
+    )
+    """)
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_country ON contacts (country)"
+    )
+
+
+def _migrate_add_lookup_keys(connection):
+    """
+    Schema version 2: ISO 3166-1 codes and a case-folded name key, both indexed for lookups.
+    """
+    connection.execute("ALTER TABLE contacts ADD COLUMN iso_code TEXT")
+    connection.execute("ALTER TABLE contacts ADD COLUMN country_key TEXT")
+    rows = connection.execute("SELECT id, country FROM contacts").fetchall()
+    connection.executemany(
+        "UPDATE contacts SET iso_code = ?, country_key = ? WHERE id = ?",
+        [(iso_code_for(country), normalize_country_name(country), row_id) for row_id, country in rows],
+    )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_country_key ON contacts (country_key)"
+    )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_contacts_iso_code ON contacts (iso_code)"
+    )
+
+
+def _migrate_add_regions(connection):
+    """
+    Schema version 3: any number of rows per country, one per region ('' for the country-wide numbers).
+
+    Uniqueness moves from the country name to (country_key, region); of rows
+    whose names fold to the same key, the most recently added one is kept.
+    """
+    connection.execute("ALTER TABLE contacts ADD COLUMN region TEXT NOT NULL DEFAULT ''")
+    connection.execute(
+        "DELETE FROM contacts WHERE id NOT IN (SELECT MAX(id) FROM contacts GROUP BY country_key, region)"
+    )
+    connection.execute("DROP INDEX IF EXISTS idx_contacts_country")
+    connection.execute("DROP INDEX IF EXISTS idx_contacts_country_key")
+    connection.execute("DROP INDEX IF EXISTS idx_contacts_iso_code")  # unique in databases migrated before
+    connection.execute("CREATE INDEX idx_contacts_iso_code ON contacts (iso_code)")
+    connection.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_contacts_country_region ON contacts (country_key, region)"
+    )
+
+
+# Applied in order; a database at PRAGMA user_version N has run the first N entries.
+MIGRATIONS = [
+    _migrate_create_contacts,
+    _migrate_add_lookup_keys,
+    _migrate_add_regions,
+]
+
+
+def _contact_params(contact):
+    """
+    Expands a (country, police, fire, ambulance[, iso_code[, region]]) row into UPSERT_CONTACT_SQL parameters.
+    """
+    country, police, fire, ambulance, *rest = contact
+    iso_code = rest[0].upper() if rest and rest[0] else iso_code_for(country)
+    region = rest[1].strip() if len(rest) > 1 and rest[1] else ""
+    return country, police, fire, ambulance, iso_code, normalize_country_name(country), region
+
+
+class DatabaseManager(SQLiteStore):
     """
     Manages interactions with the SQLite database for emergency contacts.
+
+    Connections, pooling, read-only mode and migrations come from SQLiteStore;
+    the contact service's worker threads, for instance, share one read-only
+    pooled manager. Listeners registered with add_change_listener() hear about
+    every write.
     """
-    def __init__(self, db_path="assets/data/contacts.db"):
-        self.db_path = db_path
-        self.connection = None
-        self.ensure_directory_exists()
-        self.initialize_database()
+    migrations = MIGRATIONS
 
-    def ensure_directory_exists(self):
-        """
-        Ensures that the directory for the database file exists.
-        """
-        directory = os.path.dirname(self.db_path)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+    def __init__(self, db_path=os.path.join(DATA_DIR, "contacts.db"), pooled=False, cached_statements=128, read_only=False):
+        self._change_listeners = []
+        super().__init__(db_path, pooled=pooled, cached_statements=cached_statements, read_only=read_only)
 
-    def connect(self):
-        """
-        Establishes a connection to the database.
+    def add_change_listener(self, callback):
         """
-        if not self.connection:
-            self.connection = sqlite3.connect(self.db_path)
+        Registers a callable notified after contacts are written.
 
-    def close(self):
-        """
-        Closes the connection to the database.
+        :param callback: Called with the list of country names that changed.
         """
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        self._change_listeners.append(callback)
 
-    def initialize_database(self):
+    def _notify_change(self, countries):
         """
-        Creates the contacts table if it does not exist.
+        Tells every registered listener which countries were written.
         """
-        self.connect()
-        cursor = self.connection.cursor()
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS contacts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            country TEXT NOT NULL,
-            police TEXT,
-            fire TEXT,
-            ambulance TEXT
-        )
-        """)
-        self.connection.commit()
-        self.close()
+        for callback in self._change_listeners:
+            callback(countries)
 
     def fetch_contacts(self, country=None):
         """
         Fetches emergency contacts, filtered by country if specified.
 
+        The country filter ignores case, accents and extra whitespace, and is
+        served by the (country_key, region) index. A country's country-wide
+        row (region '') comes before its regional ones.
+
         :param country: Country name to filter contacts.
-        :return: List of tuples containing contact details.
+        :return: List of (id, country, police, fire, ambulance, region) tuples.
+        """
+        with self.session() as connection:
+            if country:
+                cursor = connection.execute(
+                    f"SELECT {CONTACT_COLUMNS} FROM contacts WHERE country_key = ? ORDER BY region, id",
+                    (normalize_country_name(country),),
+                )
+            else:
+                cursor = connection.execute(f"SELECT {CONTACT_COLUMNS} FROM contacts")
+            return cursor.fetchall()
+
+    def fetch_contacts_by_code(self, iso_code):
         """
-        self.connect()
-        cursor = self.connection.cursor()
-        if country:
-            cursor.execute("SELECT * FROM contacts WHERE country = ?", (country,))
-        else:
-            cursor.execute("SELECT * FROM contacts")
-        results = cursor.fetchall()
-        self.close()
-        return results
-
-    def add_contact(self, country, police, fire, ambulance):
+        Fetches the emergency contacts for an ISO 3166-1 alpha-2 country code.
+
+        :param iso_code: Two-letter country code, in any case.
+        :return: List of (id, country, police, fire, ambulance, region) tuples, country-wide rows first.
         """
-        Adds a new contact record to the database.
+        with self.session() as connection:
+            cursor = connection.execute(
+                f"SELECT {CONTACT_COLUMNS} FROM contacts WHERE iso_code = ? ORDER BY region, id",
+                (iso_code.upper(),),
+            )
+            return cursor.fetchall()
+
+    def add_contact(self, country, police, fire, ambulance, region=""):
+        """
+        Adds a new contact record to the database, replacing the numbers of an existing country and region.
 
         :param country: Name of the country.
         :param police: Police contact number.
         :param fire: Fire contact number.
         :param ambulance: Ambulance contact number.
+        :param region: Region the numbers apply to, or "" for the whole country.
+        """
+        with self.session() as connection:
+            connection.execute(UPSERT_CONTACT_SQL, _contact_params((country, police, fire, ambulance, None, region)))
+        self._notify_change([country])
+
+    def add_contacts_bulk(self, contacts, batch_size=500):
         """
-        self.connect()
-        cursor = self.connection.cursor()
-        cursor.execute("""
-        INSERT INTO contacts (country, police, fire, ambulance)
-        VALUES (?, ?, ?, ?)
-        """, (country, police, fire, ambulance))
-        self.connection.commit()
-        self.close()
\ No newline at end of file
+        Inserts or updates many contact records in a single transaction.
+
+        Rows are written with executemany in chunks of ``batch_size``; a row whose
+        country and region already exist replaces their numbers.
+
+        :param contacts: Iterable of (country, police, fire, ambulance[, iso_code[, region]]) tuples.
+        :param batch_size: Number of rows handed to each executemany call.
+        :return: Number of rows written.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        countries = []
+        with self.session() as connection:
+            batch = []
+            for contact in contacts:
+                params = _contact_params(contact)
+                batch.append(params)
+                countries.append(params[0])
+                if len(batch) >= batch_size:
+                    connection.executemany(UPSERT_CONTACT_SQL, batch)
+                    batch = []
+            if batch:
+                connection.executemany(UPSERT_CONTACT_SQL, batch)
+        if countries:
+            self._notify_change(countries)
+        return len(countries)
@@ -0,0 +1,100 @@
+import heapq
+import math
+
+from core.alert_index import EARTH_RADIUS_KM
+
+
+def _unit_vector(lat, lon):
+    phi, lam = math.radians(lat), math.radians(lon)
+    cos_phi = math.cos(phi)
+    return cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi)
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def _km_to_chord(km):
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+
+class FacilityIndex:
+    """
+    Static KD-tree answering "which k facilities are nearest to this coordinate".
+
+    Facilities are stored as points on the unit sphere, so straight-line
+    (chord) distance orders them exactly like great-circle distance and the
+    tree needs no special handling for the poles or the antimeridian. The tree
+    is implicit: the points are arranged so that every slice [lo, hi) has its
+    splitting point at the middle, and each split's axis is kept in a parallel
+    list.
+    """
+
+    def __init__(self, facilities):
+        self.facilities = list(facilities)
+        self._points = [_unit_vector(f["lat"], f["lon"]) for f in self.facilities]
+        self._order = list(range(len(self.facilities)))
+        self._axes = [0] * len(self.facilities)
+        self._build(0, len(self._order))
+
+    def __len__(self):
+        return len(self.facilities)
+
+    def _build(self, lo, hi):
+        """
+        Arranges _order[lo:hi] around its median along the axis of widest spread.
+        """
+        if hi - lo <= 1:
+            return
+        points, order = self._points, self._order
+        spreads = []
+        for axis in range(3):
+            values = [points[i][axis] for i in order[lo:hi]]
+            spreads.append(max(values) - min(values))
+        axis = spreads.index(max(spreads))
+        order[lo:hi] = sorted(order[lo:hi], key=lambda i: points[i][axis])
+        mid = (lo + hi) // 2
+        self._axes[mid] = axis
+        self._build(lo, mid)
+        self._build(mid + 1, hi)
+
+    def nearest(self, lat, lon, k=10, kinds=None, max_km=None):
+        """
+        Finds the facilities closest to a coordinate.
+        :param k: Maximum number of facilities to return.
+        :param kinds: Optional collection of facility kinds to restrict the search to.
+        :param max_km: Optional search radius in kilometres.
+        :return: List of (distance_km, facility) tuples, nearest first.
+        """
+        if k < 1 or not self.facilities:
+            return []
+        target = _unit_vector(lat, lon)
+        limit = _km_to_chord(max_km) ** 2 if max_km is not None else math.inf
+        best = []  # max-heap of (-squared chord, index) holding the k best so far
+        points, order, axes, facilities = self._points, self._order, self._axes, self.facilities
+
+        def search(lo, hi):
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            index = order[mid]
+            point = points[index]
+            dx, dy, dz = point[0] - target[0], point[1] - target[1], point[2] - target[2]
+            distance = dx * dx + dy * dy + dz * dz
+            bound = -best[0][0] if len(best) == k else limit
+            if distance <= bound and (kinds is None or facilities[index]["kind"] in kinds):
+                if len(best) == k:
+                    heapq.heapreplace(best, (-distance, index))
+                else:
+                    heapq.heappush(best, (-distance, index))
+
+            axis = axes[mid]
+            offset = target[axis] - point[axis]
+            near, far = ((lo, mid), (mid + 1, hi)) if offset < 0 else ((mid + 1, hi), (lo, mid))
+            search(*near)
+            bound = -best[0][0] if len(best) == k else limit
+            if offset * offset <= bound:
+                search(*far)
+
+        search(0, len(order))
+        return [(_chord_to_km(math.sqrt(-neg)), facilities[index]) for neg, index in sorted(best, reverse=True)]
@@ -1,34 +1,141 @@
 import random
-import geocoder
+from concurrent.futures import ThreadPoolExecutor
+from core.location_cache import LocationCache
+
+# A single worker is enough: lookups are rare and must not pile up behind a slow network.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gps")
 
 
 class GPSTracker:
     """
     Handles GPS tracking functionality.
+
+    The IP geolocation request is deferred until a location is first needed, and
+    can run on a background thread through locate_async(). While the fix stored
+    in the location cache is younger than ``max_age`` seconds it is used instead
+    of the network.
+
+    While recording, each fix that moves from the last recorded position is
+    appended to the track, tagged with where it came from.
     """
 
-    def __init__(self):
-        self.g = geocoder.ip('me')
+    def __init__(self, cache=None, max_age=None):
+        self.g = None
         self.last_coordinates = None
+        self.cache = cache if cache is not None else LocationCache()
+        if max_age is not None:
+            self.cache.max_age = max_age
+        self.cached_fix = None
+        self.track = None
+        self._recorded_position = None
+
+    def locate(self):
+        """
+        Performs the (blocking) IP geolocation lookup and caches the resulting fix.
+        :return: The geocoder result.
+        """
+        import geocoder  # deferred: pulls in requests and its dependencies, which cold start does not need
+
+        self.g = geocoder.ip('me')
+        if self.g.latlng:
+            self.last_coordinates = self.g.latlng
+            try:
+                self.cached_fix = self.cache.store(self.g.latlng, self.country, source="ip")
+            except OSError as e:
+                print(f"Error caching location: {e}")
+        return self.g
+
+    def locate_async(self):
+        """
+        Starts the geolocation lookup on a background thread.
+        :return: Future resolving to (coordinates, country); coordinates is None on failure.
+        """
+        def resolve():
+            coordinates = self.get_coordinates()
+            return coordinates, (self.country if coordinates else None)
+
+        return _executor.submit(resolve)
+
+    def start_recording(self, recorder):
+        """
+        Starts appending every new fix to a track recorder.
+        :param recorder: core.track.TrackRecorder to append to.
+        """
+        self.track = recorder
+        self._recorded_position = None
+
+    def _record(self, coordinates, source, timestamp=None):
+        """
+        Appends a fix to the track being recorded, unless it repeats the last recorded position.
+        """
+        if self.track is None:
+            return
+        position = (coordinates[0], coordinates[1])
+        if position == self._recorded_position:
+            return
+        self._recorded_position = position
+        self.track.append(position, timestamp, source=source)
+
+    def stop_recording(self):
+        """
+        Stops recording and flushes the track to its log.
+        :return: The recorder that was in use, or None.
+        """
+        recorder, self.track = self.track, None
+        if recorder is not None:
+            recorder.close()
+        return recorder
+
+    @property
+    def country(self):
+        """
+        Country of the current fix, or None.
+
+        Prefers what the provider or cached fix reported and otherwise resolves
+        the last coordinates offline with the bundled reverse geocoder.
+        """
+        if self.g is not None and getattr(self.g, "country", None):
+            return self.g.country
+        if self.cached_fix is not None and self.cached_fix.get("country"):
+            return self.cached_fix["country"]
+        if self.last_coordinates:
+            from core.reverse_geocoder import default_geocoder  # deferred: only needed without a reported country
+
+            try:
+                return default_geocoder().lookup(*self.last_coordinates[:2])
+            except (OSError, ValueError) as e:
+                print(f"Error resolving country offline: {e}")
+        return None
 
     def get_coordinates(self):
         """
-        Fetches the current GPS coordinates using geopy.
+        Fetches the current GPS coordinates, reading through the location cache.
         :return: Tuple of (latitude, longitude)
         """
+        if self.g is None:
+            fix = self.cache.load_fresh()
+            if fix is not None:
+                self.cached_fix = fix
+                self.last_coordinates = (fix["latitude"], fix["longitude"])
+                self._record(self.last_coordinates, "cache", fix["timestamp"])
+                return self.last_coordinates
+
         try:
+            if self.g is None:
+                self.locate()
             location = self.g.latlng
 
             if location:
                 self.last_coordinates = location
+                self._record(location, "ip")
                 return location
         except Exception as e:
             print(f"Error fetching location: {e}")
 
     def save_coordinates(self, coordinates):
         """
-        Saves the given coordinates to a file.
+        Saves the given coordinates to the location cache.
         :param coordinates: Tuple of (latitude, longitude)
         """
-        with open("assets/data/coordinates.txt", "w") as f:
-            f.write(f"{coordinates[0]},{coordinates[1]}")
+        self.cached_fix = self.cache.store(coordinates, self.country, source="manual")
+        self._record(coordinates, "manual", self.cached_fix["timestamp"])
@@ -0,0 +1,301 @@
+import asyncio
+import json
+import os
+import ssl
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from urllib.parse import urljoin, urlsplit
+
+from core.paths import DATA_DIR
+
+USER_AGENT = "SafeGuard link checker"
+MAX_REDIRECTS = 5
+# Servers often refuse automated clients these statuses without the link being dead.
+RESTRICTED_STATUSES = {401, 403, 429}
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="link-checker")
+
+
+def link_state(result):
+    """
+    Classifies a check result.
+    :return: "ok", "broken" (the server says the page is gone) or "unreachable" (no answer, e.g. offline).
+    """
+    status = result.get("status")
+    if status is None:
+        return "unreachable"
+    if status < 400 or status in RESTRICTED_STATUSES:
+        return "ok"
+    return "broken"
+
+
+class LinkCache:
+    """
+    Persists link check results as JSON, keyed by URL.
+
+    Each result keeps the response's ETag and Last-Modified validators so a
+    stale entry can be revalidated with a conditional request. Writes replace
+    the file atomically, as LocationCache does.
+    """
+
+    def __init__(self, path=os.path.join(DATA_DIR, "link_cache.json"), ttl=24 * 60 * 60):
+        self.path = path
+        self.ttl = ttl
+        self._results = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._results is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    results = json.load(file)
+                self._results = results if isinstance(results, dict) else {}
+            except (OSError, ValueError):
+                self._results = {}
+        return self._results
+
+    def get(self, url):
+        """
+        Returns the cached result for a URL regardless of its age, or None.
+        """
+        with self._lock:
+            return self._load().get(url)
+
+    def is_fresh(self, result, now=None):
+        """
+        Tells whether a cached result is younger than the TTL.
+        """
+        now = time.time() if now is None else now
+        return result is not None and now - result["checked_at"] < self.ttl
+
+    def store(self, results):
+        """
+        Merges new results into the cache and writes it to disk.
+        :param results: Iterable of result dicts as produced by LinkChecker.
+        """
+        with self._lock:
+            cache = self._load()
+            for result in results:
+                cache[result["url"]] = result
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".links-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    json.dump(cache, file)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+
+class ConnectionPool:
+    """
+    Bounded pool of keep-alive HTTP connections for one event loop.
+
+    At most ``limit`` connections are in use at once and at most ``per_host``
+    to any single host; idle connections are kept per host and reused.
+    """
+
+    def __init__(self, limit=20, per_host=4, ssl_context=None):
+        self.limit = limit
+        self.per_host = per_host
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.opened = 0
+        self._total = asyncio.Semaphore(limit)
+        self._hosts = defaultdict(lambda: asyncio.Semaphore(per_host))
+        self._idle = defaultdict(list)
+
+    @asynccontextmanager
+    async def connection(self, scheme, host, port):
+        """
+        Yields a [reader, writer, reusable] list; set reusable to False to close the connection afterwards.
+        """
+        key = (scheme, host, port)
+        # Take the host slot first so a busy host cannot hold global slots while it waits
+        async with self._hosts[key], self._total:
+            connection = None
+            while self._idle[key] and connection is None:
+                reader, writer = self._idle[key].pop()
+                if not writer.is_closing() and not reader.at_eof():
+                    connection = [reader, writer, True]
+            if connection is None:
+                reader, writer = await asyncio.open_connection(
+                    host, port, ssl=self.ssl_context if scheme == "https" else None
+                )
+                self.opened += 1
+                connection = [reader, writer, True]
+            try:
+                yield connection
+            except BaseException:
+                connection[2] = False
+                raise
+            finally:
+                if connection[2]:
+                    self._idle[key].append((connection[0], connection[1]))
+                else:
+                    connection[1].close()
+
+    def close(self):
+        """
+        Closes every idle connection.
+        """
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+async def _read_headers(reader):
+    status_line = await reader.readline()
+    parts = status_line.decode("latin-1").split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise ConnectionError(f"malformed status line {status_line[:40]!r}")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return int(parts[1]), headers
+
+
+async def _request(pool, method, url, headers):
+    """
+    Sends one request and reads the final response's headers, skipping interim 1xx responses.
+
+    Only HEAD and GET are sent. After a GET the connection is dropped instead
+    of downloading the page; after HEAD, or a response that never has a body,
+    it is kept for reuse.
+    :return: (status, headers).
+    """
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}", f"User-Agent: {USER_AGENT}", "Accept: */*"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    async with pool.connection(parts.scheme, parts.hostname, port) as connection:
+        reader, writer, _ = connection
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+        status, response_headers = await _read_headers(reader)
+        while 100 <= status < 200 and status != 101:  # interim responses such as 100 Continue or 103 Early Hints
+            status, response_headers = await _read_headers(reader)
+        reusable = method == "HEAD" or status in (204, 304)
+        connection[2] = reusable and response_headers.get("connection", "").lower() != "close"
+    return status, response_headers
+
+
+async def check_link(pool, url, cached=None, timeout=10.0):
+    """
+    Checks whether a URL answers, following redirects.
+
+    Uses HEAD, falling back to GET for servers that reject it, and sends the
+    cached ETag / Last-Modified so an unchanged page answers 304.
+    :param cached: Previous result for the URL, or None.
+    :return: Result dict with "url", "status" (None if unreachable), "final_url",
+        "etag", "last_modified", "error" and "checked_at".
+    """
+    validators = {}
+    if cached:
+        if cached.get("etag"):
+            validators["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            validators["If-Modified-Since"] = cached["last_modified"]
+
+    async def follow():
+        target, method, headers = url, "HEAD", validators
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers = await _request(pool, method, target, headers)
+            if method == "HEAD" and status in (405, 501):
+                method = "GET"
+                continue
+            if status in (301, 302, 303, 307, 308) and "location" in response_headers:
+                target, headers = urljoin(target, response_headers["location"]), {}
+                continue
+            return status, response_headers, target
+        raise ConnectionError("too many redirects")
+
+    result = {"url": url, "status": None, "final_url": url, "etag": None, "last_modified": None, "error": None}
+    try:
+        status, headers, final_url = await asyncio.wait_for(follow(), timeout)
+    except (OSError, asyncio.TimeoutError, ValueError, asyncio.IncompleteReadError) as e:
+        result["error"] = str(e) or type(e).__name__
+    else:
+        if status == 304 and cached:
+            result.update(status=cached["status"], final_url=cached["final_url"],
+                          etag=cached.get("etag"), last_modified=cached.get("last_modified"))
+        else:
+            result.update(status=status, final_url=final_url,
+                          etag=headers.get("etag"), last_modified=headers.get("last-modified"))
+    result["checked_at"] = time.time()
+    return result
+
+
+class LinkChecker:
+    """
+    Validates resource links concurrently on a background event loop.
+
+    Results younger than the cache TTL are reused as they are; older ones are
+    revalidated with conditional requests. Links that could not be reached at
+    all (for example while offline) are not cached, so they are retried next time.
+    """
+
+    def __init__(self, cache=None, max_connections=20, per_host=4, timeout=10.0, ssl_context=None):
+        self.cache = cache or LinkCache()
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+
+    def cached_results(self, urls):
+        """
+        Returns whatever results the cache holds for the URLs, fresh or not, without any network access.
+
+        The first call reads the cache file; use cached_results_async() from the Tk thread.
+        """
+        return {url: result for url in urls if (result := self.cache.get(url)) is not None}
+
+    def cached_results_async(self, urls):
+        """
+        Runs cached_results() on the checker's worker thread, ahead of any check queued after it.
+        :return: concurrent.futures.Future resolving to the dict returned by cached_results().
+        """
+        return _executor.submit(self.cached_results, list(urls))
+
+    async def check_all(self, urls):
+        """
+        Checks every URL that lacks a fresh cached result.
+        :return: Dict of URL -> result for all the URLs.
+        """
+        results, pending = {}, []
+        now = time.time()
+        for url in dict.fromkeys(urls):
+            cached = self.cache.get(url)
+            if self.cache.is_fresh(cached, now):
+                results[url] = cached
+            else:
+                pending.append((url, cached))
+        if pending:
+            pool = ConnectionPool(self.max_connections, self.per_host, self.ssl_context)
+            try:
+                checked = await asyncio.gather(*(check_link(pool, url, cached, self.timeout) for url, cached in pending))
+            finally:
+                pool.close()
+            self.cache.store(result for result in checked if result["status"] is not None)
+            results.update((result["url"], result) for result in checked)
+        return results
+
+    def check_in_background(self, urls):
+        """
+        Runs check_all() on the checker's worker thread so callers, such as the Tk loop, never wait on it.
+        :return: concurrent.futures.Future resolving to the dict returned by check_all().
+        """
+        return _executor.submit(asyncio.run, self.check_all(list(urls)))
@@ -0,0 +1,82 @@
+import json
+import math
+import os
+import tempfile
+import time
+
+from core.paths import DATA_DIR
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+class LocationCache:
+    """
+    Persists the last known location fix as JSON so later launches can reuse it.
+
+    A fix holds latitude, longitude, country, timestamp (epoch seconds) and the
+    source that produced it. Writes go to a temporary file that is then renamed
+    over the cache, so a crash never leaves a half-written file behind.
+    """
+
+    def __init__(self, path=os.path.join(DATA_DIR, "location_cache.json"), max_age=6 * 60 * 60):
+        self.path = path
+        self.max_age = max_age
+
+    def load(self):
+        """
+        Reads the cached fix regardless of its age.
+        :return: Dict describing the fix, or None if the cache is missing, unreadable or malformed.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                fix = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(fix, dict) or not all(_is_number(fix.get(key)) for key in ("latitude", "longitude", "timestamp")):
+            return None
+        return fix
+
+    def load_fresh(self, now=None):
+        """
+        Reads the cached fix only if it is younger than max_age.
+        :return: Dict describing the fix, or None if missing, malformed or stale.
+        """
+        fix = self.load()
+        if fix is None:
+            return None
+        now = time.time() if now is None else now
+        if now - fix["timestamp"] > self.max_age:
+            return None
+        return fix
+
+    def store(self, coordinates, country=None, source="ip", timestamp=None):
+        """
+        Atomically replaces the cached fix.
+        :param coordinates: Tuple of (latitude, longitude).
+        :param country: Country name for the fix, if known.
+        :param source: Where the fix came from, e.g. "ip" or "manual".
+        :param timestamp: Epoch seconds of the fix; defaults to now.
+        :return: The stored fix.
+        """
+        fix = {
+            "latitude": coordinates[0],
+            "longitude": coordinates[1],
+            "country": country,
+            "timestamp": time.time() if timestamp is None else timestamp,
+            "source": source,
+        }
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".location-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(fix, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return fix
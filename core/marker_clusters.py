@@ -0,0 +1,157 @@
+import math
+
+TILE_SIZE = 256
+
+
+def project(lat, lon):
+    """
+    Web Mercator projection to world coordinates in [0, 1), matching slippy-map tiles.
+    :return: (x, y) with y growing southwards.
+    """
+    lat = max(-85.0511, min(85.0511, lat))
+    x = (lon + 180.0) / 360.0
+    y = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0
+    return x, y
+
+
+def unproject(x, y):
+    """
+    Inverse of project().
+    :return: (lat, lon) in degrees.
+    """
+    lon = x * 360.0 - 180.0
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1.0 - 2.0 * y))))
+    return lat, lon
+
+
+class MarkerClusterer:
+    """
+    Zoom-aware grid clustering of map points, precomputed for every zoom level.
+
+    At each zoom the world is cut into square cells ``cell_px`` screen pixels
+    wide, and the points sharing a cell form one cluster drawn at their
+    centroid. Cell sizes are powers of two, so each cell at zoom z is exactly
+    four cells at zoom z + 1: levels are built bottom-up by merging children,
+    which keeps the hierarchy consistent while zooming and makes building
+    linear in points x levels.
+
+    A cluster's key is (lowest member index, member count). Two clusters with
+    the same key always have the same members, so a view can diff the keys of
+    two frames and redraw only the clusters whose membership changed.
+    """
+
+    def __init__(self, points, min_zoom=0, max_zoom=16, cell_px=64):
+        """
+        :param points: Sequence of (lat, lon) pairs; results refer to points by their position here.
+        :param min_zoom: Lowest zoom with precomputed clusters.
+        :param max_zoom: Highest zoom that clusters; above it every point is shown on its own.
+        :param cell_px: Cell width in screen pixels, a power of two no larger than TILE_SIZE.
+        """
+        if cell_px & (cell_px - 1) or not 0 < cell_px <= TILE_SIZE:
+            raise ValueError("cell_px must be a power of two no larger than the tile size")
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.shift = int(math.log2(TILE_SIZE // cell_px))  # cells per tile edge = 2 ** shift
+        self.positions = [project(lat, lon) for lat, lon in points]
+        self._levels = {}  # zoom -> {cell: [x_sum, y_sum, count, lowest index]}
+        self._members = {}  # cell at max_zoom -> point indexes
+        self._build()
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _cells_per_world(self, zoom):
+        return 1 << (zoom + self.shift)
+
+    def _build(self):
+        scale = self._cells_per_world(self.max_zoom)
+        level = {}
+        for index, (x, y) in enumerate(self.positions):
+            cell = (min(int(x * scale), scale - 1), min(int(y * scale), scale - 1))
+            cluster = level.get(cell)
+            if cluster is None:
+                level[cell] = [x, y, 1, index]
+                self._members[cell] = [index]
+            else:
+                cluster[0] += x
+                cluster[1] += y
+                cluster[2] += 1
+                self._members[cell].append(index)
+        self._levels[self.max_zoom] = level
+
+        for zoom in range(self.max_zoom - 1, self.min_zoom - 1, -1):
+            parent_level = {}
+            for (cx, cy), (x_sum, y_sum, count, lowest) in level.items():
+                cell = (cx >> 1, cy >> 1)
+                cluster = parent_level.get(cell)
+                if cluster is None:
+                    parent_level[cell] = [x_sum, y_sum, count, lowest]
+                else:
+                    cluster[0] += x_sum
+                    cluster[1] += y_sum
+                    cluster[2] += count
+                    cluster[3] = min(cluster[3], lowest)
+            self._levels[zoom] = parent_level
+            level = parent_level
+
+    def _visible_cells(self, zoom, level, x0, y0, x1, y1):
+        """
+        Yields the occupied cells of a level that intersect a world-coordinate rectangle.
+
+        Small rectangles probe each cell in range; when the range holds more
+        cells than the level has clusters, the level is scanned instead.
+        Rectangles with x0 > x1 wrap around the antimeridian.
+        """
+        scale = self._cells_per_world(zoom)
+        rows = range(max(0, int(y0 * scale)), min(scale - 1, int(y1 * scale)) + 1)
+        first, last = int(x0 * scale) % scale, int(x1 * scale) % scale
+        if x1 - x0 >= 1:
+            columns = range(scale)
+        elif first <= last:
+            columns = range(first, last + 1)
+        else:
+            columns = list(range(first, scale)) + list(range(0, last + 1))
+
+        if len(columns) * len(rows) > len(level):
+            column_set = set(columns) if len(columns) < scale else None
+            for cell in level:
+                if cell[1] in rows and (column_set is None or cell[0] in column_set):
+                    yield cell
+            return
+        for cx in columns:
+            for cy in rows:
+                if (cx, cy) in level:
+                    yield cx, cy
+
+    def clusters(self, zoom, viewport):
+        """
+        Returns the clusters visible in a viewport.
+        :param zoom: Map zoom level; fractional zooms use the nearest lower level.
+        :param viewport: (x0, y0, x1, y1) world coordinates of the top-left and bottom-right corners.
+        :return: List of (key, lat, lon, count, index) tuples, where index is the point's
+            position for single points and None for clusters.
+        """
+        zoom = int(zoom)
+        if zoom > self.max_zoom:
+            return self._points_in(viewport)
+        zoom = max(zoom, self.min_zoom)
+        level = self._levels[zoom]
+        visible = []
+        for cell in self._visible_cells(zoom, level, *viewport):
+            x_sum, y_sum, count, lowest = level[cell]
+            lat, lon = unproject(x_sum / count, y_sum / count)
+            visible.append(((lowest, count), lat, lon, count, lowest if count == 1 else None))
+        return visible
+
+    def _points_in(self, viewport):
+        x0, y0, x1, y1 = viewport
+        wraps = x0 > x1
+        visible = []
+        for cell in self._visible_cells(self.max_zoom, self._members, *viewport):
+            for index in self._members[cell]:
+                x, y = self.positions[index]
+                inside_x = (x >= x0 or x <= x1) if wraps else x0 <= x <= x1
+                if inside_x and y0 <= y <= y1:
+                    lat, lon = unproject(x, y)
+                    visible.append(((index, 1), lat, lon, 1, index))
+        return visible
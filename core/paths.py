@@ -0,0 +1,4 @@
+import os
+
+# Bundled content and the app's local databases and caches, wherever the app is launched from.
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "data")
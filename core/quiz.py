@@ -0,0 +1,187 @@
+import bisect
+import random
+
+from core.content import DEFAULT_DIFFICULTY, DEFAULT_TOPIC, DIFFICULTIES, default_store, question_id
+
+
+class QuestionBank:
+    """
+    Samples quiz questions by topic and difficulty, reading only the questions it hands out.
+
+    The bank keeps just the question positions grouped by (topic, difficulty),
+    and the stable id of each position, which the content store serves from
+    its compiled bundle when available; a question's text and options are
+    read when that question is asked.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or default_store()
+        self._groups = None  # (topic, difficulty) -> list of question positions
+        self._positions = None  # question id -> position
+
+    def _index(self):
+        if self._groups is None:
+            records = self.store.question_index()
+            self._positions = {
+                question: position
+                for record in records
+                for question, position in zip(record["ids"], record["positions"])
+            }
+            self._groups = {(record["topic"], record["difficulty"]): record["positions"] for record in records}
+        return self._groups
+
+    def position(self, question):
+        """
+        Returns the current position of the question with a given id, or None if the bank no longer has it.
+        """
+        self._index()
+        return self._positions.get(question)
+
+    def topics(self):
+        """
+        Returns the sorted list of topics in the bank.
+        """
+        return sorted({topic for topic, _ in self._index()})
+
+    def _matching(self, topic=None, difficulty=None):
+        return [
+            positions for (group_topic, group_difficulty), positions in self._index().items()
+            if (topic is None or group_topic == topic) and (difficulty is None or group_difficulty == difficulty)
+        ]
+
+    def count(self, topic=None, difficulty=None):
+        """
+        Returns how many questions match a topic and difficulty (None matches any).
+        """
+        return sum(len(positions) for positions in self._matching(topic, difficulty))
+
+    def sample(self, count, topic=None, difficulty=None, exclude=frozenset(), rng=random):
+        """
+        Picks distinct question positions at random.
+
+        Positions are drawn straight from the grouped lists, so sampling a few
+        questions from a large bank never copies or shuffles the whole bank.
+        :param count: Number of positions wanted.
+        :param topic: Topic to draw from, or None for any.
+        :param difficulty: Difficulty to draw from, or None for any.
+        :param exclude: Positions that must not be returned, such as questions already asked.
+        :param rng: random.Random-like source.
+        :return: List of at most ``count`` positions; shorter if too few questions match.
+        """
+        groups = self._matching(topic, difficulty)
+        ends = []
+        total = 0
+        for positions in groups:
+            total += len(positions)
+            ends.append(total)
+        if count * 2 >= total - len(exclude):
+            pool = [position for positions in groups for position in positions if position not in exclude]
+            return rng.sample(pool, min(count, len(pool)))
+
+        picked = []
+        seen = set(exclude)
+        while len(picked) < count:
+            draw = rng.randrange(total)
+            group = bisect.bisect_right(ends, draw)
+            position = groups[group][draw - (ends[group - 1] if group else 0)]
+            if position not in seen:
+                seen.add(position)
+                picked.append(position)
+        return picked
+
+    def question(self, position):
+        """
+        Reads one question.
+        :return: Dict with "question", "options", "answer", "topic", "difficulty", "position" and "id".
+        """
+        question = dict(self.store.record("questions", position))
+        question.setdefault("topic", DEFAULT_TOPIC)
+        question.setdefault("difficulty", DEFAULT_DIFFICULTY)
+        question["position"] = position
+        question["id"] = question_id(question)
+        return question
+
+
+class QuizSession:
+    """
+    One round of a quiz whose difficulty follows the player's answers.
+
+    Each question is drawn when it is needed, at the session's current
+    difficulty or the nearest one that still has unasked questions. Two
+    correct answers in a row raise the difficulty and a wrong answer lowers
+    it, which settles on questions the player gets right about 70% of the time.
+
+    Questions passed as ``review`` (ids, for example those a QuizHistory
+    reports as due) are asked first, before any new draws; ids the bank no
+    longer has are skipped.
+    """
+
+    def __init__(self, bank, length=10, topic=None, difficulty=DEFAULT_DIFFICULTY, rng=None, review=()):
+        self.bank = bank
+        self.length = length
+        self.topic = topic
+        self.difficulty = difficulty
+        self.rng = rng or random.Random()
+        self.asked = []  # positions
+        self.asked_ids = []
+        self.answers = []
+        self.current = None
+        self.exhausted = False
+        self._streak = 0
+        self._review = list(review)
+
+    @property
+    def score(self):
+        return sum(self.answers)
+
+    @property
+    def finished(self):
+        return self.exhausted or len(self.answers) >= self.length
+
+    def results(self):
+        """
+        Returns (question id, correct) pairs for the questions answered so far.
+        """
+        return list(zip(self.asked_ids, self.answers))
+
+    def next_question(self):
+        """
+        Draws the next question, or returns None once the round is over.
+        :raises ContentError: If the question bank cannot be read.
+        """
+        if self.finished:
+            return None
+        exclude = set(self.asked)
+        while self._review:
+            position = self.bank.position(self._review.pop(0))
+            if position is not None and position not in exclude:
+                return self._ask(position)
+        for difficulty in sorted(DIFFICULTIES, key=lambda level: (abs(level - self.difficulty), -level)):
+            picked = self.bank.sample(1, self.topic, difficulty, exclude=exclude, rng=self.rng)
+            if picked:
+                return self._ask(picked[0])
+        self.exhausted = True
+        return None
+
+    def _ask(self, position):
+        self.current = self.bank.question(position)
+        self.asked.append(position)
+        self.asked_ids.append(self.current["id"])
+        return self.current
+
+    def answer(self, selected_index):
+        """
+        Records an answer to the current question and adapts the difficulty.
+        :return: True if the answer was correct.
+        """
+        correct = selected_index == self.current["answer"]
+        self.answers.append(correct)
+        if correct:
+            self._streak += 1
+            if self._streak == 2:
+                self.difficulty = min(DIFFICULTIES[-1], self.difficulty + 1)
+                self._streak = 0
+        else:
+            self.difficulty = max(DIFFICULTIES[0], self.difficulty - 1)
+            self._streak = 0
+        return correct
@@ -0,0 +1,163 @@
+import os
+import time
+
+from core.paths import DATA_DIR
+from core.sqlite_store import SQLiteStore
+
+DAY = 86400.0
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+
+UPSERT_REVIEW_SQL = """
+INSERT INTO review_state (question, repetitions, interval_days, ease, due_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(question) DO UPDATE SET
+    repetitions = excluded.repetitions,
+    interval_days = excluded.interval_days,
+    ease = excluded.ease,
+    due_at = excluded.due_at
+"""
+
+
+def _migrate_create_history(connection):
+    """
+    Schema version 1: the answer log and one spaced-repetition state per question, keyed by question id.
+    """
+    connection.execute("""
+    CREATE TABLE IF NOT EXISTS answers (
+        id INTEGER PRIMARY KEY,
+        question TEXT NOT NULL,
+        correct INTEGER NOT NULL,
+        quality INTEGER NOT NULL,
+        answered_at REAL NOT NULL
+    )
+    """)
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_answers_question ON answers (question, answered_at)"
+    )
+    connection.execute("""
+    CREATE TABLE IF NOT EXISTS review_state (
+        question TEXT PRIMARY KEY,
+        repetitions INTEGER NOT NULL,
+        interval_days REAL NOT NULL,
+        ease REAL NOT NULL,
+        due_at REAL NOT NULL
+    )
+    """)
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_review_state_due ON review_state (due_at)"
+    )
+
+
+HISTORY_MIGRATIONS = [
+    _migrate_create_history,
+]
+
+
+def answer_quality(correct):
+    """
+    Maps a multiple-choice answer onto SM-2's 0-5 recall quality scale.
+    """
+    return 4 if correct else 1
+
+
+def sm2(state, quality):
+    """
+    Applies one review to a question's SM-2 state.
+    :param state: (repetitions, interval_days, ease), or None for a question never answered.
+    :param quality: Recall quality from 0 (blackout) to 5 (perfect).
+    :return: The new (repetitions, interval_days, ease).
+    """
+    repetitions, interval, ease = state or (0, 0.0, INITIAL_EASE)
+    if quality < 3:
+        repetitions, interval = 0, 1.0
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1.0
+        elif repetitions == 2:
+            interval = 6.0
+        else:
+            interval = round(interval * ease)
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return repetitions, interval, ease
+
+
+class QuizHistory(SQLiteStore):
+    """
+    Stores every quiz answer in SQLite and schedules questions for review with SM-2.
+
+    Questions are identified by their stable id (see core.content.question_id),
+    so the history survives edits to the question bank. Each round's answers
+    are written in one transaction at the end of the round. The review state
+    table has one row per question answered so far, and its index on due_at
+    keeps picking due questions a short range scan however long the answer
+    log grows.
+    """
+    migrations = HISTORY_MIGRATIONS
+
+    def __init__(self, db_path=os.path.join(DATA_DIR, "quiz_history.db"), pooled=False):
+        super().__init__(db_path, pooled=pooled)
+
+    def record_round(self, results, answered_at=None):
+        """
+        Logs a round's answers and reschedules each answered question.
+        :param results: Iterable of (question id, correct) pairs, in the order answered.
+        :param answered_at: Epoch seconds of the answers; defaults to now.
+        :return: Number of answers written.
+        """
+        answered_at = time.time() if answered_at is None else answered_at
+        results = [(question, bool(correct)) for question, correct in results]
+        if not results:
+            return 0
+        with self.session() as connection:
+            questions = sorted({question for question, _ in results})
+            placeholders = ", ".join("?" * len(questions))
+            states = {
+                row[0]: row[1:]
+                for row in connection.execute(
+                    f"SELECT question, repetitions, interval_days, ease FROM review_state WHERE question IN ({placeholders})",
+                    questions,
+                )
+            }
+            answers = []
+            for question, correct in results:
+                quality = answer_quality(correct)
+                states[question] = sm2(states.get(question), quality)
+                answers.append((question, int(correct), quality, answered_at))
+            connection.executemany(
+                "INSERT INTO answers (question, correct, quality, answered_at) VALUES (?, ?, ?, ?)", answers
+            )
+            connection.executemany(
+                UPSERT_REVIEW_SQL,
+                [
+                    (question, repetitions, interval, ease, answered_at + interval * DAY)
+                    for question, (repetitions, interval, ease) in states.items()
+                ],
+            )
+        return len(answers)
+
+    def due_questions(self, limit, now=None):
+        """
+        Returns the questions whose review is due, most overdue first.
+        :param limit: Maximum number of questions.
+        :param now: Epoch seconds to compare due times against; defaults to now.
+        :return: List of question ids.
+        """
+        now = time.time() if now is None else now
+        with self.session() as connection:
+            rows = connection.execute(
+                "SELECT question FROM review_state WHERE due_at <= ? ORDER BY due_at LIMIT ?", (now, limit)
+            ).fetchall()
+        return [question for question, in rows]
+
+    def answer_count(self, question=None):
+        """
+        Returns how many answers are logged, for one question id or overall.
+        """
+        with self.session() as connection:
+            if question is None:
+                return connection.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            return connection.execute(
+                "SELECT COUNT(*) FROM answers WHERE question = ?", (question,)
+            ).fetchone()[0]
@@ -0,0 +1,290 @@
+import gzip
+import json
+import math
+import os
+import threading
+
+from core.countries import country_name_for, iso_code_for
+from core.paths import DATA_DIR
+
+SHAPES_FORMAT_VERSION = 1
+
+# Hand-simplified (lon, lat) outlines of states the bundled shapes are too coarse to
+# include, which otherwise resolve to the neighbour whose outline swallows them.
+MICROSTATE_OUTLINES = {
+    "Singapore": [(103.61, 1.32), (103.68, 1.22), (103.83, 1.26), (103.99, 1.30), (104.09, 1.36),
+                  (103.98, 1.42), (103.82, 1.47), (103.70, 1.45), (103.64, 1.38)],
+    "Bahrain": [(50.45, 26.25), (50.63, 26.29), (50.65, 26.15), (50.62, 25.95), (50.50, 25.79),
+                (50.45, 25.95), (50.45, 26.10)],
+    "Malta": [(14.18, 36.07), (14.33, 36.09), (14.58, 35.87), (14.53, 35.80), (14.40, 35.82),
+              (14.33, 35.96), (14.18, 36.02)],
+    "Andorra": [(1.41, 42.49), (1.45, 42.60), (1.54, 42.66), (1.73, 42.62), (1.79, 42.57),
+                (1.72, 42.50), (1.55, 42.43), (1.45, 42.45)],
+    "Monaco": [(7.409, 43.724), (7.415, 43.736), (7.437, 43.752), (7.440, 43.748), (7.431, 43.735),
+               (7.418, 43.723)],
+    "Liechtenstein": [(9.47, 47.06), (9.53, 47.27), (9.56, 47.27), (9.61, 47.19), (9.64, 47.06), (9.58, 47.05)],
+    "San Marino": [(12.40, 43.94), (12.45, 43.99), (12.51, 43.97), (12.52, 43.92), (12.47, 43.89), (12.42, 43.90)],
+    "Holy See": [(12.4457, 41.9002), (12.4578, 41.9002), (12.4585, 41.9040), (12.4535, 41.9075), (12.4457, 41.9060)],
+}
+
+
+class ReverseGeocoder:
+    """
+    Resolves latitude/longitude to a country offline from bundled country outlines.
+
+    Outlines are bucketed into a grid of ``cell_size`` degree cells. Each cell
+    remembers which countries' bounding boxes cover it, and every latitude band
+    keeps only the polygon edges that cross it, so a point-in-polygon test only
+    walks a handful of edges. Cells that no border passes through are resolved
+    once and then answered directly.
+
+    The outlines are simplified, so points that fall just offshore (coastal
+    cities, small islands) snap to the nearest border within ``snap_distance``
+    degrees. States missing from the shapes file are added from
+    MICROSTATE_OUTLINES; where outlines overlap, as enclaves and micro-states
+    do with their neighbours' simplified ones, the country with the smallest
+    bounding box wins.
+    """
+
+    def __init__(self, path=os.path.join(DATA_DIR, "country_shapes.json.gz"), cell_size=1.0, snap_distance=0.5):
+        self.path = path
+        self.cell_size = cell_size
+        self.snap_distance = snap_distance
+        self.countries = []
+        self._areas = []
+        self._cell_candidates = {}
+        self._boundary_cells = set()
+        self._band_edges = {}
+        self._resolved_cells = {}
+        self._load()
+
+    def _load(self):
+        """
+        Reads the shapes file and builds the grid and band indexes.
+        """
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("version") != SHAPES_FORMAT_VERSION:
+            raise ValueError(f"Unsupported shapes file version: {data.get('version')}")
+
+        scale = data["scale"]
+        for country in data["countries"]:
+            rings = [_decode_ring(encoded, scale) for encoded in country["rings"]]
+            self._add_country(country["name"], country.get("iso"), rings)
+        names = {name for name, _ in self.countries}
+        for name, ring in MICROSTATE_OUTLINES.items():
+            if name not in names:
+                self._add_country(name, iso_code_for(name), [ring])
+        areas = self._areas
+        for candidates in self._cell_candidates.values():
+            candidates.sort(key=areas.__getitem__)  # the first containing candidate is then the smallest
+
+    def _add_country(self, name, iso, rings):
+        """
+        Indexes one country's outline rings of (lon, lat) pairs.
+        """
+        index = len(self.countries)
+        self.countries.append((name, iso))
+        cell = self.cell_size
+        min_x = min_y = math.inf
+        max_x = max_y = -math.inf
+        for ring in rings:
+            for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+                if y1 == y2:
+                    continue  # horizontal edges never cross a horizontal ray
+                edge = (x1, y1, x2, y2)
+                low, high = (y1, y2) if y1 < y2 else (y2, y1)
+                for band in range(_floor(low + 90, cell), _floor(high + 90, cell) + 1):
+                    self._band_edges.setdefault(band, {}).setdefault(index, []).append(edge)
+                for cx in range(_floor(min(x1, x2) + 180, cell), _floor(max(x1, x2) + 180, cell) + 1):
+                    for cy in range(_floor(low + 90, cell), _floor(high + 90, cell) + 1):
+                        self._boundary_cells.add((cx, cy, index))
+            xs = [x for x, _ in ring]
+            ys = [y for _, y in ring]
+            min_x, max_x = min(min_x, *xs), max(max_x, *xs)
+            min_y, max_y = min(min_y, *ys), max(max_y, *ys)
+        self._areas.append((max_x - min_x) * (max_y - min_y))
+        for cx in range(_floor(min_x + 180, cell), _floor(max_x + 180, cell) + 1):
+            for cy in range(_floor(min_y + 90, cell), _floor(max_y + 90, cell) + 1):
+                self._cell_candidates.setdefault((cx, cy), []).append(index)
+
+    def _contains(self, index, band, lon, lat):
+        """
+        Even-odd ray cast against the edges of one country within a latitude band.
+        """
+        inside = False
+        for x1, y1, x2, y2 in self._band_edges.get(band, {}).get(index, ()):
+            if (y1 > lat) != (y2 > lat) and lon < x1 + (lat - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+        return inside
+
+    def _locate(self, lat, lon):
+        """
+        Returns the index of the country containing the point, or None.
+        """
+        cell = self.cell_size
+        cx, cy = _floor(lon + 180, cell), _floor(lat + 90, cell)
+        key = (cx, cy)
+        resolved = self._resolved_cells.get(key, False)
+        if resolved is not False:
+            return resolved
+
+        candidates = self._cell_candidates.get(key, ())
+        if not any((cx, cy, index) in self._boundary_cells for index in candidates):
+            # No border crosses this cell, so its centre decides the whole cell.
+            center_lon = (cx + 0.5) * cell - 180
+            center_lat = (cy + 0.5) * cell - 90
+            answer = next((index for index in candidates if self._contains(index, cy, center_lon, center_lat)), None)
+            self._resolved_cells[key] = answer
+            return answer
+
+        for index in candidates:
+            if self._contains(index, cy, lon, lat):
+                return index
+        return self._nearest(cx, cy, lon, lat)
+
+    def _nearest(self, cx, cy, lon, lat):
+        """
+        Returns the country whose border lies closest to the point within snap_distance, or None.
+        """
+        if self.snap_distance <= 0:
+            return None
+        reach = max(1, math.ceil(self.snap_distance / self.cell_size))
+        x_scale = math.cos(math.radians(lat))
+        best, best_distance = None, self.snap_distance ** 2
+        nearby = set()
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                nearby.update(self._cell_candidates.get((cx + dx, cy + dy), ()))
+        for band in range(cy - reach, cy + reach + 1):
+            edges_by_country = self._band_edges.get(band, {})
+            for index in nearby:
+                for x1, y1, x2, y2 in edges_by_country.get(index, ()):
+                    distance = _segment_distance_sq(lon, lat, x1, y1, x2, y2, x_scale)
+                    if distance < best_distance:
+                        best, best_distance = index, distance
+        return best
+
+    def lookup(self, lat, lon):
+        """
+        Finds the country containing a coordinate.
+        :param lat: Latitude in degrees.
+        :param lon: Longitude in degrees.
+        :return: Country name, or None for open sea and unmapped areas.
+        """
+        index = self._locate(lat, lon)
+        return None if index is None else self.countries[index][0]
+
+    def lookup_code(self, lat, lon):
+        """
+        Finds the ISO 3166-1 alpha-2 code of the country containing a coordinate.
+        :return: Two-letter code, or None.
+        """
+        index = self._locate(lat, lon)
+        return None if index is None else self.countries[index][1]
+
+    def lookup_many(self, points):
+        """
+        Resolves a batch of coordinates.
+        :param points: Iterable of (latitude, longitude) tuples.
+        :return: List of country names (None where no country matches), in input order.
+        """
+        countries = self.countries
+        locate = self._locate
+        results = []
+        for lat, lon in points:
+            index = locate(lat, lon)
+            results.append(None if index is None else countries[index][0])
+        return results
+
+
+def _floor(value, cell):
+    return int(value // cell)
+
+
+def _segment_distance_sq(px, py, x1, y1, x2, y2, x_scale):
+    """
+    Squared planar distance in degrees from a point to a segment, with longitude scaled by x_scale.
+    """
+    ax, ay = (x1 - px) * x_scale, y1 - py
+    bx, by = (x2 - px) * x_scale, y2 - py
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / length_sq))
+    qx, qy = ax + t * dx, ay + t * dy
+    return qx * qx + qy * qy
+
+
+def _decode_ring(encoded, scale):
+    """
+    Expands a delta-encoded integer ring [x0, y0, dx1, dy1, ...] into (lon, lat) tuples.
+    """
+    x = y = 0
+    ring = []
+    for i in range(0, len(encoded), 2):
+        x += encoded[i]
+        y += encoded[i + 1]
+        ring.append((x / scale, y / scale))
+    return ring
+
+
+def _encode_ring(ring, scale):
+    """
+    Delta-encodes a ring of (lon, lat) pairs as integers, dropping repeated points.
+    """
+    encoded = []
+    prev_x = prev_y = 0
+    for lon, lat in ring:
+        x, y = round(lon * scale), round(lat * scale)
+        if encoded and (x, y) == (prev_x, prev_y):
+            continue
+        encoded.extend((x - prev_x, y - prev_y))
+        prev_x, prev_y = x, y
+    return encoded
+
+
+def build_shapes_file(geojson_path, out_path, scale=1000, name_field="name", iso_field="iso_a2"):
+    """
+    Compiles a GeoJSON country layer (e.g. Natural Earth admin-0) into the compact shapes file.
+
+    Names are normalised to the ones used by the contacts table when the ISO code is known.
+    :param geojson_path: FeatureCollection with Polygon/MultiPolygon features.
+    :param out_path: Destination .json.gz path.
+    :param scale: Integer units per degree used for the stored coordinates.
+    :return: Number of countries written.
+    """
+    with open(geojson_path, "r", encoding="utf-8") as file:
+        features = json.load(file)["features"]
+
+    countries = []
+    for feature in features:
+        properties = feature["properties"]
+        iso = properties.get(iso_field)
+        iso = iso.upper() if iso and len(iso) == 2 else None
+        geometry = feature["geometry"]
+        polygons = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+        rings = [_encode_ring(ring, scale) for polygon in polygons for ring in polygon]
+        countries.append({
+            "name": (iso and country_name_for(iso)) or properties[name_field],
+            "iso": iso,
+            "rings": [ring for ring in rings if len(ring) >= 6],
+        })
+
+    with gzip.open(out_path, "wt", encoding="utf-8") as file:
+        json.dump({"version": SHAPES_FORMAT_VERSION, "scale": scale, "countries": countries}, file, separators=(",", ":"))
+    return len(countries)
+
+
+_default_geocoder = None
+_default_geocoder_lock = threading.Lock()
+
+
+def default_geocoder():
+    """
+    Returns the process-wide reverse geocoder, loading the bundled shapes on first use.
+    """
+    global _default_geocoder
+    with _default_geocoder_lock:
+        if _default_geocoder is None:
+            _default_geocoder = ReverseGeocoder()
+        return _default_geocoder
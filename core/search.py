@@ -0,0 +1,454 @@
+import bisect
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+from core.content import ContentError, asset_records
+from core.paths import DATA_DIR
+from core.sqlite_store import SQLiteStore
+
+# Content assets that are searchable.
+INDEXED_ASSETS = ("instructions", "questions", "resources", "alerts")
+FEED_KIND = "feed"  # alerts that arrived through the live feed rather than the content files
+MIN_FUZZY_LENGTH = 4  # shorter terms are too ambiguous to correct
+MIN_PREFIX_LENGTH = 2  # matches the smallest FTS5 prefix index
+MAX_CORRECTIONS = 5
+CANDIDATE_LIMIT = 500  # matches quick_search() ranks, most recently written first
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-index")
+_query_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-query")
+_WORD = re.compile(r"\w+")
+
+
+def _migrate_create_index(connection):
+    """
+    Schema version 1: the FTS5 document table, its vocabulary and the bookkeeping for incremental updates.
+    """
+    connection.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+        title, body, kind UNINDEXED, ref UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """)
+    connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS document_terms USING fts5vocab(documents, 'row')")
+    connection.execute("""
+    CREATE TABLE IF NOT EXISTS document_keys (
+        key TEXT PRIMARY KEY,
+        doc_rowid INTEGER NOT NULL,
+        digest TEXT NOT NULL
+    )
+    """)
+    connection.execute("""
+    CREATE TABLE IF NOT EXISTS sources (
+        asset TEXT PRIMARY KEY,
+        mtime INTEGER NOT NULL
+    )
+    """)
+
+
+SEARCH_MIGRATIONS = [
+    _migrate_create_index,
+]
+
+
+def terms(text):
+    """
+    Splits text into lower-case, accent-free words, matching the index's unicode61 tokenizer.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return _WORD.findall("".join(char for char in decomposed if not unicodedata.combining(char)))
+
+
+def asset_documents(name, payload):
+    """
+    Turns a content asset into searchable documents.
+    :return: List of (key, kind, ref, title, body) tuples; ref locates the item within its page.
+    """
+    documents = []
+    for position, record in enumerate(asset_records(name, payload)):
+        if name == "instructions":
+            title, _, _ = record.partition(":")
+            documents.append((f"{name}:{position}", name, str(position), title, record))
+        elif name == "questions":
+            documents.append((f"{name}:{position}", name, str(position), record["question"], " ".join(record["options"])))
+        elif name == "resources":
+            documents.append((f"{name}:{record['category']}", name, record["category"], record["category"], " ".join(record["links"])))
+        elif name == "alerts":
+            documents.append(_alert_document(name, record))
+    return documents
+
+
+def _alert_document(kind, alert):
+    title = " ".join(part for part in (alert["severity"], alert["region"]) if part) or "Alert"
+    return f"{kind}:{alert['id']}", kind, alert["id"], title, alert["text"]
+
+
+def _digest(document):
+    return hashlib.blake2b("\x1f".join(document[1:]).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _within_one_edit(a, b):
+    """
+    Tells whether two different words are one insertion, deletion, substitution or adjacent swap apart.
+    """
+    if abs(len(a) - len(b)) > 1:
+        return False
+    prefix = 0
+    while prefix < min(len(a), len(b)) and a[prefix] == b[prefix]:
+        prefix += 1
+    if len(a) == len(b):
+        if a[prefix + 1:] == b[prefix + 1:]:
+            return True
+        swapped = prefix + 1 < len(a) and a[prefix] == b[prefix + 1] and a[prefix + 1] == b[prefix]
+        return swapped and a[prefix + 2:] == b[prefix + 2:]
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    return shorter[prefix:] == longer[prefix + 1:]
+
+
+class Vocabulary:
+    """
+    In-memory word list of the index, used to correct typos and to check prefixes.
+
+    Corrections use a deletion index: every word is filed under itself and
+    each variant with one letter removed, so the words one edit away from a
+    query term are found with a handful of dictionary lookups.
+    """
+
+    def __init__(self, words=()):
+        self._sorted = []
+        self._deletes = {}
+        self._lock = threading.Lock()
+        self.update(words)
+
+    def __contains__(self, word):
+        index = bisect.bisect_left(self._sorted, word)
+        return index < len(self._sorted) and self._sorted[index] == word
+
+    def __len__(self):
+        return len(self._sorted)
+
+    @staticmethod
+    def _variants(word):
+        return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+    def update(self, words):
+        """
+        Adds words, ignoring those already present.
+        """
+        with self._lock:
+            new = {word for word in set(words) if word not in self}
+            if not new:
+                return
+            if len(new) > 100:
+                self._sorted = sorted(set(self._sorted) | new)
+            else:
+                for word in new:
+                    bisect.insort(self._sorted, word)
+            for word in new:
+                if len(word) >= MIN_FUZZY_LENGTH - 1:
+                    for variant in self._variants(word):
+                        self._deletes.setdefault(variant, []).append(word)
+
+    def has_prefix(self, prefix):
+        """
+        Tells whether any word starts with ``prefix``.
+        """
+        index = bisect.bisect_left(self._sorted, prefix)
+        return index < len(self._sorted) and self._sorted[index].startswith(prefix)
+
+    def corrections(self, word, limit=MAX_CORRECTIONS):
+        """
+        Returns up to ``limit`` indexed words one edit away from ``word``.
+        """
+        if len(word) < MIN_FUZZY_LENGTH:
+            return []
+        found = []
+        for variant in self._variants(word):
+            for candidate in self._deletes.get(variant, ()):
+                if candidate != word and candidate not in found and _within_one_edit(word, candidate):
+                    found.append(candidate)
+        return sorted(found)[:limit]
+
+
+class SearchIndex(SQLiteStore):
+    """
+    Full-text search over the preparedness content, kept in an SQLite FTS5 index.
+
+    Documents are updated incrementally: each carries a stable key and a
+    digest of its text, so re-indexing an asset only rewrites the documents
+    that were added, changed or removed. Queries are ranked with BM25 (titles
+    weigh more than bodies), the last word is matched as a prefix for
+    search-as-you-type, and words missing from the index are widened to the
+    indexed words one typo away.
+    """
+    migrations = SEARCH_MIGRATIONS
+
+    def __init__(self, db_path=os.path.join(DATA_DIR, "search_index.db")):
+        super().__init__(db_path, pooled=True)
+        self._vocabulary = None
+        self._vocabulary_lock = threading.Lock()
+        self._query_lock = threading.Lock()
+        self._query_generation = 0
+
+    def vocabulary(self):
+        """
+        Returns the index's Vocabulary, loading it from the FTS5 vocabulary table on first use.
+        """
+        with self._vocabulary_lock:
+            if self._vocabulary is None:
+                with self.session() as connection:
+                    words = [term for term, in connection.execute("SELECT term FROM document_terms")]
+                self._vocabulary = Vocabulary(words)
+            return self._vocabulary
+
+    def _existing(self, connection, low, high):
+        """
+        Returns {key: (doc_rowid, digest)} for the document keys in [low, high).
+        """
+        rows = connection.execute(
+            "SELECT key, doc_rowid, digest FROM document_keys WHERE key >= ? AND key < ?", (low, high)
+        )
+        return {key: (doc_rowid, digest) for key, doc_rowid, digest in rows}
+
+    def _write(self, connection, documents, existing, removed_keys):
+        """
+        Applies inserts, replacements and deletions; unchanged documents are skipped.
+        :param existing: {key: (doc_rowid, digest)} for at least every key being written or removed.
+        :return: Number of documents written or deleted.
+        """
+        stale, inserts, keys = [], [], []
+        next_rowid = connection.execute("SELECT COALESCE(MAX(rowid), 0) + 1 FROM documents").fetchone()[0]
+        for document in documents:
+            key, kind, ref, title, body = document
+            digest = _digest(document)
+            previous = existing.get(key)
+            if previous is not None:
+                if previous[1] == digest:
+                    continue
+                stale.append((previous[0],))
+            inserts.append((next_rowid, title, body, kind, ref))
+            keys.append((key, next_rowid, digest))
+            next_rowid += 1
+        removed = [key for key in removed_keys if key in existing]
+        stale.extend((existing[key][0],) for key in removed)
+
+        connection.executemany("DELETE FROM documents WHERE rowid = ?", stale)
+        connection.executemany("DELETE FROM document_keys WHERE key = ?", [(key,) for key in removed])
+        connection.executemany("INSERT INTO documents (rowid, title, body, kind, ref) VALUES (?, ?, ?, ?, ?)", inserts)
+        connection.executemany("INSERT OR REPLACE INTO document_keys (key, doc_rowid, digest) VALUES (?, ?, ?)", keys)
+        if inserts and self._vocabulary is not None:
+            self._vocabulary.update(word for _, title, body, _, _ in inserts for word in terms(f"{title} {body}"))
+        return len(inserts) + len(removed)
+
+    def index_asset(self, name, payload):
+        """
+        Brings the documents of one content asset in line with its current payload.
+        :return: Number of documents written or deleted.
+        """
+        documents = asset_documents(name, payload)
+        with self.session() as connection:
+            existing = self._existing(connection, f"{name}:", f"{name};")
+            return self._write(connection, documents, existing, existing.keys() - {document[0] for document in documents})
+
+    def _index_source(self, name, store, indexed_mtime=None):
+        """
+        Re-indexes one asset from the store unless its file is unchanged, and records the file's mtime.
+        :param indexed_mtime: mtime recorded when the asset was last indexed, or None.
+        :return: Number of documents written or deleted.
+        """
+        try:
+            mtime = os.stat(store.path_for(name)).st_mtime_ns
+        except FileNotFoundError:
+            return 0  # optional asset not shipped
+        if indexed_mtime == mtime:
+            return 0
+        try:
+            changed = self.index_asset(name, store.get(name))
+        except ContentError as e:
+            print(f"Error indexing {name}: {e}")
+            return 0
+        with self.session() as connection:
+            connection.execute("INSERT OR REPLACE INTO sources (asset, mtime) VALUES (?, ?)", (name, mtime))
+        return changed
+
+    def sync(self, store):
+        """
+        Re-indexes every content asset whose file changed since it was last indexed.
+        :param store: ContentStore to read the assets from.
+        :return: Number of documents written or deleted.
+        """
+        with self.session() as connection:
+            indexed = dict(connection.execute("SELECT asset, mtime FROM sources"))
+        return sum(self._index_source(name, store, indexed.get(name)) for name in INDEXED_ASSETS)
+
+    def purge_feed(self):
+        """
+        Deletes every live-feed alert from the index.
+
+        Feed alerts are only valid while the feed that reported them is
+        running; a new AlertFeed reports every alert still current as added on
+        its first poll, so nothing that has expired in the meantime survives.
+        :return: Number of documents deleted.
+        """
+        with self.session() as connection:
+            existing = self._existing(connection, f"{FEED_KIND}:", f"{FEED_KIND};")
+            return self._write(connection, [], existing, list(existing))
+
+    def sync_async(self, store):
+        """
+        Drops live-feed alerts left from earlier runs and runs sync() on the index's background thread,
+        then loads the vocabulary for typo correction.
+        :return: Future resolving to the number of documents written or deleted.
+        """
+        def sync_and_load():
+            changed = self.purge_feed() + self.sync(store)
+            self.vocabulary()
+            return changed
+
+        return _executor.submit(sync_and_load)
+
+    def watch(self, store):
+        """
+        Re-indexes assets on the index's background thread as soon as the content store hot-reloads them.
+        """
+        def reindex(name):
+            if name in INDEXED_ASSETS:
+                _executor.submit(self._index_source, name, store)
+
+        store.add_listener(reindex)
+
+    def apply_alert_diff(self, diff):
+        """
+        Indexes one update from the live alert feed (see core.alert_feed.AlertFeed.poll).
+        """
+        documents = [_alert_document(FEED_KIND, alert) for alert in diff["added"] + diff["updated"]]
+        removed = [f"{FEED_KIND}:{alert_id}" for alert_id in diff["removed"]]
+        with self.session() as connection:
+            existing = {}
+            for key in [document[0] for document in documents] + removed:
+                existing.update(self._existing(connection, key, key + "\0"))
+            self._write(connection, documents, existing, removed)
+
+    def apply_alert_diff_async(self, diff):
+        """
+        Runs apply_alert_diff() on the index's background thread, after any purge_feed() queued at startup.
+        :return: Future resolving when the diff is indexed.
+        """
+        return _executor.submit(self.apply_alert_diff, diff)
+
+    def _match_expression(self, query):
+        """
+        Builds the FTS5 MATCH expression for a user query, or None if there is nothing to search yet.
+
+        Until the vocabulary has loaded (see sync_async), words are matched as typed.
+        """
+        words = terms(query)
+        if not query[-1:].isspace() and words and len(words[-1]) < MIN_PREFIX_LENGTH:
+            words.pop()  # a single trailing letter matches too much to be useful
+        if not words:
+            return None
+        vocabulary = self._vocabulary
+        if vocabulary is None:
+            _executor.submit(self.vocabulary)
+        as_you_type = not query[-1:].isspace()
+        clauses = []
+        for position, word in enumerate(words):
+            star = "*" if as_you_type and position == len(words) - 1 else ""
+            alternatives = [word]
+            if vocabulary is not None and not (vocabulary.has_prefix(word) if star else word in vocabulary):
+                alternatives += vocabulary.corrections(word)
+            clauses.append("(" + " OR ".join(f'"{alternative}"{star}' for alternative in alternatives) + ")")
+        return " AND ".join(clauses)
+
+    def _ranked(self, connection, expression, limit, min_rowid=0):
+        """
+        Ranks the matches of an expression with BM25, those from ``min_rowid`` on only.
+        """
+        rows = connection.execute(
+            """
+            SELECT kind, ref, title, snippet(documents, 1, '[', ']', '...', 10), bm25(documents, 5.0, 1.0) AS score
+            FROM documents WHERE documents MATCH ? AND rowid >= ? ORDER BY score LIMIT ?
+            """,
+            (expression, min_rowid, limit),
+        ).fetchall()
+        return [
+            {"kind": kind, "ref": ref, "title": title, "snippet": snippet, "score": score}
+            for kind, ref, title, snippet, score in rows
+        ]
+
+    def search(self, query, limit=20):
+        """
+        Finds the documents best matching a query, ranking every match with BM25.
+
+        Broad queries over a large index take tens of milliseconds or more;
+        the search page calls quick_search() per keystroke and this from a
+        background thread (see search_async).
+        :param query: Free text as typed; the last word matches as a prefix unless followed by a space.
+        :param limit: Maximum number of results.
+        :return: List of dicts with "kind", "ref", "title", "snippet" and "score" (lower is better).
+        """
+        expression = self._match_expression(query)
+        if expression is None:
+            return []
+        with self.session() as connection:
+            return self._ranked(connection, expression, limit)
+
+    def quick_search(self, query, limit=20):
+        """
+        Like search(), but bounds the BM25 work for search-as-you-type.
+
+        When a query matches more than CANDIDATE_LIMIT documents only the
+        CANDIDATE_LIMIT most recently written ones are ranked, so better
+        matches may be missing; the result then says it is incomplete.
+        :return: (results, complete); complete is False when matches were left unranked.
+        """
+        expression = self._match_expression(query)
+        if expression is None:
+            return [], True
+        with self.session() as connection:
+            row = connection.execute(
+                "SELECT rowid FROM documents WHERE documents MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                (expression, CANDIDATE_LIMIT - 1),
+            ).fetchone()
+            if row is None:
+                return self._ranked(connection, expression, limit), True
+            complete = connection.execute(
+                "SELECT 1 FROM documents WHERE documents MATCH ? AND rowid < ? LIMIT 1", (expression, row[0])
+            ).fetchone() is None
+            return self._ranked(connection, expression, limit, min_rowid=row[0]), complete
+
+    def search_async(self, query, limit=20):
+        """
+        Runs search() on the query thread. A query still waiting when a newer
+        one is submitted is skipped, so fast typing never queues up slow searches.
+        :return: Future resolving to the results, or None if the query was superseded.
+        """
+        with self._query_lock:
+            self._query_generation += 1
+            generation = self._query_generation
+
+        def run():
+            if generation != self._query_generation:
+                return None
+            return self.search(query, limit)
+
+        return _query_executor.submit(run)
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def default_search_index():
+    """
+    Returns the process-wide search index.
+    """
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = SearchIndex()
+        return _default_index
@@ -0,0 +1,258 @@
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from assets.data.init_contacts import global_emergency_number
+from core.contacts import ContactResolver
+from core.countries import country_name_for, iso_code_for, looks_like_iso_code
+from core.database import DatabaseManager
+from core.paths import DATA_DIR
+from core.reverse_geocoder import default_geocoder
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_QUERIES_PER_REQUEST = 100
+
+
+def parse_query(params):
+    """
+    Validates one lookup: a country (name or ISO code) or a coordinate.
+    :param params: Dict with "country", or with "lat" and "lon".
+    :return: {"country": name} or {"lat": float, "lon": float}.
+    :raises ValueError: If neither form is given or a coordinate is out of range.
+    """
+    if not isinstance(params, dict):
+        raise ValueError("each query must be an object")
+    country = params.get("country")
+    if isinstance(country, str) and country.strip():
+        return {"country": country.strip()}
+    if "lat" in params and "lon" in params:
+        try:
+            lat, lon = float(params["lat"]), float(params["lon"])
+        except (TypeError, ValueError):
+            raise ValueError("lat and lon must be numbers") from None
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError("coordinates out of range")
+        return {"lat": lat, "lon": lon}
+    raise ValueError("give a country, or lat and lon")
+
+
+class ContactService:
+    """
+    Resolves countries or coordinates to emergency numbers for many clients at once, without any GUI.
+
+    Lookups arriving within ``batch_window`` seconds of each other (by
+    default, those arriving in the same event loop iteration) are resolved
+    together in one call on the worker pool: coordinates go through
+    the reverse geocoder in a single pass and each distinct country is looked
+    up once. Worker threads read the contacts database through a shared
+    ContactResolver backed by pooled read-only connections.
+    """
+
+    def __init__(self, db_path=os.path.join(DATA_DIR, "contacts.db"), geocoder=None, workers=4, batch_window=0.0, max_batch=256):
+        DatabaseManager(db_path).close_all()  # create or upgrade the schema before opening it read-only
+        self.db = DatabaseManager(db_path, pooled=True, read_only=True)
+        self.resolver = ContactResolver(self.db)
+        self.geocoder = geocoder
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.lookups = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="contact-service")
+        self._pending = []
+        self._flush_handle = None
+
+    def _geocoder(self):
+        if self.geocoder is None:
+            self.geocoder = default_geocoder()
+        return self.geocoder
+
+    def contact_record(self, country):
+        """
+        Builds the response record for a country, or for an unknown location when country is None.
+
+        A query by ISO code keeps that code in the response, even when the contacts table has no row for it.
+        """
+        if not country:
+            return {"country": None, "iso_code": None, "emergency": global_emergency_number,
+                    "police": None, "fire": None, "ambulance": None}
+        contact = self.resolver.lookup(country)
+        by_code = looks_like_iso_code(country)
+        if contact:
+            name = contact[1]
+        else:
+            name = (country_name_for(country) if by_code else None) or country
+        return {
+            "country": name,
+            "iso_code": country.upper() if by_code else iso_code_for(name),
+            "emergency": self.resolver.emergency_number(country),
+            "police": contact[2] if contact else None,
+            "fire": contact[3] if contact else None,
+            "ambulance": contact[4] if contact else None,
+        }
+
+    def resolve_batch(self, queries):
+        """
+        Resolves parsed queries in one pass; runs on a worker thread.
+        :param queries: List of dicts from parse_query.
+        :return: List of response records, in input order.
+        """
+        points = [(query["lat"], query["lon"]) for query in queries if "country" not in query]
+        located = iter(self._geocoder().lookup_many(points) if points else [])
+        countries = [query["country"] if "country" in query else next(located) for query in queries]
+        records = {country: self.contact_record(country) for country in set(countries)}
+        return [records[country] for country in countries]
+
+    async def lookup(self, query):
+        """
+        Queues a parsed query for the next batch and waits for its record.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self):
+        """
+        Sends every queued query to the worker pool as one batch.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.lookups += len(batch)
+        work = asyncio.get_running_loop().run_in_executor(self._executor, self.resolve_batch, [query for query, _ in batch])
+
+        def deliver(done):
+            error = done.exception()
+            for index, (_, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(done.result()[index])
+
+        work.add_done_callback(deliver)
+
+    async def handle(self, method, target, body):
+        """
+        Routes one HTTP request.
+        :return: (HTTPStatus, JSON-serializable payload).
+        """
+        url = urlsplit(target)
+        if url.path == "/health":
+            return HTTPStatus.OK, {"status": "ok", "batches": self.batches, "lookups": self.lookups,
+                                   "cache": self.resolver.stats()}
+        if url.path != "/contacts":
+            return HTTPStatus.NOT_FOUND, {"error": "not found"}
+        try:
+            if method == "GET":
+                return HTTPStatus.OK, await self.lookup(parse_query(dict(parse_qsl(url.query))))
+            if method == "POST":
+                queries = json.loads(body or b"null")
+                if not isinstance(queries, dict) or not isinstance(queries.get("queries"), list):
+                    raise ValueError('body must be {"queries": [...]}')
+                if len(queries["queries"]) > MAX_QUERIES_PER_REQUEST:
+                    raise ValueError(f"at most {MAX_QUERIES_PER_REQUEST} queries per request")
+                parsed = [parse_query(query) for query in queries["queries"]]
+                return HTTPStatus.OK, {"results": await asyncio.gather(*(self.lookup(query) for query in parsed))}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use GET or POST"}
+
+    async def _serve_connection(self, reader, writer):
+        """
+        Answers requests on one keep-alive connection until the client closes it.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.handle(method, target, body)
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """
+        Loads the geocoder and starts listening.
+        :return: The asyncio server; its port is server.sockets[0].getsockname()[1].
+        """
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._geocoder)
+        return await asyncio.start_server(self._serve_connection, host, port)
+
+    def close(self):
+        """
+        Stops the worker pool and closes the database connections.
+        """
+        self._executor.shutdown(wait=True)
+        self.db.close_all()
+
+
+async def serve(host, port, db_path, workers, batch_window, max_batch):
+    service = ContactService(db_path, workers=workers, batch_window=batch_window, max_batch=max_batch)
+    server = await service.start(host, port)
+    print(f"Serving emergency contacts on http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m core.service --port 8080
+    parser = argparse.ArgumentParser(description="Serve emergency contact lookups over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", default=os.path.join(DATA_DIR, "contacts.db"))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-window-ms", type=float, default=0.0, help="how long to collect lookups into one batch")
+    parser.add_argument("--max-batch", type=int, default=256, help="largest batch; 1 disables batching")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.db, args.workers, args.batch_window_ms / 1000, args.max_batch))
+    except KeyboardInterrupt:
+        pass
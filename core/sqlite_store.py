@@ -0,0 +1,156 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class SQLiteStore:
+    """
+    Base for the app's SQLite databases: connections, transactions and schema migrations.
+
+    By default every call opens and closes its own connection. With
+    ``pooled=True`` each thread keeps one long-lived connection in WAL mode,
+    so repeated lookups reuse the open file and sqlite3's prepared statement
+    cache instead of paying for a fresh connection every time.
+
+    With ``read_only=True`` connections are opened in SQLite's read-only mode
+    and the schema is left as it is, so many readers can share a database
+    another process writes.
+
+    Subclasses list their schema in ``migrations``: functions applied in order,
+    a database at PRAGMA user_version N having run the first N of them.
+    """
+    migrations = []
+
+    def __init__(self, db_path, pooled=False, cached_statements=128, read_only=False):
+        self.db_path = db_path
+        self.pooled = pooled
+        self.read_only = read_only
+        self.cached_statements = cached_statements
+        self.connection = None
+        self._local = threading.local()
+        self._pool = []
+        self._pool_lock = threading.Lock()
+        self.ensure_directory_exists()
+        self.initialize_database()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close_all()
+
+    def ensure_directory_exists(self):
+        """
+        Ensures that the directory for the database file exists.
+        """
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def connect(self):
+        """
+        Establishes a connection to the database.
+        """
+        if not self.connection:
+            self.connection = self._open()
+
+    def _open(self, **kwargs):
+        """
+        Opens a new connection, read-only if the store is.
+        """
+        if self.read_only:
+            return sqlite3.connect(Path(self.db_path).resolve().as_uri() + "?mode=ro", uri=True, **kwargs)
+        return sqlite3.connect(self.db_path, **kwargs)
+
+    def close(self):
+        """
+        Closes the connection to the database.
+        """
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def _pooled_connection(self):
+        """
+        Returns the long-lived connection owned by the calling thread, opening it on first use.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # check_same_thread is disabled only so close_all() can run from any thread;
+            # each connection is still used exclusively by the thread that opened it.
+            connection = self._open(
+                cached_statements=self.cached_statements,
+                check_same_thread=False,
+            )
+            if not self.read_only:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._pool_lock:
+                self._pool.append(connection)
+        return connection
+
+    def close_all(self):
+        """
+        Closes every pooled connection along with the per-call connection, if open.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+        for connection in pool:
+            connection.close()
+        self._local = threading.local()
+        self.close()
+
+    @contextmanager
+    def session(self):
+        """
+        Yields a connection for a unit of work, committing on success and rolling back on error.
+
+        In pooled mode the connection stays open afterwards; otherwise it is closed on exit.
+        """
+        if self.pooled:
+            connection = self._pooled_connection()
+            with connection:
+                yield connection
+            return
+
+        self.connect()
+        try:
+            with self.connection:
+                yield self.connection
+        finally:
+            self.close()
+
+    def initialize_database(self):
+        """
+        Creates the schema, or upgrades an existing one, to the latest version.
+
+        Read-only stores expect the schema to be in place already.
+        """
+        if not self.read_only:
+            self.migrate()
+
+    def schema_version(self):
+        """
+        Returns the schema version recorded in the database file.
+        """
+        with self.session() as connection:
+            return connection.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self):
+        """
+        Applies every pending entry of ``migrations``, each in its own transaction.
+
+        :return: The schema version after migrating.
+        """
+        with self.session() as connection:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            for target, migration in enumerate(self.migrations[version:], start=version + 1):
+                connection.execute("BEGIN")
+                migration(connection)
+                connection.execute(f"PRAGMA user_version = {target}")
+                connection.commit()
+                version = target
+        return version
@@ -0,0 +1,229 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from core.paths import DATA_DIR
+
+OSM_TILE_SERVER = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+# Deployments with their own (or a commercial) tile server point the map at it here.
+DEFAULT_TILE_SERVER = os.environ.get("SAFEGUARD_TILE_SERVER", OSM_TILE_SERVER)
+# Tile servers ask clients to identify themselves; SAFEGUARD_CONTACT adds an email or URL to reach the operator.
+USER_AGENT = "SafeGuard/1.0 (emergency preparedness app{})".format(
+    f"; {os.environ['SAFEGUARD_CONTACT']}" if os.environ.get("SAFEGUARD_CONTACT") else ""
+)
+# The OpenStreetMap Foundation's tile usage policy forbids bulk downloading and prefetching.
+NO_BULK_DOWNLOAD_HOSTS = ("openstreetmap.org", "openstreetmap.fr")
+
+
+def allows_bulk_download(tile_server):
+    """
+    Tells whether tiles may be prefetched in bulk from a tile server.
+    :return: False for servers whose usage policy forbids it, such as openstreetmap.org's.
+    """
+    host = (urlsplit(tile_server).hostname or "").lower()
+    return not any(host == domain or host.endswith("." + domain) for domain in NO_BULK_DOWNLOAD_HOSTS)
+
+
+def tile_for(lat, lon, zoom):
+    """
+    Converts a coordinate to the slippy-map tile that contains it.
+    :return: (x, y) tile indexes at the given zoom.
+    """
+    lat = max(-85.0511, min(85.0511, lat))
+    n = 2 ** zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(x, n - 1), min(y, n - 1)
+
+
+def tile_url(tile_server, zoom, x, y):
+    """
+    Fills a {z}/{x}/{y} tile server template.
+    """
+    return tile_server.replace("{z}", str(zoom)).replace("{x}", str(x)).replace("{y}", str(y))
+
+
+def fetch_tile(url, timeout=10):
+    """
+    Downloads one tile image.
+    :return: Raw image bytes.
+    :raises OSError: On network or HTTP errors.
+    """
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+class TileCache:
+    """
+    Persistent, size-bounded LRU store of map tiles in SQLite.
+
+    The ``tiles`` table keeps tkintermapview's column layout (zoom, x, y,
+    server, tile_image), so the file also works as that widget's offline
+    database. Every read refreshes the tile's last_used time; once the stored
+    bytes exceed ``max_bytes`` the least recently used tiles are evicted.
+    """
+
+    def __init__(self, db_path=os.path.join(DATA_DIR, "tile_cache.db"), max_bytes=200 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        with connection:
+            connection.execute("""
+            CREATE TABLE IF NOT EXISTS tiles (
+                zoom INTEGER NOT NULL,
+                x INTEGER NOT NULL,
+                y INTEGER NOT NULL,
+                server TEXT NOT NULL,
+                tile_image BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (zoom, x, y, server)
+            )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_tiles_last_used ON tiles (last_used)")
+        self.total_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM tiles").fetchone()[0]
+
+    def _connection(self):
+        """
+        Returns the calling thread's connection; map widgets load tiles from several threads.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, zoom, x, y, server=DEFAULT_TILE_SERVER):
+        """
+        Returns a cached tile and marks it as recently used.
+        :return: Image bytes, or None on a miss.
+        """
+        connection = self._connection()
+        key = (zoom, x, y, server)
+        row = connection.execute(
+            "SELECT tile_image FROM tiles WHERE zoom = ? AND x = ? AND y = ? AND server = ?", key
+        ).fetchone()
+        if row is None:
+            return None
+        with connection:
+            connection.execute(
+                "UPDATE tiles SET last_used = ? WHERE zoom = ? AND x = ? AND y = ? AND server = ?",
+                (time.time(),) + key,
+            )
+        return row[0]
+
+    def contains(self, zoom, x, y, server=DEFAULT_TILE_SERVER):
+        """
+        Tells whether a tile is cached, without touching its LRU position.
+        """
+        return self._connection().execute(
+            "SELECT 1 FROM tiles WHERE zoom = ? AND x = ? AND y = ? AND server = ?", (zoom, x, y, server)
+        ).fetchone() is not None
+
+    def put(self, zoom, x, y, server, image):
+        """
+        Stores a tile, evicting least recently used tiles if the cache grows past max_bytes.
+        """
+        connection = self._connection()
+        with self._lock:
+            with connection:
+                previous = connection.execute(
+                    "SELECT size FROM tiles WHERE zoom = ? AND x = ? AND y = ? AND server = ?", (zoom, x, y, server)
+                ).fetchone()
+                connection.execute(
+                    "INSERT OR REPLACE INTO tiles (zoom, x, y, server, tile_image, size, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (zoom, x, y, server, image, len(image), time.time()),
+                )
+            self.total_bytes += len(image) - (previous[0] if previous else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict(connection)
+
+    def _evict(self, connection, batch=64):
+        """
+        Deletes the oldest tiles in batches until the cache fits its budget.
+        """
+        while self.total_bytes > self.max_bytes:
+            with connection:
+                rows = connection.execute(
+                    "SELECT rowid, size FROM tiles ORDER BY last_used LIMIT ?", (batch,)
+                ).fetchall()
+                if not rows:
+                    self.total_bytes = 0
+                    return
+                freed, doomed = 0, []
+                for rowid, size in rows:
+                    doomed.append((rowid,))
+                    freed += size
+                    if self.total_bytes - freed <= self.max_bytes:
+                        break
+                connection.executemany("DELETE FROM tiles WHERE rowid = ?", doomed)
+            self.total_bytes -= freed
+
+
+class TilePrefetcher:
+    """
+    Downloads the tiles around a location into a TileCache on background threads.
+
+    Only for tile servers that permit bulk downloads (see allows_bulk_download);
+    constructing one for any other server raises ValueError.
+    """
+
+    def __init__(self, cache, tile_server=DEFAULT_TILE_SERVER, fetch=fetch_tile, workers=4):
+        if not allows_bulk_download(tile_server):
+            raise ValueError(f"{urlsplit(tile_server).hostname} does not allow bulk tile downloads")
+        self.cache = cache
+        self.tile_server = tile_server
+        self.fetch = fetch
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tile-prefetch")
+
+    def tiles_around(self, lat, lon, zooms, radius):
+        """
+        Lists the (zoom, x, y) tiles within ``radius`` tiles of a coordinate at each zoom.
+        """
+        tiles = []
+        for zoom in zooms:
+            center_x, center_y = tile_for(lat, lon, zoom)
+            limit = 2 ** zoom
+            for x in range(center_x - radius, center_x + radius + 1):
+                for y in range(max(0, center_y - radius), min(limit, center_y + radius + 1)):
+                    tiles.append((zoom, x % limit, y))
+        return tiles
+
+    def prefetch_around(self, lat, lon, zooms=range(10, 15), radius=2):
+        """
+        Queues every missing tile around a coordinate for download.
+        :return: List of futures, one per queued tile, resolving to True when the tile was stored.
+        """
+        return [
+            self._executor.submit(self._fetch_one, zoom, x, y)
+            for zoom, x, y in self.tiles_around(lat, lon, zooms, radius)
+            if not self.cache.contains(zoom, x, y, self.tile_server)
+        ]
+
+    def _fetch_one(self, zoom, x, y):
+        try:
+            image = self.fetch(tile_url(self.tile_server, zoom, x, y))
+        except OSError:
+            return False
+        self.cache.put(zoom, x, y, self.tile_server, image)
+        return True
+
+    def shutdown(self):
+        """
+        Cancels queued downloads and stops the worker threads.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,205 @@
+import csv
+import os
+import struct
+import time
+from array import array
+from xml.sax.saxutils import escape
+
+from core.paths import DATA_DIR
+
+TRACK_MAGIC = b"SGTRACK2"
+_RECORD = struct.Struct("<dddB")  # timestamp, latitude, longitude, source code
+_LEGACY_MAGIC = b"SGTRACK1"
+_LEGACY_RECORD = struct.Struct("<ddd")  # version 1 logs carry no source
+# Where a fix came from; a record stores the position of its source in this tuple.
+TRACK_SOURCES = ("unknown", "ip", "manual", "cache")
+_READ_CHUNK = 4096  # records per read when streaming the log
+
+
+class TrackRecorder:
+    """
+    Records location fixes into a fixed-size in-memory ring buffer backed by a binary log.
+
+    The buffer holds the most recent ``capacity`` fixes in three preallocated
+    arrays, so memory stays constant however long a session runs. Fixes not yet
+    written are appended to the log as packed 25-byte records whenever
+    ``flush_interval`` seconds have passed, the buffer is about to overwrite
+    them, or flush() is called. Each fix is tagged with one of TRACK_SOURCES;
+    a log written by an older version is upgraded on the first flush.
+    """
+
+    def __init__(self, log_path=os.path.join(DATA_DIR, "track.bin"), capacity=4096, flush_interval=30.0):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.log_path = log_path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._latitudes = array("d", bytes(8 * capacity))
+        self._longitudes = array("d", bytes(8 * capacity))
+        self._sources = array("B", bytes(capacity))
+        self._next = 0
+        self._count = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._log_checked = False
+
+    def __len__(self):
+        return self._count
+
+    def append(self, coordinates, timestamp=None, source="unknown"):
+        """
+        Adds a fix to the ring buffer, flushing to the log when due.
+        :param coordinates: Tuple of (latitude, longitude).
+        :param timestamp: Epoch seconds of the fix; defaults to now.
+        :param source: One of TRACK_SOURCES.
+        """
+        if source not in TRACK_SOURCES:
+            raise ValueError(f"Unknown track source: {source}")
+        if self._pending == self.capacity:
+            self.flush()  # the next write would overwrite an unflushed fix
+        slot = self._next
+        self._timestamps[slot] = time.time() if timestamp is None else timestamp
+        self._latitudes[slot] = coordinates[0]
+        self._longitudes[slot] = coordinates[1]
+        self._sources[slot] = TRACK_SOURCES.index(source)
+        self._next = (slot + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self._pending += 1
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def recent(self, limit=None):
+        """
+        Returns buffered fixes, oldest first.
+        :param limit: Only return the newest ``limit`` fixes.
+        :return: List of (timestamp, latitude, longitude, source) tuples.
+        """
+        return [
+            (timestamp, latitude, longitude, TRACK_SOURCES[code])
+            for timestamp, latitude, longitude, code in self._recent_records(limit)
+        ]
+
+    def _recent_records(self, limit=None):
+        count = self._count if limit is None else min(limit, self._count)
+        start = (self._next - count) % self.capacity
+        slots = ((start + i) % self.capacity for i in range(count))
+        return [(self._timestamps[i], self._latitudes[i], self._longitudes[i], self._sources[i]) for i in slots]
+
+    def flush(self):
+        """
+        Appends every fix recorded since the last flush to the binary log.
+        :return: Number of records written.
+        """
+        pending = self._pending
+        if pending:
+            directory = os.path.dirname(self.log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if not self._log_checked:
+                _upgrade_log(self.log_path)
+                self._log_checked = True
+            new_file = not os.path.exists(self.log_path) or os.path.getsize(self.log_path) == 0
+            with open(self.log_path, "ab") as file:
+                if new_file:
+                    file.write(TRACK_MAGIC)
+                file.write(b"".join(_RECORD.pack(*fix) for fix in self._recent_records(pending)))
+            self._pending = 0
+        self._last_flush = time.monotonic()
+        return pending
+
+    def close(self):
+        """
+        Flushes any remaining fixes.
+        """
+        self.flush()
+
+
+def _upgrade_log(log_path):
+    """
+    Rewrites a version 1 log in the current format, tagging its fixes "unknown", so new records can be appended.
+    """
+    try:
+        with open(log_path, "rb") as file:
+            if file.read(len(_LEGACY_MAGIC)) != _LEGACY_MAGIC:
+                return
+    except FileNotFoundError:
+        return
+    tmp_path = log_path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(TRACK_MAGIC)
+        for fix in iter_track_log(log_path):
+            file.write(_RECORD.pack(*fix[:3], 0))
+    os.replace(tmp_path, log_path)
+
+
+def iter_track_log(log_path):
+    """
+    Streams fixes from a binary track log without loading it whole.
+    :param log_path: Path written by TrackRecorder.
+    :return: Generator of (timestamp, latitude, longitude, source) tuples.
+    """
+    with open(log_path, "rb") as file:
+        magic = file.read(len(TRACK_MAGIC))
+        if magic == TRACK_MAGIC:
+            record = _RECORD
+        elif magic == _LEGACY_MAGIC:
+            record = _LEGACY_RECORD
+        else:
+            raise ValueError(f"Not a track log: {log_path}")
+        while True:
+            chunk = file.read(record.size * _READ_CHUNK)
+            if not chunk:
+                return
+            usable = len(chunk) - len(chunk) % record.size  # ignore a torn trailing record
+            if record is _LEGACY_RECORD:
+                yield from (fix + ("unknown",) for fix in record.iter_unpack(chunk[:usable]))
+            else:
+                yield from (
+                    (timestamp, latitude, longitude, TRACK_SOURCES[code] if code < len(TRACK_SOURCES) else "unknown")
+                    for timestamp, latitude, longitude, code in record.iter_unpack(chunk[:usable])
+                )
+
+
+def export_csv(fixes, out_path):
+    """
+    Writes fixes to a CSV file one row at a time.
+    :param fixes: Iterable of (timestamp, latitude, longitude, source) tuples.
+    :param out_path: Destination path.
+    :return: Number of rows written.
+    """
+    count = 0
+    with open(out_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["timestamp", "latitude", "longitude", "source"])
+        for timestamp, latitude, longitude, source in fixes:
+            writer.writerow([_iso_time(timestamp), latitude, longitude, source])
+            count += 1
+    return count
+
+
+def export_gpx(fixes, out_path, name="SafeGuard track"):
+    """
+    Writes fixes to a GPX 1.1 track one point at a time.
+    :param fixes: Iterable of (timestamp, latitude, longitude, source) tuples.
+    :param out_path: Destination path.
+    :param name: Track name stored in the file.
+    :return: Number of points written.
+    """
+    count = 0
+    with open(out_path, "w", encoding="utf-8") as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                   '<gpx version="1.1" creator="SafeGuard" xmlns="http://www.topografix.com/GPX/1/1">\n'
+                   f"<trk><name>{escape(name)}</name><trkseg>\n")
+        for timestamp, latitude, longitude, source in fixes:
+            file.write(
+                f'<trkpt lat="{latitude:.6f}" lon="{longitude:.6f}"><time>{_iso_time(timestamp)}</time>'
+                f"<src>{escape(source)}</src></trkpt>\n"
+            )
+            count += 1
+        file.write("</trkseg></trk>\n</gpx>\n")
+    return count
+
+
+def _iso_time(timestamp):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
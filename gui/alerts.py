@@ -1,26 +1,89 @@
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from core.alert_feed import AlertFeed, AlertFeedWorker, NDJSONFileSource
+from core.alert_index import AlertIndex
+from core.content import ContentError, default_store
+from core.paths import DATA_DIR
+from core.search import default_search_index
+from gui.tk_async import after_future, drain_queue
+from gui.virtual_list import VirtualList
+
+ALL = "All"
+SEVERITY_STYLES = {"extreme": "danger", "severe": "danger", "moderate": "warning", "minor": "info"}
+ALERT_FEED_PATH = os.path.join(DATA_DIR, "alerts_feed.ndjson")
+PLACEHOLDER_ID = "none"
+
+
+def _build_alert_index(alerts):
+    """
+    Decodes every bundled alert once, on a worker thread, into a spatial index.
+    :return: (AlertIndex, dict of alert id -> position in ``alerts``).
+    """
+    index = AlertIndex()
+    order = {}
+    for position, alert in enumerate(alerts):
+        index.add(alert)
+        order[alert["id"]] = position
+    return index, order
+
+
+class AlertList:
+    """
+    The page's full alert list: bundled alerts, read lazily from the content store, followed by live feed alerts.
+    """
+
+    def __init__(self, bundled):
+        self.bundled = bundled
+        self.feed = []
+
+    def __len__(self):
+        return len(self.bundled) + len(self.feed)
+
+    def __getitem__(self, index):
+        bundled = len(self.bundled)
+        if index < 0:
+            index += bundled + len(self.feed)
+        return self.bundled[index] if index < bundled else self.feed[index - bundled]
+
 
 class AlertsPage:
     """
     Displays disaster alerts based on location.
+
+    Alerts from the bundled content are shown alongside a live NDJSON feed,
+    which is tailed on a background thread while the page is shown; only the
+    changes it reports are applied to the list. The unfiltered list reads
+    bundled alerts only as they scroll into view. The spatial index and the
+    filter menus are built on a worker thread; once ready, and when
+    ``get_location`` yields coordinates, only alerts whose area covers them
+    (or that have no area) are listed.
     """
-    def __init__(self, parent, on_back_callback):
+    def __init__(self, parent, on_back_callback, feed_path=ALERT_FEED_PATH, get_location=None):
         self.parent = parent
         self.on_back_callback = on_back_callback
-        self.alerts = self.load_alerts()
+        self.get_location = get_location
+        self.alerts = AlertList(self.load_alerts())
+        self._feed_positions = {}  # feed alert id -> position in self.alerts.feed
+        self.index = None  # AlertIndex over every alert, once built
+        self._bundled_order = {}
         self._setup_ui()
+        self._load_index()
+
+        self.feed_worker = AlertFeedWorker(AlertFeed(NDJSONFileSource(feed_path)))
+        self.feed_worker.add_listener(default_search_index().apply_alert_diff_async)
+        self.feed_worker.start()
+        drain_queue(self.parent, self.feed_worker.diffs, self.apply_diff)
 
     def load_alerts(self):
         """
-        Loads disaster alerts from a JSON file.
+        Loads disaster alerts from the shared content store.
         """
         try:
-            with open("assets/data/disaster_alerts.json", "r") as file:
-                return json.load(file)["alerts"]
-        except FileNotFoundError:
-            return ["No alerts available."]
+            return default_store().records("alerts")
+        except ContentError:
+            return [{"id": PLACEHOLDER_ID, "text": "No alerts available.", "severity": None, "region": None, "area": None}]
 
     def _setup_ui(self):
         """
@@ -30,29 +93,164 @@ class AlertsPage:
         self.title_label = ttk.Label(self.parent, text="Disaster Alerts", font=("Arial", 16, "bold"), bootstyle="inverse-danger")
         self.title_label.pack(pady=10)
 
-        # Alert List
-        self.alert_labels = []
-        for alert in self.alerts:
-            alert_label = ttk.Label(self.parent, text=alert, wraplength=350, bootstyle="danger")
-            alert_label.pack(fill=X, pady=5)
-            self.alert_labels.append(alert_label)
+        # Filters
+        filter_frame = ttk.Frame(self.parent)
+        filter_frame.pack(fill=X, padx=10)
+        self.severity_filter = ttk.Combobox(filter_frame, values=[ALL], state="readonly", width=12)
+        self.severity_filter.set(ALL)
+        self.severity_filter.pack(side=LEFT, padx=5)
+        self.region_filter = ttk.Combobox(filter_frame, values=[ALL], state="readonly", width=18)
+        self.region_filter.set(ALL)
+        self.region_filter.pack(side=LEFT, padx=5)
+        for combobox in (self.severity_filter, self.region_filter):
+            combobox.bind("<<ComboboxSelected>>", lambda event: self.apply_filters())
+
+        # Alert List: only the rows in view exist as widgets
+        self.alert_list = VirtualList(self.parent, self._render_alert)
+        self.alert_list.pack(fill=BOTH, expand=True, padx=10, pady=5)
+        self.apply_filters()
 
         # Navigation
         self.back_button = ttk.Button(self.parent, text="Back", bootstyle="outline-secondary", command=self.on_back)
         self.back_button.pack(pady=10)
 
-    def on_back(self):
+    def _load_index(self):
         """
-        Handles the back button click event.
+        Starts indexing the bundled alerts on a worker thread.
         """
-        self._clear_screen()
-        self.on_back_callback()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-index")
+        future = executor.submit(_build_alert_index, self.alerts.bundled)
+        executor.shutdown(wait=False)
+        after_future(self.parent, future, self._on_index_ready)
+
+    def _on_index_ready(self, built):
+        """
+        Adds the feed alerts received meanwhile to the new index and enables filtering.
+        """
+        if not self.parent.winfo_exists():
+            return
+        self.index, self._bundled_order = built
+        if self.alerts.bundled == []:  # the placeholder was dropped while indexing
+            self.index.remove(PLACEHOLDER_ID)
+        for alert in self.alerts.feed:
+            self.index.add(alert)
+        self._update_filter_choices()
+        self.apply_filters(keep_position=True)
+
+    def _display_order(self, alert):
+        """
+        Sort key keeping filtered alerts in list order: bundled alerts first, then the feed.
+        """
+        position = self._bundled_order.get(alert["id"])
+        if position is None:
+            return len(self._bundled_order) + self._feed_positions.get(alert["id"], 0)
+        return position
+
+    def _render_alert(self, label, alert):
+        """
+        Fills a pooled row label with one alert.
+        """
+        prefix = f"[{alert['severity'].upper()}] " if alert["severity"] else ""
+        suffix = f" ({alert['region']})" if alert["region"] else ""
+        style = SEVERITY_STYLES.get((alert["severity"] or "").lower(), "danger")
+        label.config(text=f"{prefix}{alert['text']}{suffix}", bootstyle=style)
+
+    def apply_diff(self, diff):
+        """
+        Applies one feed update: appends new alerts, replaces changed ones and drops expired ones.
+
+        Additions and updates cost O(changes); removals compact the feed's part of the list.
+        :param diff: Dict with "added", "updated" and "removed" from AlertFeed.poll.
+        """
+        feed = self.alerts.feed
+        for alert in diff["added"] + diff["updated"]:
+            if self.index is not None:
+                self.index.add(alert)
+            position = self._feed_positions.get(alert["id"])
+            if position is None:
+                self._feed_positions[alert["id"]] = len(feed)
+                feed.append(alert)
+            else:
+                feed[position] = alert
+        removed = set(diff["removed"])
+        if diff["added"] and self._showing_placeholder():
+            self.alerts.bundled = []
+            removed.add(PLACEHOLDER_ID)
+        if removed:
+            if self.index is not None:
+                for alert_id in removed:
+                    self.index.remove(alert_id)
+            self.alerts.feed = [alert for alert in feed if alert["id"] not in removed]
+            self._feed_positions = {alert["id"]: index for index, alert in enumerate(self.alerts.feed)}
+
+        if self.index is not None:
+            self._update_filter_choices()
+        unfiltered = self.severity_filter.get() == ALL and self.region_filter.get() == ALL
+        if unfiltered and self._location() is None and not removed:
+            self.alert_list.refresh()
+        else:
+            self.apply_filters(keep_position=True)
+
+    def _showing_placeholder(self):
+        bundled = self.alerts.bundled
+        return isinstance(bundled, list) and len(bundled) == 1 and bundled[0]["id"] == PLACEHOLDER_ID
+
+    def _update_filter_choices(self):
+        """
+        Offers the severities and regions of the indexed alerts in the filter menus.
+        """
+        for combobox, field in ((self.severity_filter, "severity"), (self.region_filter, "region")):
+            values = [ALL] + self.index.choices(field)
+            if list(combobox.cget("values")) != values:
+                combobox.config(values=values)
+
+    def _location(self):
+        """
+        Returns the user's (latitude, longitude), or None while it is unknown.
+        """
+        location = self.get_location() if self.get_location is not None else None
+        return tuple(location[:2]) if location else None
+
+    def apply_filters(self, keep_position=False):
+        """
+        Shows only the alerts affecting the user's location that match the selected severity and region.
+        :param keep_position: Keep the scroll position instead of returning to the top.
+        """
+        severity, region = self.severity_filter.get(), self.region_filter.get()
+        location = self._location()
+        if self.index is None or (location is None and severity == ALL and region == ALL):
+            items = self.alerts  # read lazily; filtering waits for the index
+        else:
+            # The spatial index narrows the list to nearby alerts; keep list order for display.
+            items = self.index.query(*location) if location is not None else self.index.alerts.values()
+            items = sorted(
+                (
+                    alert for alert in items
+                    if (severity == ALL or alert["severity"] == severity) and (region == ALL or alert["region"] == region)
+                ),
+                key=self._display_order,
+            )
+        if keep_position:
+            self.alert_list.items = items
+            self.alert_list.refresh()
+        else:
+            self.alert_list.set_items(items)
+
+    def on_show(self):
+        """
+        Resumes the feed and re-applies the location filter, since the user may have moved since the last visit.
+        """
+        self.feed_worker.start()
+        self.apply_filters(keep_position=True)
 
-    def _clear_screen(self):
+    def on_hide(self):
         """
-        Clears all widgets from the screen.
+        Stops tailing the feed while the page is off screen; on_show resumes it.
         """
-        self.title_label.destroy()
-        for label in self.alert_labels:
-            label.destroy()
-        self.back_button.destroy()
\ No newline at end of file
+        self.feed_worker.stop()
+
+    def on_back(self):
+        """
+        Handles the back button click event.
+        """
+        self.on_back_callback()
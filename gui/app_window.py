@@ -1,16 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from safeguard.gui.quiz_module import QuizModule
-from safeguard.gui.alerts import AlertsPage
-from safeguard.gui.resource_center import ResourceCenterPage
-from safeguard.gui.interactive_map import InteractiveMapPage
-from safeguard.core.gps import GPSTracker
-from safeguard.gui.disaster_slideshow import DisasterSlideshow
+from core.gps import GPSTracker
+from gui.tk_async import after_future
+from gui.page_manager import PageManager, load_class
+
+# Page classes are imported on first navigation, keeping them out of cold start.
+DISASTER_SLIDESHOW = "gui.disaster_slideshow:DisasterSlideshow"
+ALERTS_PAGE = "gui.alerts:AlertsPage"
+RESOURCE_CENTER_PAGE = "gui.resource_center:ResourceCenterPage"
+QUIZ_MODULE = "gui.quiz_module:QuizModule"
+INTERACTIVE_MAP_PAGE = "gui.interactive_map:InteractiveMapPage"
+SEARCH_PAGE = "gui.search_page:SearchPage"
+
+# Emergency numbers are looked up here: the first lookup opens and migrates the contacts database.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="emergency-number")
 
 
 class AppWindow:
     """
     Main window for the emergency preparedness app.
+
+    The content store, search index and contacts database are imported and
+    opened only once the menu is up; the emergency number is looked up on a
+    worker thread, first for the last known country and again once the
+    location is resolved.
     """
 
     def __init__(self, root):
@@ -21,54 +35,149 @@ class AppWindow:
 
         # GPS Tracker
         self.gps_tracker = GPSTracker()
+        last_fix = self.gps_tracker.cache.load()
+        self.country = last_fix.get("country") if last_fix else None
 
-        # Emergency Contact
-        self.emergency_number = self.get_emergency_number()
+        # Emergency Contact: start from the last known country and refine it once the location arrives
+        self.emergency_number = None
+        self.emergency_label = None
 
-        # UI Setup
-        self._setup_main_menu()
+        # UI Setup: every screen is built on first visit and kept for later ones
+        self.pages = PageManager(self.root)
+        self.pages.register("main", self._setup_main_menu)
+        self.pages.register("more", self._setup_more_menu)
+        self.pages.register("slideshow", lambda frame: load_class(DISASTER_SLIDESHOW)(frame, self.show_main_menu))
+        self.pages.register(
+            "alerts",
+            lambda frame: load_class(ALERTS_PAGE)(
+                frame, self.show_main_menu, get_location=lambda: self.gps_tracker.last_coordinates
+            ),
+        )
+        self.pages.register("resources", lambda frame: load_class(RESOURCE_CENTER_PAGE)(frame, self.show_main_menu))
+        self.pages.register("quiz", lambda frame: load_class(QUIZ_MODULE)(frame, self.show_main_menu))
+        self.pages.register(
+            "map",
+            lambda frame: load_class(INTERACTIVE_MAP_PAGE)(
+                frame, self.show_main_menu, country=self.country, get_location=lambda: self.gps_tracker.last_coordinates
+            ),
+        )
+        self.pages.register(
+            "search", lambda frame: load_class(SEARCH_PAGE)(frame, self.show_main_menu, on_open=self.open_search_result)
+        )
+        self.show_main_menu()
+        self._lookup_emergency_number(self.country)
+        self.root.after_idle(self._preload_content)  # parse page content once the menu is up
+        self.root.after_idle(self._start_search_index)
+        after_future(self.root, self.gps_tracker.locate_async(), self._on_location_resolved)
 
     def get_emergency_number(self):
         """
         Fetches the emergency number based on the user's current GPS location.
+
+        This blocks on the geolocation lookup; the window itself uses the
+        background lookup started in __init__ instead.
         :return: Emergency number for the detected location.
         """
-        country_emergency_numbers = {
-            "India": "112",
-            "United States": "911",
-            "United Kingdom": "999",
-            "Australia": "000",
-            "Canada": "911",
-        }
+        from core.contacts import default_resolver
+
         coordinates = self.gps_tracker.get_coordinates()
         if coordinates:
-            country = self.gps_tracker.g.country
-            return country_emergency_numbers.get(country, "112")  # Default to "112" if country not found
-        else:
-            return "112"  # Default to "112" if GPS fails
+            self.country = self.gps_tracker.country
+        # Falls back to the global default when GPS fails or the country is unknown
+        return default_resolver().emergency_number(self.country)
+
+    def _lookup_emergency_number(self, country):
+        """
+        Resolves the emergency number for a country on the worker thread, then shows it.
+
+        If the contacts database cannot be read, the global default number is shown instead.
+        """
+        def lookup():
+            from assets.data.init_contacts import global_emergency_number
+            from core.contacts import default_resolver
+
+            try:
+                return country, default_resolver().emergency_number(country)
+            except Exception as e:
+                print(f"Error looking up emergency number: {e}")
+                return country, global_emergency_number
+
+        after_future(self.root, _executor.submit(lookup), self._on_emergency_number)
+
+    def _on_emergency_number(self, result):
+        """
+        Shows a looked-up emergency number, unless the country changed since the lookup started.
+        :param result: (country, number) tuple from _lookup_emergency_number.
+        """
+        country, number = result
+        if country != self.country:
+            return
+        self.emergency_number = number
+        if self.emergency_label is not None and self.emergency_label.winfo_exists():
+            self.emergency_label.config(text=self._emergency_number_text())
+
+    def _emergency_number_text(self):
+        number = self.emergency_number if self.emergency_number is not None else "..."
+        return f"Emergency Number: {number}"
+
+    def _preload_content(self):
+        """
+        Parses the page content once the menu is up, so page visits never touch the disk.
+        """
+        from core.content import default_store
+
+        default_store().preload()
+
+    def _start_search_index(self):
+        """
+        Brings the search index up to date with the content files in the background, then follows hot reloads.
+        """
+        from core.content import default_store
+        from core.search import default_search_index
+
+        index = default_search_index()
+        index.sync_async(default_store())
+        index.watch(default_store())
+
+    def _on_location_resolved(self, result):
+        """
+        Updates the emergency number once the background geolocation lookup finishes.
+        :param result: (coordinates, country) tuple from GPSTracker.locate_async.
+        """
+        coordinates, country = result
+        if not coordinates:
+            return
+        if country != self.country:
+            self.country = country
+            self._lookup_emergency_number(country)
+        map_page = self.pages.get("map")
+        if map_page is not None:
+            map_page.set_country(country)
 
-    def _setup_main_menu(self):
+    def _setup_main_menu(self, parent):
         """
         Sets up the main menu UI.
+        :param parent: Frame the menu is built into.
         """
         # Title
         ttk.Label(
-            self.root,
+            parent,
             text="SafeGuard",
             font=("Arial", 20, "bold"),
             bootstyle="inverse-primary",
         ).pack(fill=X, pady=20)
 
         # Emergency Number
-        ttk.Label(
-            self.root,
-            text=f"Emergency Number: {self.emergency_number}",
+        self.emergency_label = ttk.Label(
+            parent,
+            text=self._emergency_number_text(),
             font=("Arial", 12),
             bootstyle="inverse-danger",
-        ).pack(pady=10)
+        )
+        self.emergency_label.pack(pady=10)
 
         # Menu Buttons
-        menu_frame = ttk.Frame(self.root, padding=20)
+        menu_frame = ttk.Frame(parent, padding=20)
         menu_frame.pack(fill=BOTH, expand=True)
 
         ttk.Button(
@@ -85,11 +194,18 @@ class AppWindow:
             command=self.show_alerts,
         ).pack(fill=X, pady=10)
 
+        ttk.Button(
+            menu_frame,
+            text="Search",
+            bootstyle="outline-primary",
+            command=self.show_search,
+        ).pack(fill=X, pady=10)
+
         ttk.Button(
             menu_frame,
             text="More",
             bootstyle="outline-info",
-            command=self._setup_more_menu,
+            command=self.show_more_menu,
         ).pack(fill=X, pady=10)
 
         ttk.Button(
@@ -99,22 +215,21 @@ class AppWindow:
             command=self.root.quit,
         ).pack(fill=X, pady=10)
 
-    def _setup_more_menu(self):
+    def _setup_more_menu(self, parent):
         """
         Sets up the more menu UI.
+        :param parent: Frame the menu is built into.
         """
-        self._clear_screen()
-
         # Title
         ttk.Label(
-            self.root,
+            parent,
             text="More Options",
             font=("Arial", 20, "bold"),
             bootstyle="inverse-primary",
         ).pack(fill=X, pady=20)
 
         # Menu Buttons
-        menu_frame = ttk.Frame(self.root, padding=20)
+        menu_frame = ttk.Frame(parent, padding=20)
         menu_frame.pack(fill=BOTH, expand=True)
 
         ttk.Button(
@@ -142,50 +257,72 @@ class AppWindow:
             menu_frame,
             text="Back",
             bootstyle="outline-secondary",
-            command=self._setup_main_menu,
+            command=self.show_main_menu,
         ).pack(fill=X, pady=10)
 
+    def show_main_menu(self):
+        """
+        Displays the main menu.
+        """
+        self.pages.show("main")
+
+    def show_more_menu(self):
+        """
+        Displays the more menu.
+        """
+        self.pages.show("more")
+
     def show_disaster_slideshow(self):
         """
         Displays the disaster slideshow.
         """
-        self._clear_screen()
-        DisasterSlideshow(self.root, self._setup_main_menu)
+        self.pages.show("slideshow")
+
     def show_alerts(self):
         """
         Displays the disaster alerts page.
         """
-        self._clear_screen()
-        AlertsPage(self.root, self._setup_main_menu)
+        self.pages.show("alerts")
 
     def show_resource_center(self):
         """
         Displays the resource center page.
         """
-        self._clear_screen()
-        ResourceCenterPage(self.root, self._setup_main_menu)
+        self.pages.show("resources")
 
     def show_quiz(self):
         """
         Displays the quiz module.
         """
-        self._clear_screen()
-        QuizModule(self.root, self._setup_main_menu)
+        self.pages.show("quiz")
 
     def show_interactive_map(self):
         """
         Displays the interactive map page.
         """
-        self._clear_screen()
-        InteractiveMapPage(self.root, self._setup_main_menu)
+        self.pages.show("map")
 
-    def _clear_screen(self):
+    def show_search(self):
         """
-        Clears all widgets from the screen.
+        Displays the search page.
         """
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.pages.show("search")
 
+    def open_search_result(self, kind, ref):
+        """
+        Shows the page holding a search result.
+        :param kind: Result kind, an indexed asset name or "feed" for live alerts.
+        :param ref: Position or key of the item within its page.
+        """
+        if kind == "instructions":
+            self.show_disaster_slideshow()
+            self.pages.get("slideshow").show_slide(int(ref))
+        elif kind == "resources":
+            self.show_resource_center()
+        elif kind == "questions":
+            self.show_quiz()
+        else:
+            self.show_alerts()
 
 if __name__ == "__main__":
     root = ttk.Window(themename="cosmo")  # Modern bootstrap theme
@@ -1,6 +1,6 @@
-import json
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
+from core.content import ContentError, default_store
 
 class DisasterSlideshow:
     """
@@ -16,14 +16,13 @@ class DisasterSlideshow:
 
     def load_disaster_data(self):
         """
-        Loads disaster instructions from a JSON file.
+        Loads disaster instructions from the shared content store.
 
-        :return: List of instructions.
+        :return: Sequence of instructions, each read when it is shown.
         """
         try:
-            with open(r"C:\Users\sibia\PycharmProjects\codessey\assets\data\disaster_info.json", "r") as file:
-                return json.load(file)["instructions"]
-        except (FileNotFoundError, KeyError):
+            return default_store().records("instructions")
+        except ContentError:
             return ["Error loading disaster data. Please check the file."]
 
     def _setup_ui(self):
@@ -49,9 +48,22 @@ class DisasterSlideshow:
         self.next_button = ttk.Button(button_frame, text="Next", bootstyle="success", command=self.next_slide)
         self.next_button.pack(side=LEFT, padx=5)
 
-        self.parent.bind("<Left>", lambda event: self.previous_slide())
-        self.parent.bind("<Right>", lambda event: self.next_slide())
-        self.parent.bind("<Return>", lambda event: self.next_slide())
+    def on_show(self):
+        """
+        Binds the slideshow's keyboard shortcuts while it is on screen.
+        """
+        window = self.parent.winfo_toplevel()
+        window.bind("<Left>", lambda event: self.previous_slide())
+        window.bind("<Right>", lambda event: self.next_slide())
+        window.bind("<Return>", lambda event: self.next_slide())
+
+    def on_hide(self):
+        """
+        Releases the keyboard shortcuts so they do not fire on other screens.
+        """
+        window = self.parent.winfo_toplevel()
+        for sequence in ("<Left>", "<Right>", "<Return>"):
+            window.unbind(sequence)
 
     def update_text_area(self):
         """
@@ -62,6 +74,13 @@ class DisasterSlideshow:
         self.text_area.insert(END, self.instructions[self.current_index])
         self.text_area.config(state=DISABLED)
 
+    def show_slide(self, index):
+        """
+        Jumps to a slide by position, such as one picked from search results.
+        """
+        self.current_index = index % len(self.instructions)
+        self.update_text_area()
+
     def previous_slide(self):
         """
         Navigates to the previous slide, looping to the end if at the beginning.
@@ -80,13 +99,4 @@ class DisasterSlideshow:
         """
         Handles the back button click event.
         """
-        self._clear_screen()
         self.on_back_callback()
-
-    def _clear_screen(self):
-        """
-        Clears all widgets from the screen.
-        """
-
-        for widget in self.parent.winfo_children():
-            widget.destroy()
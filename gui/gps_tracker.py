@@ -1,6 +1,9 @@
+import os
 import tkinter as tk
 from tkinter import ttk
 from core.gps import GPSTracker
+from core.paths import DATA_DIR
+from core.track import TrackRecorder, export_gpx, iter_track_log
 
 
 class GPSTrackerPage:
@@ -31,6 +34,13 @@ class GPSTrackerPage:
         export_button = ttk.Button(self.parent, text="Export Location", command=self.export_location)
         export_button.pack(pady=10)
 
+        # Track Recording
+        self.record_button = ttk.Button(self.parent, text="Start Recording", command=self.toggle_recording)
+        self.record_button.pack(pady=10)
+
+        export_track_button = ttk.Button(self.parent, text="Export Track (GPX)", command=self.export_track)
+        export_track_button.pack(pady=10)
+
     def fetch_location(self):
         """
         Fetches the current GPS location and updates the label.
@@ -53,3 +63,27 @@ class GPSTrackerPage:
             tk.messagebox.showinfo("Success", "Location exported successfully.")
         else:
             tk.messagebox.showerror("Error", "Unable to fetch location.")
+
+    def toggle_recording(self):
+        """
+        Starts or stops recording fetched locations into the track log.
+        """
+        if self.gps_tracker.track is None:
+            self.gps_tracker.start_recording(TrackRecorder())
+            self.record_button.config(text="Stop Recording")
+        else:
+            self.gps_tracker.stop_recording()
+            self.record_button.config(text="Start Recording")
+
+    def export_track(self, out_path=os.path.join(DATA_DIR, "track.gpx")):
+        """
+        Streams the recorded track log to a GPX file.
+        """
+        recorder = self.gps_tracker.track or TrackRecorder()
+        recorder.flush()
+        try:
+            count = export_gpx(iter_track_log(recorder.log_path), out_path)
+        except FileNotFoundError:
+            tk.messagebox.showerror("Error", "No track has been recorded yet.")
+            return
+        tk.messagebox.showinfo("Success", f"Exported {count} track points to {out_path}.")
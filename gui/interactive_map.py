@@ -1,44 +1,308 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageTk
 from tkintermapview import TkinterMapView
 import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from core.contacts import default_resolver
+from core.content import ContentError, default_store
+from core.facility_index import FacilityIndex
+from core.marker_clusters import MarkerClusterer
+from core.tile_cache import DEFAULT_TILE_SERVER, TileCache, TilePrefetcher, allows_bulk_download, fetch_tile, tile_url
+from gui.marker_layer import MarkerLayer
+from gui.tk_async import after_future
+
+DEFAULT_POSITION = (13.0827, 80.2707)  # Chennai, India
+DEFAULT_ZOOM = 10
+NEAREST_COUNT = 10
+NEAREST_MAX_KM = 50  # farther facilities are no help in an emergency
+PAN_POLL_MS = 250
+PAN_THRESHOLD = 0.002  # degrees the map centre must move before re-querying
+KIND_COLORS = {
+    "hospital": "#d9534f",
+    "shelter": "#5cb85c",
+    "fire_station": "#f0ad4e",
+    "police": "#0275d8",
+}
+CLUSTER_COLOR = "#5bc0de"
+
+
+def _build_facility_indexes():
+    """
+    Loads the facilities asset into a FacilityIndex and a MarkerClusterer.
+    :return: (index, clusterer), or None if the asset is unavailable.
+    """
+    try:
+        facilities = default_store().facilities()
+    except ContentError as e:
+        print(f"Error loading facilities: {e}")
+        return None
+    return FacilityIndex(facilities), MarkerClusterer([(f["lat"], f["lon"]) for f in facilities])
+
+
+def _facility_name(facility):
+    """
+    A facility's display name, marking made-up sample entries as demo data.
+    """
+    return f"{facility['name']} (demo data)" if facility.get("sample") else facility["name"]
+
+
+def _facility_marker(facility):
+    color = KIND_COLORS[facility["kind"]]
+    options = {"marker_color_circle": "white", "marker_color_outside": color, "text_color": color}
+    return facility["lat"], facility["lon"], _facility_name(facility), options
+
+
+class CachedMapView(TkinterMapView):
+    """
+    Map widget that reads and writes tiles through a persistent TileCache.
+
+    In offline mode only cached tiles are drawn and missing ones stay blank,
+    so the map never waits on the network.
+    """
+    def __init__(self, *args, tile_cache, tile_server=DEFAULT_TILE_SERVER, offline=False, **kwargs):
+        # Set before the base constructor, which starts tile-loading threads
+        self.tile_cache = tile_cache
+        self.offline = offline
+        super().__init__(*args, **kwargs)
+        self.set_tile_server(tile_server)
+
+    def request_image(self, zoom, x, y, db_cursor=None):
+        """
+        Loads one tile from the cache, falling back to the tile server unless offline.
+        """
+        image = self.tile_cache.get(zoom, x, y, self.tile_server)
+        if image is None:
+            if self.offline:
+                return self.empty_tile_image
+            try:
+                image = fetch_tile(tile_url(self.tile_server, zoom, x, y))
+            except OSError:
+                return self.empty_tile_image
+            self.tile_cache.put(zoom, x, y, self.tile_server, image)
+        if not self.running:
+            return self.empty_tile_image
+        try:
+            image_tk = ImageTk.PhotoImage(Image.open(io.BytesIO(image)))
+        except (OSError, ValueError):
+            return self.empty_tile_image
+        self.tile_image_cache[f"{zoom}{x}{y}"] = image_tk
+        return image_tk
+
 
 class InteractiveMapPage:
     """
     Displays an interactive map for locating nearby facilities and shows emergency contact information.
+
+    Tiles come from an on-disk cache. With ``prefetch_radius`` set, and a
+    tile server whose usage policy allows bulk downloads, tiles around the
+    user's last known location are also prefetched in the background for a
+    few zoom levels; by default only the tiles in view are downloaded.
+
+    The nearest facilities within NEAREST_MAX_KM of the user, and afterwards
+    of the map centre as it is panned, are looked up in a FacilityIndex;
+    sample entries are labelled as demo data. "Show all facilities" draws
+    every facility in view through a MarkerClusterer instead. Both go through
+    MarkerLayers, which redraw only markers that changed, a batch per
+    event-loop turn, so large datasets never stall the UI.
     """
-    def __init__(self, parent, on_back_callback):
+    def __init__(self, parent, on_back_callback, country=None, get_location=None, tile_cache=None,
+                 tile_server=DEFAULT_TILE_SERVER, prefetch_radius=0):
         self.parent = parent
         self.on_back_callback = on_back_callback
+        self.country = country
+        self.get_location = get_location
+        self.tile_cache = tile_cache or TileCache()
+        self.tile_server = tile_server
+        self.prefetch_radius = prefetch_radius
+        self.prefetcher = None
+        self.offline = ttk.BooleanVar(value=False)
+        self.show_all = ttk.BooleanVar(value=False)
+        self.facility_index = None
+        self.clusterer = None
+        self._index_future = None
+        self._query_center = None
+        self._view = None
+        self._watch_job = None
         self._setup_ui()
+        self.nearest_layer = MarkerLayer(self.map_view)
+        self.cluster_layer = MarkerLayer(self.map_view)
 
     def _setup_ui(self):
         """
         Sets up the interactive map UI.
         """
         # Map View
-        self.map_view = TkinterMapView(self.parent, width=375, height=500, corner_radius=0)
+        self.map_view = CachedMapView(self.parent, width=375, height=440, corner_radius=0, tile_cache=self.tile_cache, tile_server=self.tile_server)
         self.map_view.pack(pady=10)
-        self.map_view.set_position(13.0827, 80.2707)  # Default: Chennai, India
-        self.map_view.set_zoom(10)
+        self.map_view.set_position(*self._position())
+        self.map_view.set_zoom(DEFAULT_ZOOM)
 
         # Emergency Contact
-        self.emergency_contact_label = ttk.Label(self.parent, text="Emergency Contact: 112", font=("Arial", 12, "bold"), bootstyle="danger")
-        self.emergency_contact_label.pack(pady=10)
+        self.emergency_contact_label = ttk.Label(self.parent, text=self._emergency_contact_text(), font=("Arial", 12, "bold"), bootstyle="danger")
+        self.emergency_contact_label.pack(pady=(5, 0))
+        self.nearest_label = ttk.Label(self.parent, text="", font=("Arial", 10))
+        self.nearest_label.pack(pady=5)
+
+        # Controls
+        controls = ttk.Frame(self.parent)
+        controls.pack(pady=5)
+        ttk.Checkbutton(controls, text="Offline mode", variable=self.offline, command=self.toggle_offline, bootstyle="round-toggle").pack(side=LEFT, padx=5)
+        ttk.Checkbutton(controls, text="All facilities", variable=self.show_all, command=self.toggle_show_all, bootstyle="round-toggle").pack(side=LEFT, padx=5)
 
         # Navigation
-        self.back_button = ttk.Button(self.parent, text="Back", bootstyle="outline-secondary", command=self.on_back)
-        self.back_button.pack(pady=10)
+        self.back_button = ttk.Button(controls, text="Back", bootstyle="outline-secondary", command=self.on_back)
+        self.back_button.pack(side=LEFT, padx=5)
 
-    def on_back(self):
+    def _position(self):
         """
-        Handles the back button click event.
+        Returns the user's last known (latitude, longitude), or the default position.
         """
-        self._clear_screen()
-        self.on_back_callback()
+        location = self.get_location() if self.get_location is not None else None
+        return tuple(location[:2]) if location else DEFAULT_POSITION
+
+    def prefetch(self):
+        """
+        Starts downloading the tiles around the user's position, if area prefetch is on and the tile server allows it.
+        """
+        if self.offline.get() or self.prefetch_radius <= 0 or not allows_bulk_download(self.tile_server):
+            return
+        if self.prefetcher is None:
+            self.prefetcher = TilePrefetcher(self.tile_cache, tile_server=self.tile_server)
+        zoom = DEFAULT_ZOOM
+        self.prefetcher.prefetch_around(*self._position(), zooms=range(zoom - 2, zoom + 3), radius=self.prefetch_radius)
+
+    def toggle_offline(self):
+        """
+        Switches between serving cached tiles only and fetching missing ones.
+        """
+        self.map_view.offline = self.offline.get()
+        if not self.offline.get():
+            self.prefetch()
 
-    def _clear_screen(self):
+    def _load_index(self):
         """
-        Clears all widgets from the screen.
+        Starts building the facility index on a worker thread; large datasets take seconds.
         """
-        self.map_view.destroy()
-        self.emergency_contact_label.destroy()
-        self.back_button.destroy()
\ No newline at end of file
+        if self._index_future is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="facility-index")
+            self._index_future = executor.submit(_build_facility_indexes)
+            executor.shutdown(wait=False)
+            after_future(self.parent, self._index_future, self._on_index_ready)
+
+    def _on_index_ready(self, indexes):
+        if indexes is None:
+            return
+        self.facility_index, self.clusterer = indexes
+        if self._query_center is not None:
+            self.show_nearest(*self._query_center)
+        self.refresh_clusters()
+
+    def show_nearest(self, lat, lon):
+        """
+        Places markers for the facilities nearest to a coordinate, up to NEAREST_MAX_KM away, replacing the previous set.
+        """
+        self._query_center = (lat, lon)
+        index = self.facility_index
+        if index is None:
+            self._load_index()
+            return
+        results = index.nearest(lat, lon, k=NEAREST_COUNT, max_km=NEAREST_MAX_KM)
+        if not self.show_all.get():
+            self.nearest_layer.show({(f["name"], f["lat"], f["lon"]): _facility_marker(f) for _, f in results})
+        if results:
+            distance, facility = results[0]
+            self.nearest_label.config(text=f"Nearest: {_facility_name(facility)} ({distance:.1f} km)")
+        else:
+            self.nearest_label.config(text=f"No known facilities within {NEAREST_MAX_KM} km")
+
+    def _viewport(self):
+        """
+        Returns the map's integer zoom and visible area in world coordinates (see core.marker_clusters).
+        """
+        zoom = round(self.map_view.zoom)
+        scale = 2 ** zoom
+        (left, top), (right, bottom) = self.map_view.upper_left_tile_pos, self.map_view.lower_right_tile_pos
+        if right - left >= scale:
+            return zoom, (0.0, top / scale, 1.0, bottom / scale)
+        return zoom, ((left / scale) % 1.0, top / scale, (right / scale) % 1.0, bottom / scale)
+
+    def refresh_clusters(self):
+        """
+        Redraws the facility clusters in view, if "All facilities" is on.
+        """
+        if not self.show_all.get() or self.clusterer is None:
+            return
+        zoom, viewport = self._viewport()
+        markers = {}
+        facilities = self.facility_index.facilities
+        for key, lat, lon, count, index in self.clusterer.clusters(zoom, viewport):
+            if index is not None:
+                markers[key] = _facility_marker(facilities[index])
+            else:
+                options = {"marker_color_circle": "white", "marker_color_outside": CLUSTER_COLOR, "text_color": "#333333"}
+                markers[key] = (lat, lon, str(count), options)
+        self.cluster_layer.show(markers)
+
+    def toggle_show_all(self):
+        """
+        Switches between markers for the nearest facilities and clusters of every facility in view.
+        """
+        if self.show_all.get():
+            self.nearest_layer.clear()
+            self.refresh_clusters()
+        else:
+            self.cluster_layer.clear()
+            if self._query_center is not None:
+                self.show_nearest(*self._query_center)
+
+    def _watch_position(self):
+        """
+        Re-queries the nearest facilities when the map centre moved far enough, and re-clusters on any pan or zoom.
+        """
+        lat, lon = self.map_view.get_position()
+        if self._query_center is None or max(abs(lat - self._query_center[0]), abs(lon - self._query_center[1])) > PAN_THRESHOLD:
+            self.show_nearest(lat, lon)
+        view = self._viewport()
+        if view != self._view:
+            self._view = view
+            self.refresh_clusters()
+        self._watch_job = self.parent.after(PAN_POLL_MS, self._watch_position)
+
+    def _emergency_contact_text(self):
+        return f"Emergency Contact: {default_resolver().emergency_number(self.country)}"
+
+    def set_country(self, country):
+        """
+        Updates the emergency contact shown for a newly detected country.
+        """
+        self.country = country
+        self.emergency_contact_label.config(text=self._emergency_contact_text())
+
+    def on_show(self):
+        """
+        Recentres on the latest location, prefetches around it and starts following map pans.
+        """
+        position = self._position()
+        self.map_view.set_position(*position)
+        self.prefetch()
+        self.show_nearest(*position)
+        if self._watch_job is None:
+            self._watch_job = self.parent.after(PAN_POLL_MS, self._watch_position)
+
+    def on_hide(self):
+        """
+        Stops following map pans and prefetching while the page is not visible.
+        """
+        if self._watch_job is not None:
+            self.parent.after_cancel(self._watch_job)
+            self._watch_job = None
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
+            self.prefetcher = None
+
+    def on_back(self):
+        """
+        Handles the back button click event.
+        """
+        self.on_back_callback()
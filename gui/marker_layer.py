@@ -0,0 +1,44 @@
+class MarkerLayer:
+    """
+    Set of map markers that is updated by diffing keys instead of redrawing everything.
+
+    show() removes markers whose key disappeared and queues the new ones, which
+    are drawn ``batch_size`` per event-loop turn so thousands of markers never
+    block the Tk main loop. Markers whose key is unchanged are left alone.
+    """
+
+    def __init__(self, map_view, batch_size=25):
+        self.map_view = map_view
+        self.batch_size = batch_size
+        self.markers = {}  # key -> map marker
+        self._pending = []
+        self._job = None
+
+    def __len__(self):
+        return len(self.markers)
+
+    def show(self, markers):
+        """
+        Makes the layer display exactly the given markers.
+        :param markers: Dict of key -> (lat, lon, text, set_marker keyword options).
+        """
+        for key in [key for key in self.markers if key not in markers]:
+            self.markers.pop(key).delete()
+        self._pending = [(key, spec) for key, spec in markers.items() if key not in self.markers]
+        if self._job is None and self._pending:
+            self._job = self.map_view.after_idle(self._draw_batch)
+
+    def clear(self):
+        """
+        Removes every marker, including ones still waiting to be drawn.
+        """
+        self.show({})
+
+    def _draw_batch(self):
+        """
+        Draws up to batch_size pending markers, rescheduling itself until none are left.
+        """
+        batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+        for key, (lat, lon, text, options) in batch:
+            self.markers[key] = self.map_view.set_marker(lat, lon, text=text, **options)
+        self._job = self.map_view.after(1, self._draw_batch) if self._pending else None
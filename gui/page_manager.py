@@ -0,0 +1,112 @@
+import importlib
+import time
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+
+class PageManager:
+    """
+    Builds each screen once, on first visit, and switches between them without rebuilding.
+
+    Every page gets its own frame inside the root window. Showing a page hides
+    the current frame with pack_forget and packs the target; pages may define
+    on_show()/on_hide() to react to being switched in or out. With
+    ``cache_pages=False`` frames are destroyed on hide, which reproduces the old
+    rebuild-on-every-visit behaviour for comparison.
+    """
+
+    def __init__(self, root, cache_pages=True):
+        self.root = root
+        self.cache_pages = cache_pages
+        self.current = None
+        self.timings = []  # (page name, built this visit, seconds)
+        self._factories = {}
+        self._frames = {}
+        self._pages = {}
+
+    def register(self, name, factory):
+        """
+        Registers how to build a page.
+        :param name: Page name used with show().
+        :param factory: Callable taking the page's frame and returning the page object (or None).
+        """
+        self._factories[name] = factory
+
+    def get(self, name):
+        """
+        Returns the page object for a built page, or None if it has not been built.
+        """
+        return self._pages.get(name)
+
+    def show(self, name):
+        """
+        Switches to a page, building it first if needed, and records how long the switch took.
+        :param name: Registered page name.
+        """
+        if self.current == name:
+            return
+        start = time.perf_counter()
+        if self.current is not None:
+            self._hide(self.current)
+
+        built = name not in self._frames
+        if built:
+            frame = ttk.Frame(self.root)
+            self._frames[name] = frame
+            self._pages[name] = self._factories[name](frame)
+        self._frames[name].pack(fill=BOTH, expand=True)
+        self.current = name
+        _call_hook(self._pages[name], "on_show")
+
+        self.root.update_idletasks()
+        self.timings.append((name, built, time.perf_counter() - start))
+
+    def _hide(self, name):
+        """
+        Takes a page off screen, destroying it unless pages are cached.
+        """
+        _call_hook(self._pages.get(name), "on_hide")
+        frame = self._frames[name]
+        frame.pack_forget()
+        if not self.cache_pages:
+            frame.destroy()
+            del self._frames[name]
+            self._pages.pop(name, None)
+
+    def report(self):
+        """
+        Summarises navigation latency per page.
+        :return: Dict of page name -> {"visits", "builds", "first_ms", "mean_cached_ms"}.
+        """
+        summary = {}
+        for name, built, seconds in self.timings:
+            entry = summary.setdefault(name, {"visits": 0, "builds": 0, "first_ms": None, "cached": []})
+            entry["visits"] += 1
+            if built:
+                entry["builds"] += 1
+                if entry["first_ms"] is None:
+                    entry["first_ms"] = seconds * 1000
+            else:
+                entry["cached"].append(seconds * 1000)
+        for entry in summary.values():
+            cached = entry.pop("cached")
+            entry["mean_cached_ms"] = sum(cached) / len(cached) if cached else None
+        return summary
+
+
+def load_class(path):
+    """
+    Imports a class on demand from a "package.module:ClassName" path.
+
+    Page modules pull in heavy dependencies (map widgets, web browser
+    integration), so they are only imported the first time a page is built.
+    """
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _call_hook(page, hook):
+    method = getattr(page, hook, None)
+    if method is not None:
+        method()
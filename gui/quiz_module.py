@@ -1,31 +1,35 @@
+import sqlite3
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-import json
-from random import shuffle
+from core.content import DEFAULT_DIFFICULTY, ContentError
+from core.quiz import QuestionBank, QuizSession
+from core.quiz_history import QuizHistory
+
+QUESTIONS_PER_ROUND = 10
+REVIEWS_PER_ROUND = 5  # at most this many due questions open each round
+DIFFICULTY_NAMES = {1: "Easy", 2: "Medium", 3: "Hard"}
+
 
 class QuizModule:
     """
     A quiz to test knowledge about disaster preparedness.
+
+    Each round draws QUESTIONS_PER_ROUND questions from the question bank,
+    adapting the difficulty to the player's answers; the next round starts at
+    the difficulty the previous one ended on. Answers are saved to a
+    QuizHistory when a round ends, and questions due for spaced-repetition
+    review are asked first in the next round.
     """
     def __init__(self, parent, on_back_callback):
         self.parent = parent
         self.on_back_callback = on_back_callback
-        self.questions = self.load_questions()
-        shuffle(self.questions)
-        self.current_index = 0
-        self.score = 0
+        self.bank = QuestionBank()
+        self.history = QuizHistory()
+        self.difficulty = DEFAULT_DIFFICULTY
+        self.session = None
+        self.option_buttons = []
         self._setup_ui()
 
-    def load_questions(self):
-        """
-        Loads quiz questions from a JSON file.
-        """
-        try:
-            with open(r"C:\Users\sibia\PycharmProjects\codessey\assets\data\quiz_questions.json", "r") as file:
-                return json.load(file)["questions"]
-        except FileNotFoundError:
-            return [{"question": "Error loading questions.", "options": ["Retry"], "answer": 0}]
-
     def _setup_ui(self):
         """
         Sets up the quiz UI.
@@ -35,70 +39,101 @@ class QuizModule:
         self.title_label.pack(pady=10)
 
         # Question Display
+        self.level_label = ttk.Label(self.parent, text="", font=("Arial", 10), bootstyle="secondary")
+        self.level_label.pack()
         self.question_label = ttk.Label(self.parent, text="", font=("Arial", 12), wraplength=350, anchor=CENTER)
         self.question_label.pack(pady=20)
 
-        # Options
-        self.option_buttons = []
-        for i in range(4):
-            button = ttk.Button(self.parent, text="", bootstyle="outline-primary", command=lambda i=i: self.check_answer(i))
-            button.pack(fill=X, padx=20, pady=5)
-            self.option_buttons.append(button)
+        # Options, created as needed since questions vary in their number of options
+        self.options_frame = ttk.Frame(self.parent)
+        self.options_frame.pack(fill=X)
 
         # Navigation
         self.back_button = ttk.Button(self.parent, text="Back", bootstyle="outline-secondary", command=self.on_back)
         self.back_button.pack(pady=10)
 
+        self.start_round()
+
+    def start_round(self):
+        """
+        Starts a new round at the difficulty the last round ended on.
+        """
+        try:
+            review = self.history.due_questions(REVIEWS_PER_ROUND)
+        except sqlite3.Error as e:
+            print(f"Error reading quiz history: {e}")
+            review = []
+        self.session = QuizSession(self.bank, length=QUESTIONS_PER_ROUND, difficulty=self.difficulty, review=review)
         self.load_next_question()
 
+    def _show_options(self, options, command):
+        """
+        Shows one button per option, reusing buttons from earlier questions.
+        """
+        while len(self.option_buttons) < len(options):
+            self.option_buttons.append(ttk.Button(self.options_frame, text="", bootstyle="outline-primary"))
+        for i, button in enumerate(self.option_buttons):
+            if i < len(options):
+                button.config(text=options[i], bootstyle="outline-primary", command=lambda i=i: command(i))
+                button.pack(fill=X, padx=20, pady=5)
+            else:
+                button.pack_forget()
+
     def load_next_question(self):
         """
         Loads the next question or displays the score.
         """
-        if self.current_index < len(self.questions):
-            question = self.questions[self.current_index]
-            self.question_label.config(text=question["question"])
-            for i, option in enumerate(question["options"]):
-                self.option_buttons[i].config(text=option, bootstyle="outline-primary")
-        else:
+        try:
+            question = self.session.next_question()
+        except ContentError:
+            self.level_label.config(text="")
+            self.question_label.config(text="Error loading questions.")
+            self._show_options(["Retry"], lambda i: self.start_round())
+            return
+        if question is None:
             self.display_score()
+            return
+        self.level_label.config(text=f"Question {len(self.session.asked)} of {self.session.length} - {DIFFICULTY_NAMES[question['difficulty']]}")
+        self.question_label.config(text=question["question"])
+        self._show_options(question["options"], self.check_answer)
 
     def check_answer(self, selected_index):
         """
         Checks the user's answer and updates the score.
         """
-        correct_index = self.questions[self.current_index]["answer"]
-        if selected_index == correct_index:
+        correct_index = self.session.current["answer"]
+        if self.session.answer(selected_index):
             self.option_buttons[selected_index].config(bootstyle="success")
-            self.score += 1
         else:
             self.option_buttons[selected_index].config(bootstyle="danger")
             self.option_buttons[correct_index].config(bootstyle="success")
+        for button in self.option_buttons:
+            button.config(command="")  # ignore further clicks until the next question
+        self.difficulty = self.session.difficulty
 
         self.parent.after(1000, self.load_next_question)
-        self.current_index += 1
+
+    def on_show(self):
+        """
+        Starts a fresh round when returning to a quiz that has already finished.
+        """
+        if self.session.finished:
+            self.start_round()
 
     def display_score(self):
         """
-        Displays the user's score.
+        Displays the user's score and saves the round's answers.
         """
-        self.question_label.config(text=f"Your Score: {self.score}/{len(self.questions)}")
-        for button in self.option_buttons:
-            button.pack_forget()
+        try:
+            self.history.record_round(self.session.results())
+        except sqlite3.Error as e:
+            print(f"Error saving quiz results: {e}")
+        self.level_label.config(text=f"Next round: {DIFFICULTY_NAMES[self.difficulty]}")
+        self.question_label.config(text=f"Your Score: {self.session.score}/{len(self.session.answers)}")
+        self._show_options([], None)
 
     def on_back(self):
         """
         Handles the back button click event.
         """
-        self._clear_screen()
         self.on_back_callback()
-
-    def _clear_screen(self):
-        """
-        Clears all widgets from the screen.
-        """
-        self.title_label.destroy()
-        self.question_label.destroy()
-        for button in self.option_buttons:
-            button.destroy()
-        self.back_button.destroy()
\ No newline at end of file
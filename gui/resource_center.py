@@ -1,26 +1,35 @@
 import webbrowser
-import json
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
+from core.content import ContentError, default_store
+from core.link_checker import LinkChecker, link_state
+from gui.tk_async import after_future
+
+BROKEN_SUFFIX = " (broken link)"
 
 class ResourceCenterPage:
     """
     Displays resources for disaster preparedness.
+
+    Links are checked in the background by a LinkChecker; results cached from
+    earlier runs are shown right away and dead links are marked as they are found.
     """
-    def __init__(self, parent, on_back_callback):
+    def __init__(self, parent, on_back_callback, link_checker=None):
         self.parent = parent
         self.on_back_callback = on_back_callback
+        self.link_checker = link_checker or LinkChecker()
         self.resources = self.load_resources()
+        self.link_labels = {}
         self._setup_ui()
+        self.check_links()
 
     def load_resources(self):
         """
-        Loads resources from a JSON file.
+        Loads resources from the shared content store.
         """
         try:
-            with open(r"C:\Users\sibia\PycharmProjects\codessey\assets\data\resource_links.json", 'r') as file:
-                return json.load(file)['resources']
-        except FileNotFoundError:
+            return default_store().resources()
+        except ContentError:
             return {'General': ['Error loading resources.']}
 
     def _setup_ui(self):
@@ -42,11 +51,43 @@ class ResourceCenterPage:
                 link_label.pack(anchor=W, padx=40)
                 link_label.bind("<Button-1>", lambda e, url=link: self.open_link(url))
                 self.resource_labels.append(link_label)
+                if link.startswith(("http://", "https://")):
+                    self.link_labels.setdefault(link, []).append(link_label)
 
         # Navigation
         self.back_button = ttk.Button(self.parent, text='Back', bootstyle='outline-secondary', command=self.on_back)
         self.back_button.pack(pady=10)
 
+    def check_links(self):
+        """
+        Marks links already known to be dead, then rechecks stale ones; both run off the Tk thread.
+        """
+        urls = list(self.link_labels)
+        if not urls:
+            return
+        cached = self.link_checker.cached_results_async(urls)
+        checked = self.link_checker.check_in_background(urls)
+        # Cached results are only worth showing while the fresh ones are still on their way
+        after_future(self.parent, cached, lambda results: None if checked.done() else self.show_link_results(results))
+        after_future(self.parent, checked, self.show_link_results)
+
+    def show_link_results(self, results):
+        """
+        Styles each link label by its check result; unreachable links keep their last known state.
+        :param results: Dict of URL -> result as returned by LinkChecker.
+        """
+        if not self.parent.winfo_exists():
+            return
+        for url, result in results.items():
+            state = link_state(result)
+            if state == "unreachable":
+                continue
+            for label in self.link_labels.get(url, []):
+                if state == "broken":
+                    label.config(text=url + BROKEN_SUFFIX, bootstyle='danger')
+                else:
+                    label.config(text=url, bootstyle='primary')
+
     def open_link(self, url):
         """
         Opens the given URL in the web browser.
@@ -57,14 +98,4 @@ class ResourceCenterPage:
         """
         Handles the back button click event.
         """
-        self._clear_screen()
         self.on_back_callback()
-
-    def _clear_screen(self):
-        """
-        Clears all widgets from the screen.
-        """
-        self.title_label.destroy()
-        for label in self.resource_labels:
-            label.destroy()
-        self.back_button.destroy()
\ No newline at end of file
@@ -0,0 +1,127 @@
+import sqlite3
+import time
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from core.search import default_search_index
+from gui.tk_async import after_future
+from gui.virtual_list import VirtualList
+
+SEARCH_DELAY_MS = 80  # wait for a pause in typing before searching
+RESULT_LIMIT = 50
+KIND_LABELS = {
+    "instructions": "Guide",
+    "questions": "Quiz",
+    "resources": "Resources",
+    "alerts": "Alert",
+    "feed": "Live alert",
+}
+
+
+class SearchPage:
+    """
+    Searches all preparedness content as the user types.
+
+    Queries run against the shared SearchIndex after a short pause in typing.
+    Broad queries first list the best of their most recent matches, then the
+    fully ranked results once a background search finishes. Picking a result
+    calls ``on_open(kind, ref)`` so the window can show it.
+    """
+    def __init__(self, parent, on_back_callback, on_open=None):
+        self.parent = parent
+        self.on_back_callback = on_back_callback
+        self.on_open = on_open
+        self.index = default_search_index()
+        self.query = ttk.StringVar()
+        self._pending = None
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """
+        Sets up the search UI.
+        """
+        # Title
+        self.title_label = ttk.Label(self.parent, text="Search", font=("Arial", 16, "bold"), bootstyle="inverse-primary")
+        self.title_label.pack(pady=10)
+
+        # Query
+        self.entry = ttk.Entry(self.parent, textvariable=self.query, font=("Arial", 12))
+        self.entry.pack(fill=X, padx=10, pady=5)
+        self.query.trace_add("write", lambda *args: self._schedule_search())
+        self.status_label = ttk.Label(self.parent, text="", font=("Arial", 9), bootstyle="secondary")
+        self.status_label.pack(anchor=W, padx=10)
+
+        # Results: only the rows in view exist as widgets
+        self.result_list = VirtualList(self.parent, self._render_result, visible_rows=7, row_height=64)
+        self.result_list.pack(fill=BOTH, expand=True, padx=10, pady=5)
+
+        # Navigation
+        self.back_button = ttk.Button(self.parent, text="Back", bootstyle="outline-secondary", command=self.on_back)
+        self.back_button.pack(pady=10)
+
+    def _render_result(self, label, result):
+        """
+        Fills a pooled row label with one search result.
+        """
+        label.config(
+            text=f"{KIND_LABELS.get(result['kind'], result['kind'])}: {result['title']}\n{result['snippet']}",
+            bootstyle="danger" if result["kind"] in ("alerts", "feed") else "default",
+            cursor="hand2",
+        )
+        label.bind("<Button-1>", lambda event: self.open_result(result))
+
+    def _schedule_search(self):
+        """
+        Restarts the typing-pause timer.
+        """
+        if self._pending is not None:
+            self.parent.after_cancel(self._pending)
+        self._pending = self.parent.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        """
+        Searches for the current query and lists the results.
+        """
+        self._pending = None
+        query = self.query.get()
+        start = time.perf_counter()
+        try:
+            results, complete = self.index.quick_search(query, limit=RESULT_LIMIT)
+        except sqlite3.Error as e:
+            print(f"Error searching: {e}")
+            results, complete = [], True
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        status = f"{len(results)} results in {elapsed_ms:.1f} ms" if query.strip() else ""
+        self.status_label.config(text=status if complete else f"{status}, ranking all matches...")
+        self.result_list.set_items(results)
+        if not complete:
+            after_future(self.parent, self.index.search_async(query, limit=RESULT_LIMIT),
+                         lambda ranked: self._show_ranked(query, ranked, start))
+
+    def _show_ranked(self, query, results, start):
+        """
+        Replaces the provisional results with the fully ranked ones, unless the query has changed since.
+        """
+        if results is None or query != self.query.get() or not self.parent.winfo_exists():
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.status_label.config(text=f"{len(results)} results in {elapsed_ms:.0f} ms")
+        self.result_list.set_items(results)
+
+    def open_result(self, result):
+        """
+        Shows the page holding a search result.
+        """
+        if self.on_open is not None:
+            self.on_open(result["kind"], result["ref"])
+
+    def on_show(self):
+        """
+        Puts the cursor in the search box.
+        """
+        self.entry.focus_set()
+
+    def on_back(self):
+        """
+        Handles the back button click event.
+        """
+        self.on_back_callback()
@@ -0,0 +1,50 @@
+import queue
+
+
+def after_future(widget, future, callback, poll_ms=50):
+    """
+    Runs callback(result) on the Tk main thread once a concurrent future completes.
+
+    Tk widgets must only be touched from the main thread, so instead of calling
+    back from the worker this polls the future with after().
+    :param widget: Any live widget whose event loop should run the callback.
+    :param future: concurrent.futures.Future to wait for.
+    :param callback: Called with the future's result; not called if it raised.
+    :param poll_ms: Polling interval in milliseconds.
+    """
+    def poll():
+        if not future.done():
+            widget.after(poll_ms, poll)
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Background task failed: {e}")
+            return
+        callback(result)
+
+    widget.after(0, poll)
+
+
+def drain_queue(widget, items, callback, poll_ms=250):
+    """
+    Repeatedly empties a thread-safe queue on the Tk main thread, calling callback(item) for each entry.
+
+    Draining stops once the widget is destroyed.
+    :param widget: Widget whose event loop should run the callback.
+    :param items: queue.Queue filled by a background thread.
+    :param callback: Called with each queued item, in order.
+    :param poll_ms: Interval between drains in milliseconds.
+    """
+    def drain():
+        if not widget.winfo_exists():
+            return
+        while True:
+            try:
+                item = items.get_nowait()
+            except queue.Empty:
+                break
+            callback(item)
+        widget.after(poll_ms, drain)
+
+    widget.after(poll_ms, drain)
@@ -0,0 +1,225 @@
+import atexit
+import bisect
+import functools
+import json
+import time
+import tkinter
+from collections import deque
+
+# Upper bounds in milliseconds of the duration histogram buckets; the last bucket is unbounded.
+BUCKETS_MS = (1, 2, 5, 10, 16, 33, 50, 100, 250, 500, 1000)
+AFTER_CALLBACK = "Misc.after.<locals>.callit"
+
+
+def describe_callback(func):
+    """
+    Names a Tk callback for reports, seeing through partials and the closure Misc.after registers.
+    :return: (name, kind) where kind is "after", "event" or "command".
+    """
+    kind = "command"
+    if getattr(func, "__qualname__", None) == AFTER_CALLBACK:
+        cells = dict(zip(func.__code__.co_freevars, func.__closure__ or ()))
+        if "func" in cells:
+            func = cells["func"].cell_contents
+        kind = "after"
+    while isinstance(func, functools.partial):
+        func = func.func
+    owner = getattr(func, "__self__", None)
+    if owner is not None and hasattr(func, "__func__"):
+        return f"{type(owner).__name__}.{func.__name__}", kind
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return getattr(func, "__qualname__", type(func).__name__), kind
+    name = func.__qualname__
+    if "<lambda>" in name or "<locals>" in name:
+        name += f" ({func.__module__}:{code.co_firstlineno})"
+    return name, kind
+
+
+class HandlerStats:
+    """
+    Running count, total, maximum and duration histogram for one handler.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, duration * 1000)] += 1
+
+    def percentile(self, fraction):
+        """
+        Estimates a duration percentile as the upper bound of the bucket it falls in.
+        :return: Milliseconds; the maximum for the unbounded bucket.
+        """
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max * 1000)
+        return self.max * 1000
+
+
+class CallbackProfiler:
+    """
+    Opt-in profiler for everything the Tk main thread runs on the app's behalf.
+
+    install() wraps tkinter's CallWrapper, through which every button
+    ``command``, ``bind`` handler and ``after`` callback is called, and times
+    each call into a per-handler histogram. A heartbeat ``after`` timer
+    notices when the event loop falls behind by more than ``stall_ms`` and
+    blames the slowest callback that ran in the meantime. Calls of at least
+    ``trace_min_ms`` and every stall are kept, up to ``max_events``, for a
+    Chrome trace (open it in chrome://tracing or Perfetto).
+    """
+
+    def __init__(self, heartbeat_ms=50, stall_ms=100, trace_min_ms=1.0, max_events=100000):
+        self.heartbeat_ms = heartbeat_ms
+        self.stall_ms = stall_ms
+        self.trace_min_ms = trace_min_ms
+        self.stats = {}
+        self.stalls = []  # (start, seconds late, slowest callback name)
+        self.events = deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+        self._original_call = None
+        self._root = None
+        self._beat_id = None
+        self._expected = None
+        self._slowest = None  # (seconds, name) of the slowest callback since the last heartbeat
+
+    def install(self, root, report_path=None, trace_path=None):
+        """
+        Starts profiling callbacks and the event loop of ``root``.
+        :param report_path: File the text report is written to at exit ("-" for stdout), or None.
+        :param trace_path: File the Chrome trace JSON is written to at exit, or None.
+        """
+        if self._original_call is not None:
+            return
+        profiler = self
+        original = self._original_call = tkinter.CallWrapper.__call__
+        heartbeat = describe_callback(self._heartbeat)[0]
+
+        def timed_call(wrapper, *args):
+            label = wrapper.__dict__.get("_profile_label")
+            if label is None:
+                name, kind = describe_callback(wrapper.func)
+                label = wrapper._profile_label = (name, "event" if kind == "command" and wrapper.subst else kind)
+            if label[0] == heartbeat:
+                return original(wrapper, *args)  # keep the profiler's own timer out of the figures
+            start = time.perf_counter()
+            try:
+                return original(wrapper, *args)
+            finally:
+                profiler.record(label[0], label[1], start, time.perf_counter() - start)
+
+        tkinter.CallWrapper.__call__ = timed_call
+        self._root = root
+        self._expected = time.perf_counter() + self.heartbeat_ms / 1000
+        self._beat_id = root.after(self.heartbeat_ms, self._heartbeat)
+        if report_path or trace_path:
+            atexit.register(self.dump, report_path, trace_path)
+
+    def uninstall(self):
+        """
+        Restores tkinter's CallWrapper and stops the heartbeat.
+        """
+        if self._original_call is None:
+            return
+        tkinter.CallWrapper.__call__ = self._original_call
+        self._original_call = None
+        try:
+            self._root.after_cancel(self._beat_id)
+        except tkinter.TclError:
+            pass  # the window is already gone
+
+    def record(self, name, kind, start, duration):
+        """
+        Adds one callback run to the statistics and, if long enough, to the trace.
+        """
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = HandlerStats(kind)
+        stats.add(duration)
+        if self._slowest is None or duration > self._slowest[0]:
+            self._slowest = (duration, name)
+        if duration * 1000 >= self.trace_min_ms:
+            self.events.append((name, kind, start, duration))
+
+    def _heartbeat(self):
+        """
+        Measures how late this timer fired and records a stall if it was late by more than stall_ms.
+        """
+        now = time.perf_counter()
+        late = now - self._expected
+        if late * 1000 > self.stall_ms:
+            culprit = self._slowest[1] if self._slowest is not None else "(outside Python callbacks)"
+            self.stalls.append((self._expected, late, culprit))
+            self.events.append((f"stall: {culprit}", "stall", self._expected, late))
+        self._slowest = None
+        self._expected = now + self.heartbeat_ms / 1000
+        try:
+            self._beat_id = self._root.after(self.heartbeat_ms, self._heartbeat)
+        except tkinter.TclError:
+            pass  # the window was destroyed
+
+    def report(self, top=20):
+        """
+        Formats the slowest handlers by total time, and the stalls, as text.
+        """
+        lines = [f"{'handler':<56} {'kind':<7} {'calls':>7} {'total ms':>9} {'mean':>7} {'p95':>7} {'max':>8}"]
+        ranked = sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)
+        for name, stats in ranked[:top]:
+            lines.append(
+                f"{name[:56]:<56} {stats.kind:<7} {stats.count:>7} {stats.total * 1000:>9.1f} "
+                f"{stats.total / stats.count * 1000:>7.2f} {stats.percentile(0.95):>7.1f} {stats.max * 1000:>8.1f}"
+            )
+        lines.append(f"\n{len(self.stalls)} event loop stalls over {self.stall_ms} ms")
+        for start, late, culprit in sorted(self.stalls, key=lambda stall: stall[1], reverse=True)[:top]:
+            lines.append(f"  {late * 1000:8.1f} ms at {start - self._origin:8.2f} s  {culprit}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """
+        Builds the recorded events in the Chrome trace event format.
+        """
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": kind,
+                    "ph": "X",
+                    "ts": round((start - self._origin) * 1e6),
+                    "dur": round(duration * 1e6),
+                    "pid": 1,
+                    "tid": 2 if kind == "stall" else 1,
+                }
+                for name, kind, start, duration in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def dump(self, report_path=None, trace_path=None):
+        """
+        Writes the text report and the Chrome trace.
+        :param report_path: File for the report, "-" for stdout, or None to skip it.
+        :param trace_path: File for the trace JSON, or None to skip it.
+        """
+        try:
+            if report_path == "-":
+                print(self.report())
+            elif report_path:
+                with open(report_path, "w", encoding="utf-8") as file:
+                    file.write(self.report() + "\n")
+            if trace_path:
+                with open(trace_path, "w", encoding="utf-8") as file:
+                    json.dump(self.chrome_trace(), file)
+        except OSError as e:
+            print(f"Error writing UI profile: {e}")
@@ -0,0 +1,101 @@
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+
+class VirtualList:
+    """
+    Scrollable list that only creates widgets for the rows in view.
+
+    A fixed pool of labels, one per visible row, is placed at fixed heights
+    and re-filled with new items as the list scrolls, so the widget count is
+    independent of how many items there are. Items may be any sequence
+    (including lazy ones); ``render`` fills a pooled label from an item.
+    """
+
+    def __init__(self, parent, render, visible_rows=8, row_height=60):
+        self.render = render
+        self.visible_rows = visible_rows
+        self.row_height = row_height
+        self.items = []
+        self.first = 0
+
+        self.frame = ttk.Frame(parent)
+        self.viewport = ttk.Frame(self.frame, height=visible_rows * row_height)
+        self.viewport.pack(side=LEFT, fill=BOTH, expand=True)
+        self.viewport.pack_propagate(False)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+
+        self.rows = []
+        for _ in range(visible_rows):
+            label = ttk.Label(self.viewport, anchor=NW, wraplength=330)
+            label.bind("<MouseWheel>", self._on_mousewheel)
+            label.bind("<Button-4>", lambda event: self.scroll(-1))
+            label.bind("<Button-5>", lambda event: self.scroll(1))
+            self.rows.append(label)
+        self.viewport.bind("<MouseWheel>", self._on_mousewheel)
+
+    def pack(self, **kwargs):
+        """
+        Packs the list's outer frame.
+        """
+        self.frame.pack(**kwargs)
+
+    def set_items(self, items):
+        """
+        Replaces the listed items and scrolls back to the top.
+        :param items: Sequence supporting len() and indexing.
+        """
+        self.items = items
+        self.first = 0
+        self._refresh()
+
+    def refresh(self):
+        """
+        Re-renders the visible rows after the item sequence was changed in place.
+        """
+        self.first = max(0, min(self.first, len(self.items) - self.visible_rows))
+        self._refresh()
+
+    def scroll(self, rows):
+        """
+        Scrolls by a number of rows (negative scrolls up).
+        """
+        self.scroll_to(self.first + rows)
+
+    def scroll_to(self, index):
+        """
+        Makes ``index`` the first visible row, clamped to the list bounds.
+        """
+        last_first = max(0, len(self.items) - self.visible_rows)
+        index = max(0, min(index, last_first))
+        if index != self.first:
+            self.first = index
+            self._refresh()
+
+    def _refresh(self):
+        """
+        Re-fills the pooled labels for the current scroll position.
+        """
+        total = len(self.items)
+        for slot, label in enumerate(self.rows):
+            index = self.first + slot
+            if index < total:
+                self.render(label, self.items[index])
+                label.place(x=0, y=slot * self.row_height, relwidth=1.0, height=self.row_height)
+            else:
+                label.place_forget()
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.items)))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
@@ -1,15 +1,79 @@
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import subprocess
+import sys
+
 import ttkbootstrap as ttk
 from gui.app_window import AppWindow
 
 
-def initialize_app():
+def initialize_app(first_frame_only=False, profile_trace=None):
     """
     Initializes and starts the SafeGuard app.
+    :param first_frame_only: Draw the first frame, report how long it took and exit.
+    :param profile_trace: Profile UI callbacks, printing a report at exit and writing a Chrome trace to this path.
     """
     root = ttk.Window(themename="cosmo")  # Modern bootstrap theme
+    if profile_trace:
+        from gui.tk_profiler import CallbackProfiler
+        CallbackProfiler().install(root, report_path="-", trace_path=profile_trace)
     AppWindow(root)
+    if first_frame_only:
+        root.update()
+        print(f"first_frame_ms={(time.perf_counter() - _START) * 1000:.1f}")
+        root.destroy()
+        return
     root.mainloop()
 
 
+def profile_startup(top=20):
+    """
+    Relaunches the app under -X importtime and prints the slowest imports and time to first frame.
+    :param top: Number of imports to list, by cumulative time.
+    :return: The relaunched app's exit code.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", __file__, "--first-frame"],
+        capture_output=True,
+        text=True,
+    )
+    imports = []
+    errors = []  # stderr lines other than the import report, such as a traceback
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            if line.strip():
+                errors.append(line.strip())
+            continue
+        if "imported package" in line:
+            continue
+        self_us, cumulative_us, package = line[len("import time:"):].split("|")
+        imports.append((int(cumulative_us), int(self_us), package.rstrip()))
+
+    imports.sort(reverse=True)
+    print(f"{'cumulative ms':>13} {'self ms':>8}  module")
+    for cumulative_us, self_us, package in imports[:top]:
+        print(f"{cumulative_us / 1000:13.1f} {self_us / 1000:8.1f}  {package}")
+    total_us = sum(self_us for _, self_us, _ in imports)
+    print(f"\n{len(imports)} modules imported, {total_us / 1000:.1f} ms in imports")
+    if result.returncode != 0:
+        print(f"App exited with code {result.returncode}" + (f": {errors[-1]}" if errors else ""))
+    else:
+        print(result.stdout.strip() or "App exited without reporting a first frame")
+    return result.returncode
+
+
 if __name__ == "__main__":
-    initialize_app()
+    parser = argparse.ArgumentParser(description="SafeGuard: Emergency Preparedness")
+    parser.add_argument("--profile-startup", action="store_true", help="print an import-time and first-frame report")
+    parser.add_argument("--first-frame", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--profile-ui", metavar="TRACE_JSON", help="time every UI callback, report slow ones and stalls at exit and write a Chrome trace")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        sys.exit(profile_startup())
+    else:
+        initialize_app(first_frame_only=args.first_frame, profile_trace=args.profile_ui)
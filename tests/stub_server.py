@@ -0,0 +1,37 @@
+import http.server
+import threading
+
+
+def serve(handle, protocol_version="HTTP/1.0"):
+    """
+    Starts a local HTTP server on a free port for tests.
+    :param handle: Called with the BaseHTTPRequestHandler for every request, whatever its method.
+    :return: (server, base URL); call server.shutdown() when done.
+    """
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            handle(self)
+
+        do_HEAD = do_GET
+
+        def log_message(self, format, *args):
+            pass
+
+    Handler.protocol_version = protocol_version
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def send(handler, status, body=b"", headers=None):
+    """
+    Writes a complete response, omitting the body for HEAD requests.
+    """
+    handler.send_response(status)
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    if handler.command != "HEAD":
+        handler.wfile.write(body)
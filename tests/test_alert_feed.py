@@ -0,0 +1,42 @@
+import json
+import time
+
+from core.alert_feed import AlertFeed, AlertFeedWorker, NDJSONFileSource
+
+
+def write_lines(path, records):
+    with open(path, "a", encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record) + "\n")
+
+
+def test_alerts_without_an_id_are_keyed_by_their_content(tmp_path):
+    path = tmp_path / "feed.ndjson"
+    write_lines(path, [{"text": "Flood warning", "region": "North"}, {"region": "North", "text": "Flood warning"}])
+    feed = AlertFeed(NDJSONFileSource(str(path)))
+    diff = feed.poll(now=0)
+    assert len(diff["added"]) == 1 and not diff["updated"]
+
+    restarted = AlertFeed(NDJSONFileSource(str(path)))
+    assert restarted.poll(now=0)["added"][0]["id"] == diff["added"][0]["id"]
+    write_lines(path, [{"text": "Fire warning", "region": "North"}])
+    assert feed.poll(now=0)["added"][0]["id"] != diff["added"][0]["id"]
+
+
+def test_worker_stops_and_resumes(tmp_path):
+    path = tmp_path / "feed.ndjson"
+    worker = AlertFeedWorker(AlertFeed(NDJSONFileSource(str(path))), interval=0.01).start()
+    write_lines(path, [{"id": "a1", "text": "Flood warning"}])
+    assert worker.diffs.get(timeout=2)["added"][0]["id"] == "a1"
+
+    worker.stop()
+    thread = worker._thread
+    thread.join(timeout=2)
+    assert not thread.is_alive() and not worker.running
+    write_lines(path, [{"id": "a2", "text": "Fire warning"}])
+    time.sleep(0.05)
+    assert worker.diffs.empty()  # nothing is polled while stopped
+
+    worker.start()
+    assert worker.diffs.get(timeout=2)["added"][0]["id"] == "a2"
+    worker.stop()
@@ -0,0 +1,21 @@
+from core.alert_index import AlertIndex
+
+
+def alert(alert_id, severity, region, area=None):
+    return {"id": alert_id, "text": alert_id, "severity": severity, "region": region, "area": area}
+
+
+def test_filter_choices_follow_the_indexed_alerts():
+    index = AlertIndex()
+    index.add(alert("a", "severe", "Chennai", {"lat": 13.08, "lon": 80.27, "radius_km": 20}))
+    index.add(alert("b", "minor", "Chennai"))
+    index.add(alert("c", "severe", None))
+    assert index.choices("severity") == ["minor", "severe"]
+    assert index.choices("region") == ["Chennai"]
+
+    index.add(alert("b", "minor", "Madurai"))  # re-sent with a new region
+    index.remove("a")
+    assert index.choices("region") == ["Madurai"]
+    index.remove("c")
+    assert index.choices("severity") == ["minor"]
+    assert [found["id"] for found in index.query(13.08, 80.27)] == ["b"]
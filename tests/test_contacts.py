@@ -0,0 +1,14 @@
+from core.contacts import ContactResolver
+from core.database import DatabaseManager
+
+
+def test_changes_reach_lookups_by_name_and_by_code(tmp_path):
+    db = DatabaseManager(str(tmp_path / "contacts.db"))
+    db.add_contact("India", "100", "101", "108")
+    resolver = ContactResolver(db)
+    assert resolver.emergency_number("India") == "100"
+    assert resolver.emergency_number("IN") == "100"
+
+    db.add_contact("India", "999", "101", "108")
+    assert resolver.emergency_number("India") == "999"
+    assert resolver.emergency_number("IN") == "999"
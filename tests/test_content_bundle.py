@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+from core.content import ContentError, ContentStore
+from core.content_bundle import ContentBundle, build_bundle
+
+
+def make_store(tmp_path):
+    alerts = [{"id": f"a{number}", "text": f"Flood warning {number}", "severity": "severe"} for number in range(20)]
+    (tmp_path / "disaster_alerts.json").write_text(json.dumps({"alerts": alerts}))
+    store = ContentStore(str(tmp_path), check_interval=0)
+    build_bundle(store.bundle_path, store)
+    return store
+
+
+def test_truncated_bundle_raises_content_error(tmp_path):
+    store = make_store(tmp_path)
+    with open(store.bundle_path, "r+b") as file:
+        file.truncate(os.path.getsize(store.bundle_path) - 10)
+    with pytest.raises(ContentError):
+        ContentBundle(store.bundle_path)
+    with open(store.bundle_path, "r+b") as file:
+        file.truncate(12)
+    with pytest.raises(ContentError):
+        ContentBundle(store.bundle_path)
+
+
+def test_corrupt_record_falls_back_to_json(tmp_path):
+    store = make_store(tmp_path)
+    data = bytearray(open(store.bundle_path, "rb").read())
+    data[data.index(b"Flood warning 3") - 1] = ord("}")  # breaks that record's JSON
+    open(store.bundle_path, "wb").write(bytes(data))
+
+    assert store.record_count("alerts") == 20  # served from the bundle
+    assert store.record("alerts", 3)["text"] == "Flood warning 3"  # served from JSON instead
+    assert store._current_bundle() is None  # and the bundle is not reopened until rebuilt
+
+
+def test_bundles_of_an_older_version_are_ignored(tmp_path):
+    store = make_store(tmp_path)
+    data = bytearray(open(store.bundle_path, "rb").read())
+    data[8] = 1  # version field of the header
+    open(store.bundle_path, "wb").write(bytes(data))
+    with pytest.raises(ContentError, match="not a version"):
+        ContentBundle(store.bundle_path)
+    assert store._current_bundle() is None
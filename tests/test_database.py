@@ -0,0 +1,56 @@
+import sqlite3
+
+from core.database import MIGRATIONS, DatabaseManager
+
+
+def test_a_country_can_have_regional_contacts(tmp_path):
+    db = DatabaseManager(str(tmp_path / "contacts.db"))
+    db.add_contacts_bulk([
+        ("India", "112", "112", "112"),
+        ("India", "100", "101", "108", "IN", "Tamil Nadu"),
+        ("United Kingdom", "999", "999", "999", "GB"),
+        ("Great Britain", "999", "999", "999", "GB"),
+    ])
+    db.add_contact("india", "112", "101", "108")  # replaces the country-wide row only
+
+    rows = db.fetch_contacts("INDIA")
+    assert [(row[3], row[5]) for row in rows] == [("101", ""), ("101", "Tamil Nadu")]
+    assert [row[1] for row in db.fetch_contacts_by_code("gb")] == ["United Kingdom", "Great Britain"]
+
+
+def test_version_2_databases_are_upgraded(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    connection = sqlite3.connect(path)
+    for migration in MIGRATIONS[:2]:
+        migration(connection)
+    for column in ("country_key", "iso_code"):  # as version 2 used to index them
+        connection.execute(f"DROP INDEX idx_contacts_{column}")
+        connection.execute(f"CREATE UNIQUE INDEX idx_contacts_{column} ON contacts ({column})")
+    connection.execute("INSERT INTO contacts (country, police, iso_code, country_key) VALUES ('France', '17', 'FR', 'france')")
+    connection.execute("PRAGMA user_version = 2")
+    connection.commit()
+    connection.close()
+
+    db = DatabaseManager(path)
+    assert db.schema_version() == len(MIGRATIONS)
+    db.add_contact("France", "17", "18", "15", region="Corse")
+    assert [row[5] for row in db.fetch_contacts("france")] == ["", "Corse"]
+
+
+def test_unversioned_databases_with_repeated_countries_are_upgraded(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    connection = sqlite3.connect(path)  # as created before migrations existed
+    connection.execute(
+        "CREATE TABLE contacts (id INTEGER PRIMARY KEY AUTOINCREMENT, country TEXT NOT NULL, police TEXT, fire TEXT, ambulance TEXT)"
+    )
+    connection.executemany(
+        "INSERT INTO contacts (country, police, fire, ambulance) VALUES (?, ?, ?, ?)",
+        [("India", "100", "101", "102"), ("India", "112", "112", "112"), ("Japan", "110", "119", "119")],
+    )
+    connection.commit()
+    connection.close()
+
+    db = DatabaseManager(path)
+    assert db.schema_version() == len(MIGRATIONS)
+    assert [row[1:5] for row in db.fetch_contacts("india")] == [("India", "112", "112", "112")]
+    assert len(db.fetch_contacts()) == 2
@@ -0,0 +1,125 @@
+import asyncio
+import socket
+
+import pytest
+
+from core.link_checker import LinkCache, LinkChecker, link_state
+from tests.stub_server import send as respond, serve
+
+
+@pytest.fixture
+def site():
+    """
+    A stub site recording every request as (method, path, headers, response status).
+    """
+    requests = []
+    etag = '"v1"'
+    modified = "Mon, 05 Oct 2026 10:00:00 GMT"
+
+    def handle(handler):
+        def reply(handler, status, headers=None):
+            requests.append((handler.command, handler.path, dict(handler.headers), status))
+            respond(handler, status, headers=headers)
+
+        path = handler.path
+        if path == "/ok":
+            reply(handler, 200)
+        elif path == "/gone":
+            reply(handler, 404)
+        elif path == "/members":
+            reply(handler, 403)
+        elif path == "/old":
+            reply(handler, 301, headers={"Location": "/new"})
+        elif path == "/new":
+            reply(handler, 200)
+        elif path == "/loop":
+            reply(handler, 302, headers={"Location": "/loop"})
+        elif path == "/early-hints":
+            handler.send_response_only(103)
+            handler.send_header("Link", "</style.css>; rel=preload")
+            handler.end_headers()
+            reply(handler, 200)
+        elif path == "/no-head":
+            reply(handler, 405 if handler.command == "HEAD" else 200)
+        elif path == "/etag":
+            if handler.headers.get("If-None-Match") == etag:
+                reply(handler, 304)
+            else:
+                reply(handler, 200, headers={"ETag": etag})
+        elif path == "/modified":
+            if handler.headers.get("If-Modified-Since") == modified:
+                reply(handler, 304)
+            else:
+                reply(handler, 200, headers={"Last-Modified": modified})
+        else:
+            reply(handler, 500)
+
+    server, base_url = serve(handle, protocol_version="HTTP/1.1")
+    yield base_url, requests
+    server.shutdown()
+
+
+def check(checker, urls):
+    return asyncio.run(checker.check_all(urls))
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_results_are_classified(site, tmp_path):
+    base_url, _ = site
+    dead = f"http://127.0.0.1:{closed_port()}/"
+    urls = [f"{base_url}/ok", f"{base_url}/gone", f"{base_url}/members", dead]
+    results = check(LinkChecker(LinkCache(str(tmp_path / "links.json")), timeout=5), urls)
+    assert [link_state(results[url]) for url in urls] == ["ok", "broken", "ok", "unreachable"]
+    assert LinkCache(str(tmp_path / "links.json")).get(dead) is None  # unreachable links are retried next time
+
+
+def test_redirects_are_followed_and_loops_give_up(site, tmp_path):
+    base_url, _ = site
+    results = check(LinkChecker(LinkCache(str(tmp_path / "links.json")), timeout=5), [f"{base_url}/old", f"{base_url}/loop"])
+    assert results[f"{base_url}/old"]["status"] == 200
+    assert results[f"{base_url}/old"]["final_url"] == f"{base_url}/new"
+    assert results[f"{base_url}/loop"]["status"] is None
+    assert "too many redirects" in results[f"{base_url}/loop"]["error"]
+
+
+def test_interim_responses_are_skipped(site, tmp_path):
+    base_url, _ = site
+    results = check(LinkChecker(LinkCache(str(tmp_path / "links.json")), timeout=5), [f"{base_url}/early-hints"])
+    assert results[f"{base_url}/early-hints"]["status"] == 200
+
+
+def test_head_falls_back_to_get(site, tmp_path):
+    base_url, requests = site
+    results = check(LinkChecker(LinkCache(str(tmp_path / "links.json")), timeout=5), [f"{base_url}/no-head"])
+    assert results[f"{base_url}/no-head"]["status"] == 200
+    assert [method for method, path, _, _ in requests if path == "/no-head"] == ["HEAD", "GET"]
+
+
+@pytest.mark.parametrize("path, header", [("/etag", "If-None-Match"), ("/modified", "If-Modified-Since")])
+def test_stale_results_are_revalidated_conditionally(site, tmp_path, path, header):
+    base_url, requests = site
+    url = base_url + path
+    cache = LinkCache(str(tmp_path / "links.json"), ttl=0)  # every cached result is stale
+    first = check(LinkChecker(cache, timeout=5), [url])[url]
+    assert header not in requests[-1][2] and requests[-1][3] == 200
+
+    second = check(LinkChecker(LinkCache(cache.path, ttl=0), timeout=5), [url])[url]
+    _, _, conditional, status = requests[-1]
+    assert conditional[header] == (first["etag"] if header == "If-None-Match" else first["last_modified"])
+    assert status == 304
+    assert second["status"] == 200  # the 304 keeps the cached verdict
+    assert (second["etag"], second["last_modified"]) == (first["etag"], first["last_modified"])
+    assert second["checked_at"] >= first["checked_at"]
+
+
+def test_cached_results_load_on_the_worker(tmp_path):
+    cache = LinkCache(str(tmp_path / "links.json"))
+    cache.store([{"url": "https://example.org/", "status": 404, "checked_at": 0}])
+    checker = LinkChecker(LinkCache(cache.path))
+    future = checker.cached_results_async(["https://example.org/", "https://example.org/other"])
+    assert future.result(timeout=5) == {"https://example.org/": {"url": "https://example.org/", "status": 404, "checked_at": 0}}
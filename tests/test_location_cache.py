@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+from core.location_cache import LocationCache
+
+
+def test_a_fresh_fix_is_reused_until_it_expires(tmp_path):
+    cache = LocationCache(str(tmp_path / "location.json"), max_age=60)
+    cache.store((13.08, 80.27), "India", timestamp=1000)
+    assert cache.load_fresh(now=1030)["country"] == "India"
+    assert cache.load_fresh(now=1061) is None
+
+
+@pytest.mark.parametrize("fix", [
+    {"latitude": 13.08, "longitude": 80.27, "timestamp": "1000"},
+    {"latitude": 13.08, "longitude": 80.27, "timestamp": None},
+    {"latitude": 13.08, "longitude": 80.27},
+    {"latitude": "13.08", "longitude": 80.27, "timestamp": 1000},
+    [13.08, 80.27, 1000],
+])
+def test_malformed_fixes_are_misses(tmp_path, fix):
+    path = tmp_path / "location.json"
+    path.write_text(json.dumps(fix), encoding="utf-8")
+    cache = LocationCache(str(path))
+    assert cache.load() is None
+    assert cache.load_fresh(now=1000) is None
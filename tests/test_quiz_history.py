@@ -0,0 +1,29 @@
+import json
+import random
+
+from core.content import ContentStore, question_id
+from core.quiz import QuestionBank, QuizSession
+from core.quiz_history import DAY, QuizHistory
+
+
+def write_questions(asset_dir, texts):
+    questions = [{"question": text, "options": ["Yes", "No"], "answer": 0} for text in texts]
+    (asset_dir / "quiz_questions.json").write_text(json.dumps({"questions": questions}))
+
+
+def test_due_questions_follow_their_id_when_the_bank_is_reordered(tmp_path):
+    write_questions(tmp_path, ["Boil water?", "Store batteries?", "Leave early?"])
+    bank = QuestionBank(ContentStore(str(tmp_path), check_interval=0))
+    history = QuizHistory(str(tmp_path / "history.db"))
+    session = QuizSession(bank, length=1, rng=random.Random(1))
+    asked = session.next_question()
+    session.answer(1)  # wrong, so due again tomorrow
+    history.record_round(session.results(), answered_at=0)
+
+    write_questions(tmp_path, ["Leave early?", "New question?", "Store batteries?", "Boil water?"])
+    bank = QuestionBank(ContentStore(str(tmp_path), check_interval=0))
+    due = history.due_questions(5, now=2 * DAY)
+    assert due == [question_id(asked)]
+    review = QuizSession(bank, length=1, review=due)
+    assert review.next_question()["question"] == asked["question"]
+
@@ -0,0 +1,27 @@
+import pytest
+
+from core.reverse_geocoder import ReverseGeocoder
+
+
+@pytest.fixture(scope="module")
+def geocoder():
+    return ReverseGeocoder()
+
+
+@pytest.mark.parametrize("lat, lon, country", [
+    (1.3521, 103.8198, "Singapore"),
+    (1.4927, 103.7414, "Malaysia"),  # Johor Bahru, across the strait
+    (49.6116, 6.1319, "Luxembourg"),
+    (43.7384, 7.4246, "Monaco"),
+    (43.7102, 7.2620, "France"),  # Nice
+    (41.9029, 12.4534, "Holy See"),
+    (41.8967, 12.4822, "Italy"),  # Rome
+    (26.2235, 50.5876, "Bahrain"),
+    (35.8989, 14.5146, "Malta"),
+])
+def test_small_states_are_not_swallowed_by_their_neighbours(geocoder, lat, lon, country):
+    assert geocoder.lookup(lat, lon) == country
+
+
+def test_micro_states_have_codes(geocoder):
+    assert geocoder.lookup_code(1.3521, 103.8198) == "SG"
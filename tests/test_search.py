@@ -0,0 +1,51 @@
+import json
+import os
+import time
+
+from core.content import ContentStore
+from core.search import SearchIndex, _executor
+
+
+def alert(alert_id, text):
+    return {"id": alert_id, "text": text, "severity": "severe", "region": "North", "area": None}
+
+
+def test_feed_alerts_do_not_outlive_the_feed(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.apply_alert_diff_async({"added": [alert("a1", "flood warning")], "updated": [], "removed": []}).result()
+    assert [result["ref"] for result in index.search("flood ")] == ["a1"]
+
+    # Next launch: whatever the new feed has not re-reported is gone
+    restarted = SearchIndex(index.db_path)
+    assert restarted.purge_feed() == 1
+    assert restarted.search("flood ") == []
+
+
+def test_hot_reload_reindexes_off_the_calling_thread_and_records_mtime(tmp_path):
+    path = tmp_path / "disaster_info.json"
+    path.write_text(json.dumps({"instructions": ["Earthquake: drop, cover and hold on"]}))
+    store = ContentStore(str(tmp_path), check_interval=0)
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.sync(store)
+    index.watch(store)
+
+    path.write_text(json.dumps({"instructions": ["Tsunami: move to high ground"]}))
+    os.utime(path, ns=(time.time_ns() + 10**9,) * 2)
+    store.get("instructions")
+    _executor.submit(lambda: None).result()  # wait for the queued re-index
+    assert [result["title"] for result in index.search("tsunami ")] == ["Tsunami"]
+    assert index.sync(store) == 0  # already up to date
+
+
+def test_quick_search_reports_unranked_matches(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.search.CANDIDATE_LIMIT", 5)
+    index = SearchIndex(str(tmp_path / "search.db"))
+    # The best match is written first, so it falls outside the most recently written candidates
+    alerts = [alert("best", "flood flood flood")] + [alert(f"a{i}", f"flood warning {i} " + "filler " * 20) for i in range(20)]
+    index.index_asset("alerts", alerts)
+
+    quick, complete = index.quick_search("flood ")
+    assert not complete and "best" not in [result["ref"] for result in quick]
+    assert index.search("flood ")[0]["ref"] == "best"
+    assert index.search_async("flood ").result()[0]["ref"] == "best"
+    assert index.quick_search("warning 3 ")[1]
@@ -0,0 +1,11 @@
+from core.service import ContactService
+
+
+def test_code_only_queries_keep_their_code(tmp_path):
+    service = ContactService(str(tmp_path / "contacts.db"))
+    try:
+        germany, unknown = service.resolve_batch([{"country": "de"}, {"country": "ZZ"}])
+    finally:
+        service.close()
+    assert (germany["country"], germany["iso_code"], germany["emergency"]) == ("Germany", "DE", "112")
+    assert (unknown["country"], unknown["iso_code"]) == ("ZZ", "ZZ")
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from core.tile_cache import (
+    OSM_TILE_SERVER,
+    USER_AGENT,
+    TileCache,
+    TilePrefetcher,
+    allows_bulk_download,
+    fetch_tile,
+    tile_for,
+    tile_url,
+)
+from tests.stub_server import send, serve
+
+TILE = b"\x89PNG" + b"t" * 1020
+
+
+@pytest.fixture
+def tile_server():
+    requests = []
+
+    def handle(handler):
+        requests.append((handler.path, handler.headers.get("User-Agent")))
+        if handler.path.startswith("/14/"):
+            send(handler, 200, TILE, {"Content-Type": "image/png"})
+        else:
+            send(handler, 404)
+
+    server, base = serve(handle)
+    yield f"{base}/{{z}}/{{x}}/{{y}}.png", requests
+    server.shutdown()
+
+
+def test_tile_for_and_url():
+    assert tile_for(0.0, 0.0, 1) == (1, 1)
+    assert tile_for(85.1, -180.0, 3) == (0, 0)
+    assert tile_url("http://t/{z}/{x}/{y}.png", 5, 3, 7) == "http://t/5/3/7.png"
+
+
+def test_fetch_tile_identifies_the_app(tile_server):
+    server, requests = tile_server
+    assert fetch_tile(tile_url(server, 14, 1, 2)) == TILE
+    assert requests == [("/14/1/2.png", USER_AGENT)]
+    with pytest.raises(OSError):
+        fetch_tile(tile_url(server, 3, 1, 2))
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = TileCache(str(tmp_path / "tiles.db"), max_bytes=3 * len(TILE))
+    for x in range(3):
+        cache.put(14, x, 0, "s", TILE)
+    assert cache.get(14, 0, 0, "s") == TILE  # now the most recently used
+    cache.put(14, 3, 0, "s", TILE)
+    assert not cache.contains(14, 1, 0, "s")
+    assert all(cache.contains(14, x, 0, "s") for x in (0, 2, 3))
+    assert cache.total_bytes <= cache.max_bytes
+    assert TileCache(cache.db_path).total_bytes == cache.total_bytes
+
+
+def test_prefetch_downloads_missing_tiles_only(tmp_path, tile_server):
+    server, requests = tile_server
+    cache = TileCache(str(tmp_path / "tiles.db"))
+    cache.put(14, *tile_for(0.0, 0.0, 14), server, TILE)
+    prefetcher = TilePrefetcher(cache, tile_server=server)
+    try:
+        futures = prefetcher.prefetch_around(0.0, 0.0, zooms=[14], radius=1)
+        assert len(futures) == 8
+        assert all(future.result(timeout=10) for future in futures)
+        failed = prefetcher.prefetch_around(0.0, 0.0, zooms=[3], radius=0)
+        assert [future.result(timeout=10) for future in failed] == [False]
+    finally:
+        prefetcher.shutdown()
+    assert len(requests) == 9
+    assert all(cache.contains(zoom, x, y, server) for zoom, x, y in prefetcher.tiles_around(0.0, 0.0, [14], 1))
+
+
+def test_no_bulk_prefetch_from_openstreetmap(tmp_path):
+    assert not allows_bulk_download(OSM_TILE_SERVER)
+    assert not allows_bulk_download("https://a.tile.openstreetmap.org/{z}/{x}/{y}.png")
+    assert allows_bulk_download("http://127.0.0.1:8000/{z}/{x}/{y}.png")
+    with pytest.raises(ValueError):
+        TilePrefetcher(TileCache(os.path.join(tmp_path, "tiles.db")), tile_server=OSM_TILE_SERVER)
@@ -0,0 +1,45 @@
+import struct
+from types import SimpleNamespace
+
+from core.gps import GPSTracker
+from core.location_cache import LocationCache
+from core.track import TrackRecorder, export_csv, iter_track_log
+
+
+def test_only_changed_fixes_are_recorded_with_their_source(tmp_path):
+    cache = LocationCache(str(tmp_path / "location.json"))
+    cached = cache.store((13.08, 80.27), "India", timestamp=1000)
+    tracker = GPSTracker(cache=cache, max_age=float("inf"))
+    recorder = TrackRecorder(str(tmp_path / "track.bin"))
+    tracker.start_recording(recorder)
+
+    for _ in range(3):
+        tracker.get_coordinates()  # served from the location cache
+    tracker.g = SimpleNamespace(latlng=[13.09, 80.28], country="India")  # as a finished IP lookup leaves it
+    for _ in range(3):
+        tracker.get_coordinates()
+    tracker.save_coordinates((13.09, 80.28))  # the position did not move
+    tracker.save_coordinates((13.10, 80.29))
+    tracker.stop_recording()
+
+    fixes = list(iter_track_log(recorder.log_path))
+    assert [(fix[1], fix[2], fix[3]) for fix in fixes] == [
+        (13.08, 80.27, "cache"),
+        (13.09, 80.28, "ip"),
+        (13.10, 80.29, "manual"),
+    ]
+    assert fixes[0][0] == cached["timestamp"]
+
+
+def test_version_1_logs_are_read_and_upgraded(tmp_path):
+    path = str(tmp_path / "track.bin")
+    with open(path, "wb") as file:
+        file.write(b"SGTRACK1" + struct.pack("<ddd", 1000, 1.5, 2.5))
+    assert list(iter_track_log(path)) == [(1000, 1.5, 2.5, "unknown")]
+
+    recorder = TrackRecorder(path)
+    recorder.append((3.5, 4.5), 2000, source="ip")
+    recorder.close()
+    assert list(iter_track_log(path)) == [(1000, 1.5, 2.5, "unknown"), (2000, 3.5, 4.5, "ip")]
+    assert export_csv(iter_track_log(path), str(tmp_path / "track.csv")) == 2
+    assert (tmp_path / "track.csv").read_text().splitlines()[-1].endswith(",ip")